@@ -1,12 +1,27 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 from typing import Optional
-from app.schemas import UploadResponse
+from app.schemas import UploadResponse, StatusResponse
 from app.utils.file_handler import generate_job_id, validate_file, save_upload_file
-from app.services.processing_service import process_file
+from app.services.job_service import submit_job
+from app.services.job_store import JOB_STATUSES, create_job, get_job_summary, list_jobs, count_jobs
+from app.services import progress
+from app.services.cache_service import get_cache_stats
+from app.services.llm_cache import get_llm_cache_stats
+from app.utils.results_store import read_raw, select_fields
+from app.utils.artifact_store import (
+    CLEANED_DATA_FILE,
+    LEGACY_CLEANED_CSV_FILE,
+    iter_csv,
+    read_cleaned_rows,
+    cleaned_columns
+)
+from app.utils.file_parser import dataframe_to_records
+from app.utils.json_codec import dumps, loads
 from app.config import settings
 from datetime import datetime
-import json
+import asyncio
 import os
 
 router = APIRouter()
@@ -35,15 +50,13 @@ async def upload_file(
             "filename": file.filename,
             "file_path": file_info["file_path"],
             "file_size": file_info["file_size"],
+            "file_hash": file_info["file_hash"],
             "prompt": prompt or "",
             "status": "pending",
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat()
         }
-
-        metadata_path = os.path.join(file_info["job_dir"], "metadata.json")
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        await run_in_threadpool(create_job, metadata)
 
         return UploadResponse(
             job_id=job_id,
@@ -61,32 +74,45 @@ async def upload_file(
 
 # ==================== PROCESSING ENDPOINT ====================
 
-@router.post("/process/{job_id}")
-async def start_processing(job_id: str):
+@router.post("/process/{job_id}", status_code=202)
+async def start_processing(job_id: str, bypass_llm_cache: bool = False, skip: Optional[str] = None):
     """
-    Start processing uploaded file
+    Queue uploaded file for background processing
+
+    Returns immediately; poll /status/{job_id} until "completed" or "failed",
+    then fetch /results/{job_id}.
 
     - **job_id**: Job ID from upload response
+    - **bypass_llm_cache**: Call Gemini again instead of reusing cached responses
+    - **skip**: Optional comma-separated stages not to run (anomalies, statistics, correlation, outliers, trends, charts, insights)
     """
     try:
-        job_dir = os.path.join(settings.UPLOAD_DIR, job_id)
-        if not os.path.exists(job_dir):
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        results = process_file(job_id)
+        skip_stages = [stage.strip() for stage in skip.split(",") if stage.strip()] if skip else []
+        queue_depth = await run_in_threadpool(submit_job, job_id, bypass_llm_cache, skip_stages)
 
         return {
-            "message": "Processing completed successfully",
-            "results": results
+            "job_id": job_id,
+            "status": "pending",
+            "queue_depth": queue_depth,
+            "message": "Processing queued"
         }
 
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # ==================== STATUS ENDPOINT ====================
 
-@router.get("/status/{job_id}")
+def _job_status(job_id: str) -> dict:
+    """Stored status of a job plus its live stage and progress"""
+    status = get_job_summary(job_id)
+    status.update(progress.current_progress(job_id, status["status"]))
+    return status
+
+
+@router.get("/status/{job_id}", response_model=StatusResponse)
 async def get_status(job_id: str):
     """
     Get processing status for a job
@@ -94,22 +120,106 @@ async def get_status(job_id: str):
     - **job_id**: Job ID from upload response
     """
     try:
-        job_dir = os.path.join(settings.UPLOAD_DIR, job_id)
-        metadata_path = os.path.join(job_dir, "metadata.json")
+        return await run_in_threadpool(_job_status, job_id)
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        if not os.path.exists(metadata_path):
-            raise HTTPException(status_code=404, detail="Job not found")
 
-        with open(metadata_path, 'r') as f:
-            metadata = json.load(f)
+@router.get("/status/{job_id}/stream")
+async def stream_status(job_id: str):
+    """
+    Server-sent events with the job's status, stage and progress
+
+    Sends the current status, then one event per change until the job is
+    completed or failed. Each event's data is a /status/{job_id} response.
+
+    - **job_id**: Job ID from upload response
+    """
+    try:
+        # 404 before the stream starts
+        await run_in_threadpool(get_job_summary, job_id)
+
+        async def events():
+            updates = progress.subscribe(job_id)
+            try:
+                # Read after subscribing, so no event can fall in between
+                current = await run_in_threadpool(_job_status, job_id)
+                yield _sse(current)
+                while current["status"] not in progress.TERMINAL_STATUSES:
+                    try:
+                        event = await asyncio.wait_for(updates.get(), timeout=settings.STATUS_STREAM_KEEPALIVE_SECONDS)
+                        current = {**current, "error": None, **event}
+                    except asyncio.TimeoutError:
+                        # Catches a finish whose event was lost (e.g. the API process restarted)
+                        latest = await run_in_threadpool(_job_status, job_id)
+                        if latest["status"] == current["status"]:
+                            yield ": keepalive\n\n"
+                            continue
+                        current = latest
+                    yield _sse(current)
+            finally:
+                progress.unsubscribe(job_id, updates)
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sse(status: dict) -> bytes:
+    return b"data: " + dumps(StatusResponse(**status).model_dump()) + b"\n\n"
+
+
+# ==================== JOBS ENDPOINT ====================
+
+@router.get("/jobs")
+async def get_jobs(
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0
+):
+    """
+    List jobs, newest first
+
+    - **status**: Optional filter (pending, processing, completed, failed)
+    - **since**: Optional ISO 8601 date or datetime; only jobs created at or after it
+    - **limit**: Jobs to return (at most JOB_LIST_MAX_ROWS)
+    - **offset**: Jobs to skip
+    """
+    try:
+        if status is not None and status not in JOB_STATUSES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown status: {status}. Allowed: {', '.join(JOB_STATUSES)}"
+            )
+        if offset < 0 or not 1 <= limit <= settings.JOB_LIST_MAX_ROWS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"offset must be >= 0 and limit between 1 and {settings.JOB_LIST_MAX_ROWS}"
+            )
+        try:
+            since_time = datetime.fromisoformat(since) if since else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid since: {since}. Use ISO 8601, e.g. 2024-01-31T12:00:00")
+        if since_time is not None and since_time.tzinfo is not None:
+            # created_at is stored in server local time
+            since_time = since_time.astimezone().replace(tzinfo=None)
 
         return {
-            "job_id": job_id,
-            "status": metadata.get("status", "unknown"),
-            "filename": metadata.get("filename"),
-            "created_at": metadata.get("created_at"),
-            "updated_at": metadata.get("updated_at"),
-            "error": metadata.get("error")
+            "total": await run_in_threadpool(count_jobs, status, since_time),
+            "offset": offset,
+            "limit": limit,
+            "jobs": await run_in_threadpool(list_jobs, status, since_time, limit, offset)
         }
 
     except HTTPException as e:
@@ -129,18 +239,94 @@ async def get_results(job_id: str):
     """
     try:
         processed_dir = os.path.join(settings.PROCESSED_DIR, job_id)
-        results_path = os.path.join(processed_dir, "results.json")
+        # Stored JSON is served as-is, never parsed and re-serialized
+        content = await run_in_threadpool(read_raw, processed_dir)
+        return Response(content=content, media_type="application/json")
 
-        if not os.path.exists(results_path):
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/results/{job_id}/{section}")
+async def get_results_section(job_id: str, section: str, fields: Optional[str] = None):
+    """
+    Get one section of the results
+
+    - **job_id**: Job ID from upload response
+    - **section**: info, preview, statistics, correlation, outliers, anomalies, trends, charts or insights
+    - **fields**: Optional comma-separated keys to return (applied to each chart for charts)
+    """
+    try:
+        processed_dir = os.path.join(settings.PROCESSED_DIR, job_id)
+        content = await run_in_threadpool(read_raw, processed_dir, section)
+
+        if not fields:
+            return Response(content=content, media_type="application/json")
+
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        body = await run_in_threadpool(lambda: dumps(select_fields(loads(content), selected)))
+        return Response(content=body, media_type="application/json")
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ==================== DATA ENDPOINT ====================
+
+@router.get("/data/{job_id}")
+async def get_data_page(job_id: str, offset: int = 0, limit: int = 100, columns: Optional[str] = None):
+    """
+    Page through the cleaned data of a completed job
+
+    Only the Parquet row groups covering the window are read.
+
+    - **job_id**: Job ID from upload response
+    - **offset**: First row (0-based)
+    - **limit**: Rows to return (at most DATA_PAGE_MAX_ROWS)
+    - **columns**: Optional comma-separated columns to return (default: all)
+    """
+    try:
+        if offset < 0:
+            raise HTTPException(status_code=400, detail="offset must be >= 0")
+        if limit < 1 or limit > settings.DATA_PAGE_MAX_ROWS:
             raise HTTPException(
-                status_code=404,
-                detail="Results not found. Job may not be completed yet."
+                status_code=400,
+                detail=f"limit must be between 1 and {settings.DATA_PAGE_MAX_ROWS}"
             )
 
-        with open(results_path, 'r') as f:
-            results = json.load(f)
+        data_path = os.path.join(settings.PROCESSED_DIR, job_id, CLEANED_DATA_FILE)
+        if not os.path.exists(data_path):
+            raise HTTPException(status_code=404, detail="Cleaned data not found")
 
-        return results
+        available = await run_in_threadpool(cleaned_columns, data_path)
+        selected = None
+        if columns:
+            selected = [col.strip() for col in columns.split(",") if col.strip()]
+            unknown = [col for col in selected if col not in available]
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown columns: {', '.join(unknown)}. Available: {', '.join(available)}"
+                )
+
+        def read_page():
+            df, total_rows = read_cleaned_rows(data_path, offset, limit, selected)
+            return dataframe_to_records(df), total_rows
+
+        data, total_rows = await run_in_threadpool(read_page)
+
+        return Response(content=dumps({
+            "job_id": job_id,
+            "offset": offset,
+            "limit": limit,
+            "total_rows": total_rows,
+            "columns": selected or available,
+            "data": data
+        }), media_type="application/json")
 
     except HTTPException as e:
         raise e
@@ -154,17 +340,29 @@ async def get_results(job_id: str):
 async def export_csv(job_id: str):
     """
     Download cleaned CSV file
+
+    Generated on the fly from the job's Parquet artifact.
     """
     try:
         processed_dir = os.path.join(settings.PROCESSED_DIR, job_id)
-        csv_path = os.path.join(processed_dir, "cleaned_data.csv")
+        data_path = os.path.join(processed_dir, CLEANED_DATA_FILE)
+        filename = f"cleaned_data_{job_id}.csv"
+
+        if os.path.exists(data_path):
+            return StreamingResponse(
+                iterate_in_threadpool(iter_csv(data_path)),
+                media_type="text/csv",
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+            )
 
+        # Jobs processed before cleaned data was stored as Parquet
+        csv_path = os.path.join(processed_dir, LEGACY_CLEANED_CSV_FILE)
         if not os.path.exists(csv_path):
-            raise HTTPException(status_code=404, detail="Cleaned CSV not found")
+            raise HTTPException(status_code=404, detail="Cleaned data not found")
 
         return FileResponse(
             path=csv_path,
-            filename=f"cleaned_data_{job_id}.csv",
+            filename=filename,
             media_type="text/csv"
         )
 
@@ -194,5 +392,20 @@ async def export_json(job_id: str):
 
     except HTTPException as e:
         raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ==================== CACHE ENDPOINT ====================
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """
+    Result cache hit/miss counters and size, plus the LLM response cache
+    """
+    try:
+        stats = await run_in_threadpool(get_cache_stats)
+        return {**stats, "llm": await run_in_threadpool(get_llm_cache_stats)}
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -7,18 +7,97 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: str = ""
     OPENAI_API_KEY: str = ""
     GEMINI_API_KEY: str = ""
+    GEMINI_MODEL: str = "gemini-2.0-flash-exp"
+    LLM_CHARTS_TIMEOUT_SECONDS: float = 20.0  # Fallback charts are used after this
+    LLM_INSIGHTS_TIMEOUT_SECONDS: float = 30.0  # A warning is shown instead of insights after this
 
     # App Settings
     APP_NAME: str = "UnstructIQ"
     VERSION: str = "0.1.0"
     DEBUG: bool = True
+    LOG_LEVEL: str = "INFO"
 
     # File Upload Settings
     UPLOAD_DIR: str = "uploads"
     PROCESSED_DIR: str = "processed"
     MAX_FILE_SIZE: int = 50000000  # 50MB
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # 1MB per read while streaming uploads
     ALLOWED_EXTENSIONS: str = ".csv,.json,.xlsx,.xls,.txt,.pdf"  # String olarak
 
+    # CSV/TXT dialect sniffing (encoding, delimiter, header, decimal separator)
+    SNIFF_SAMPLE_BYTES: int = 256 * 1024
+    SNIFF_MAX_LINES: int = 1000
+
+    # Datetime detection (one explicit format inferred per column from a sample)
+    DATETIME_SAMPLE_SIZE: int = 1000  # Values sampled per text column
+    DATETIME_MIN_SUCCESS_RATE: float = 0.9  # Share of the sample that must parse
+
+    # Dtype optimization after parsing (category / Arrow strings / smaller ints)
+    DTYPE_OPTIMIZATION_ENABLED: bool = True
+    DTYPE_CATEGORY_MAX_RATIO: float = 0.5  # String columns with at most this share of distinct values become category
+
+    # Duplicate rows (found by 64-bit row fingerprints)
+    DUPLICATE_KEY_COLUMNS: str = ""  # Comma-separated columns (as in the file) identifying a row; empty = all columns
+
+    # Correlation analysis
+    CORRELATION_METHOD: str = "pearson"  # pearson, spearman or kendall
+    CORRELATION_THRESHOLD: float = 0.7  # |r| above this is reported as a strong pair
+    CORRELATION_TOP_K: int = 50  # Strongest pairs reported (0 = all)
+    CORRELATION_SAMPLE_ROWS: int = 200_000  # Larger frames are correlated on a row sample
+    CORRELATION_KENDALL_SAMPLE_ROWS: int = 10_000  # Kendall is O(n log n) per column pair
+    CORRELATION_MATRIX_MAX_COLUMNS: int = 50  # Wider matrices are left out of the results (pairs only)
+    CORRELATION_DECIMALS: int = 3
+
+    # Outlier detection
+    OUTLIER_METHOD: str = "iqr"  # iqr, zscore or mad
+    OUTLIER_IQR_MULTIPLIER: float = 1.5  # Outside [q25 - m*IQR, q75 + m*IQR]
+    OUTLIER_ZSCORE_THRESHOLD: float = 3.0  # |x - mean| / std above this
+    OUTLIER_MAD_THRESHOLD: float = 3.5  # Modified z-score 0.6745 * |x - median| / MAD above this
+
+    # Sampling for charts and the chart prompt on large frames
+    SAMPLING_THRESHOLD_ROWS: int = 200_000  # Larger frames are charted from a row sample
+    SAMPLING_ROWS: int = 50_000  # Rows in the sample
+    SAMPLING_STRATIFY_COLUMN: str = ""  # Groups sampled proportionally; empty = first date column, else first categorical
+    SAMPLING_MAX_STRATA: int = 1_000  # More groups than this falls back to a uniform sample
+
+    # Line, scatter and histogram charts
+    LINE_CHART_MAX_POINTS: int = 500  # Longer series are downsampled to about this many points
+    LINE_CHART_DOWNSAMPLING: str = "lttb"  # lttb (keeps the visual shape) or minmax (keeps every peak and dip)
+    SCATTER_GRID_BINS: int = 40  # Scatter charts bin all rows on an N x N grid (at most N² points)
+    HISTOGRAM_BINS: int = 20
+
+    # Chunked (out-of-core) processing for large CSV/TXT files
+    CHUNKED_PROCESSING_THRESHOLD: int = 25_000_000  # Files larger than this (bytes) are read in chunks
+    CHUNK_SIZE_ROWS: int = 100_000
+    CHUNKED_QUANTILE_SKETCH_K: int = 50_000  # Quantiles are exact up to this many values per column, KLL sketch beyond
+    CHUNKED_MAX_DISTINCT_VALUES: int = 100_000  # Value counts kept per categorical column
+    CHUNKED_CHART_SAMPLE_ROWS: int = 50_000  # Rows sampled for chart generation
+
+    # Cleaned data artifact (Parquet)
+    PARQUET_ROW_GROUP_SIZE: int = 100_000  # Rows per row group, also the CSV export batch size
+    PARQUET_COMPRESSION: str = "snappy"
+    DATA_PAGE_MAX_ROWS: int = 10_000  # Largest limit accepted by GET /api/data/{job_id}
+
+    # Job store (SQLite, WAL mode)
+    JOB_STORE_PATH: str = ""  # Empty = {UPLOAD_DIR}/jobs.db
+    JOB_LIST_MAX_ROWS: int = 1_000  # Largest limit accepted by GET /api/jobs
+    STATUS_STREAM_KEEPALIVE_SECONDS: float = 15.0  # Idle /status/{job_id}/stream connections get a comment this often
+
+    # Result Cache (identical uploads skip reprocessing)
+    RESULT_CACHE_DIR: str = "cache"
+    RESULT_CACHE_MAX_BYTES: int = 1_000_000_000  # 1GB, least recently used entries evicted first
+
+    # LLM Response Cache (Gemini responses reused for effectively identical prompts)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # 7 days
+    LLM_CACHE_MAX_ENTRIES: int = 10_000  # Least recently used entries evicted first
+    LLM_CACHE_FLOAT_DIGITS: int = 4  # Significant digits kept when hashing statistics
+
+    # Background Processing
+    WORKER_PROCESSES: int = 2  # Jobs processed in parallel
+    MAX_QUEUED_JOBS: int = 20  # Queued + running jobs before /process returns 503
+    PIPELINE_THREADS: int = 4  # Independent pipeline stages run in parallel within a job
+
     # CORS
     FRONTEND_URL: str = "http://localhost:5173"
 
@@ -36,4 +115,5 @@ settings = Settings()
 
 # Klasörlerin varlığını kontrol et ve oluştur
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-os.makedirs(settings.PROCESSED_DIR, exist_ok=True)
\ No newline at end of file
+os.makedirs(settings.PROCESSED_DIR, exist_ok=True)
+os.makedirs(settings.RESULT_CACHE_DIR, exist_ok=True)
\ No newline at end of file
@@ -1,7 +1,16 @@
-from fastapi import FastAPI
+import logging
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api import routes  # YENİ SATIR
+from app.services import job_service, job_store
+from app.utils.logging_config import configure_logging
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+logger = logging.getLogger(__name__)
+
+
+configure_logging()
 
 # FastAPI instance
 app = FastAPI(
@@ -22,6 +31,17 @@ app.add_middleware(
 # Include API routes - YENİ SATIRLAR
 app.include_router(routes.router, prefix="/api", tags=["API"])
 
+@app.on_event("startup")
+def migrate_job_metadata():
+    # Jobs created before the SQLite job store kept their state in metadata.json
+    imported = job_store.migrate_metadata_files()
+    if imported:
+        logger.info("Imported %d jobs from metadata.json files into %s", imported, job_store.get_job_store_path())
+
+@app.on_event("shutdown")
+def shutdown_workers():
+    job_service.shutdown()
+
 # Health Check Endpoint
 @app.get("/")
 async def root():
@@ -36,5 +56,11 @@ async def health_check():
     return {
         "status": "healthy",
         "upload_dir": settings.UPLOAD_DIR,
-        "processed_dir": settings.PROCESSED_DIR
-    }
\ No newline at end of file
+        "processed_dir": settings.PROCESSED_DIR,
+        "queue": job_service.get_queue_stats()
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-stage duration, peak RSS growth and throughput, LLM latency and tokens"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
\ No newline at end of file
@@ -15,7 +15,9 @@ class StatusResponse(BaseModel):
     job_id: str
     status: str  # "pending", "processing", "completed", "failed"
     progress: int  # 0-100
-    stage: str  # "uploading", "cleaning", "structuring", "analyzing", "completed"
+    stage: str  # "queued", "started", the last pipeline stage finished, "completed" or "failed"
+    filename: Optional[str] = None
+    error: Optional[str] = None
     message: Optional[str] = None
     created_at: datetime
     updated_at: datetime
@@ -1,95 +1,242 @@
+import logging
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from app.utils.column_profile import ColumnProfile
+from app.utils.row_fingerprint import duplicate_key_columns, duplicate_mask
+from app.config import settings
 
+logger = logging.getLogger(__name__)
 
-def generate_correlation_matrix(df: pd.DataFrame) -> Dict[str, Any]:
+
+CORRELATION_METHODS = ("pearson", "spearman", "kendall")
+
+
+def generate_correlation_matrix(df: pd.DataFrame, method: Optional[str] = None) -> Dict[str, Any]:
     """
     Generate correlation matrix for numeric columns
+
+    method is pearson, spearman or kendall (default CORRELATION_METHOD).
+    Above CORRELATION_SAMPLE_ROWS rows (CORRELATION_KENDALL_SAMPLE_ROWS for
+    kendall) the correlation is computed on a uniform row sample.
     """
     try:
+        method = method or settings.CORRELATION_METHOD
+        if method not in CORRELATION_METHODS:
+            raise ValueError(f"Unknown correlation method: {method}")
+
         numeric_df = df.select_dtypes(include=['number'])
 
         if len(numeric_df.columns) < 2:
             return None
 
+        max_rows = settings.CORRELATION_KENDALL_SAMPLE_ROWS if method == "kendall" else settings.CORRELATION_SAMPLE_ROWS
+        sampled_rows = None
+        if len(numeric_df) > max_rows:
+            rng = np.random.default_rng(0)
+            numeric_df = numeric_df.iloc[np.sort(rng.choice(len(numeric_df), max_rows, replace=False))]
+            sampled_rows = max_rows
+
         # Calculate correlation
-        corr_matrix = numeric_df.corr()
+        corr_matrix = pd.DataFrame(
+            _correlation(numeric_df, method),
+            index=numeric_df.columns,
+            columns=numeric_df.columns
+        )
+
+        return build_correlation_report(corr_matrix, method=method, sampled_rows=sampled_rows)
+
+    except Exception as e:
+        logger.warning("Correlation matrix error: %s", e)
+        return None
+
+
+def _correlation(numeric_df: pd.DataFrame, method: str) -> np.ndarray:
+    """
+    Correlation as one matrix product of the standardized columns when there
+    are no nulls (the usual case after cleaning); pandas' pairwise-complete
+    kernels otherwise, and always for kendall
+    """
+    values = numeric_df.to_numpy(dtype=float)
+    if method == "kendall" or not np.isfinite(values).all():
+        return numeric_df.corr(method=method).to_numpy()
+
+    if method == "spearman":
+        values = numeric_df.rank().to_numpy(dtype=float)
+
+    centred = values - values.mean(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        norms = np.sqrt((centred ** 2).sum(axis=0))
+        corr = (centred.T @ centred) / np.outer(norms, norms)
+    np.fill_diagonal(corr, np.where(norms > 0, 1.0, np.nan))
+    return np.clip(corr, -1, 1)
+
+
+def build_correlation_report(
+        corr_matrix: pd.DataFrame,
+        method: str = "pearson",
+        sampled_rows: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Convert a correlation matrix to heatmap data plus strong pairs
+
+    Pairs are those with |r| > CORRELATION_THRESHOLD, strongest first, at most
+    CORRELATION_TOP_K of them. The matrix is rounded to CORRELATION_DECIMALS
+    and left out (None) above CORRELATION_MATRIX_MAX_COLUMNS columns.
+    """
+    columns = corr_matrix.columns.tolist()
+    values = corr_matrix.to_numpy(dtype=float)
+    threshold = settings.CORRELATION_THRESHOLD
+
+    # Strong pairs from the upper triangle, without a Python loop over cells
+    rows_idx, cols_idx = np.triu_indices(len(columns), k=1)
+    upper = values[rows_idx, cols_idx]
+    with np.errstate(invalid="ignore"):
+        strong = np.flatnonzero(np.abs(upper) > threshold)
+    strong = strong[np.argsort(-np.abs(upper[strong]), kind="stable")]
+    total_pairs = len(strong)
+    if settings.CORRELATION_TOP_K > 0:
+        strong = strong[:settings.CORRELATION_TOP_K]
 
-        # Convert to format suitable for heatmap
-        correlation_data = {
-            "columns": corr_matrix.columns.tolist(),
-            "matrix": corr_matrix.values.tolist(),
-            "pairs": []
+    pairs = [
+        {
+            "col1": columns[rows_idx[k]],
+            "col2": columns[cols_idx[k]],
+            "correlation": float(upper[k]),
+            "strength": "strong positive" if upper[k] > 0 else "strong negative"
         }
+        for k in strong
+    ]
 
-        # Find strong correlations (|r| > 0.7)
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i + 1, len(corr_matrix.columns)):
-                corr_val = corr_matrix.iloc[i, j]
-                if abs(corr_val) > 0.7:
-                    correlation_data["pairs"].append({
-                        "col1": corr_matrix.columns[i],
-                        "col2": corr_matrix.columns[j],
-                        "correlation": float(corr_val),
-                        "strength": "strong positive" if corr_val > 0.7 else "strong negative"
-                    })
+    matrix = None
+    if len(columns) <= settings.CORRELATION_MATRIX_MAX_COLUMNS:
+        rounded = np.round(values, settings.CORRELATION_DECIMALS)
+        matrix = np.where(np.isfinite(rounded), rounded, None).tolist()
 
-        return correlation_data
+    # Convert to format suitable for heatmap
+    return {
+        "method": method,
+        "columns": columns,
+        "matrix": matrix,
+        "pairs": pairs,
+        "strong_pairs_total": total_pairs,
+        "threshold": threshold,
+        "sampled_rows": sampled_rows
+    }
 
-    except Exception as e:
-        print(f"Correlation matrix error: {e}")
-        return None
 
+OUTLIER_METHODS = ("iqr", "zscore", "mad")
 
-def detect_outliers(df: pd.DataFrame) -> Dict[str, Any]:
+
+def outlier_bounds(stats: Dict[str, Any], method: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Detect outliers using IQR method
+    Lower/upper outlier bounds from per-column statistics (arrays or scalars):
+    q25/q75 for iqr, mean/std for zscore, median/mad for mad
     """
-    outliers_report = {}
+    method = method or settings.OUTLIER_METHOD
+    if method == "iqr":
+        iqr = np.asarray(stats["q75"]) - np.asarray(stats["q25"])
+        spread = settings.OUTLIER_IQR_MULTIPLIER * iqr
+        return np.asarray(stats["q25"]) - spread, np.asarray(stats["q75"]) + spread
+    if method == "zscore":
+        spread = settings.OUTLIER_ZSCORE_THRESHOLD * np.asarray(stats["std"])
+        return np.asarray(stats["mean"]) - spread, np.asarray(stats["mean"]) + spread
+    if method == "mad":
+        # Modified z-score (Iglewicz & Hoaglin); a zero MAD flags nothing
+        mad = np.asarray(stats["mad"], dtype=np.float64)
+        with np.errstate(divide="ignore"):
+            spread = np.where(mad > 0, settings.OUTLIER_MAD_THRESHOLD * mad / 0.6745, np.inf)
+        return np.asarray(stats["median"]) - spread, np.asarray(stats["median"]) + spread
+    raise ValueError(f"Unknown outlier method: {method}")
 
-    numeric_cols = df.select_dtypes(include=['number']).columns
 
-    for col in numeric_cols:
-        Q1 = df[col].quantile(0.25)
-        Q3 = df[col].quantile(0.75)
-        IQR = Q3 - Q1
+def detect_outliers(df: pd.DataFrame, profile: Optional[ColumnProfile] = None, method: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Detect outliers by IQR, z-score or MAD (default OUTLIER_METHOD)
+
+    One vectorized comparison of the numeric block against per-column bounds
+    gives the outlier mask; counts and sample values are read from it.
+    """
+    if profile is None:
+        profile = ColumnProfile(df)
+
+    method = method or settings.OUTLIER_METHOD
+    columns = profile.numeric_columns
+    if not columns or len(df) == 0:
+        return {}
 
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
+    block = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    summary = profile.numeric_summary
+    stats = {key: summary[key].to_numpy(dtype=np.float64) for key in ("q25", "q75", "mean", "std", "median")}
+    if method == "mad":
+        with np.errstate(invalid="ignore"):
+            # inf - inf where the median itself is infinite
+            deviations = np.abs(block - stats["median"])
+        has_nulls = profile.null_counts[columns].to_numpy() > 0
+        stats["mad"] = np.full(len(columns), np.nan)
+        # Batched median for columns without nulls (nanmedian is much slower)
+        if (~has_nulls).any():
+            stats["mad"][~has_nulls] = np.median(deviations[:, ~has_nulls], axis=0)
+        # Per column on the non-null values; all-null columns keep a NaN MAD
+        for j in np.flatnonzero(has_nulls):
+            values = deviations[:, j][~np.isnan(deviations[:, j])]
+            if len(values):
+                stats["mad"][j] = np.median(values)
 
-        outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
+    lower, upper = outlier_bounds(stats, method)
+    # NaN compares False, so nulls are never outliers
+    mask = (block < lower) | (block > upper)
+    counts = mask.sum(axis=0)
 
-        if len(outliers) > 0:
-            outliers_report[col] = {
-                "count": len(outliers),
-                "percentage": round(len(outliers) / len(df) * 100, 2),
-                "lower_bound": float(lower_bound),
-                "upper_bound": float(upper_bound),
-                "outlier_values": outliers[col].tolist()[:10]  # First 10
-            }
+    outliers_report = {}
+    for j in np.flatnonzero(counts):
+        col = columns[j]
+        first_rows = np.flatnonzero(mask[:, j])[:10]
+        outliers_report[col] = {
+            "count": int(counts[j]),
+            "percentage": round(int(counts[j]) / len(df) * 100, 2),
+            "lower_bound": float(lower[j]),
+            "upper_bound": float(upper[j]),
+            "method": method,
+            "outlier_values": df[col].iloc[first_rows].tolist()  # First 10
+        }
 
     return outliers_report
 
 
-def detect_anomalies(df: pd.DataFrame) -> Dict[str, Any]:
+def detect_anomalies(
+        df: pd.DataFrame,
+        profile: Optional[ColumnProfile] = None,
+        duplicates: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
     """
     Simple anomaly detection
+
+    `duplicates` is the duplicate_mask of df when already computed.
     """
+    if profile is None:
+        profile = ColumnProfile(df)
+
+    key_columns = duplicate_key_columns(df.columns)
+    if duplicates is None:
+        duplicates = duplicate_mask(df, key_columns)
+
     anomalies = {
-        "duplicate_rows": int(df.duplicated().sum()),
+        "duplicate_rows": int(duplicates.sum()),
         "columns_with_single_value": [],
         "columns_with_high_null_rate": []
     }
+    if key_columns:
+        anomalies["duplicate_key_columns"] = key_columns
 
     # Columns with single unique value
-    for col in df.columns:
-        if df[col].nunique() == 1:
+    for col in profile.columns:
+        if profile.has_single_value(col):
             anomalies["columns_with_single_value"].append(col)
 
     # Columns with >50% null values
-    for col in df.columns:
-        null_rate = df[col].isnull().sum() / len(df)
+    for col in profile.columns:
+        null_rate = profile.null_counts[col] / profile.row_count
         if null_rate > 0.5:
             anomalies["columns_with_high_null_rate"].append({
                 "column": col,
@@ -116,15 +263,26 @@ def generate_trends(df: pd.DataFrame) -> Dict[str, Any]:
             first_half_mean = values.iloc[:len(values) // 2].mean()
             second_half_mean = values.iloc[len(values) // 2:].mean()
 
-            change = second_half_mean - first_half_mean
-            change_percent = (change / first_half_mean * 100) if first_half_mean != 0 else 0
+            trend = summarize_trend(first_half_mean, second_half_mean)
+            if trend:
+                trends[col] = trend
+
+    return trends
 
-            if abs(change_percent) > 5:
-                trends[col] = {
-                    "direction": "increasing" if change > 0 else "decreasing",
-                    "change_percent": round(change_percent, 2),
-                    "first_half_mean": round(first_half_mean, 2),
-                    "second_half_mean": round(second_half_mean, 2)
-                }
 
-    return trends
\ No newline at end of file
+def summarize_trend(first_half_mean: float, second_half_mean: float) -> Dict[str, Any]:
+    """
+    Compare first/second half means; returns None if the change is within 5%
+    """
+    change = second_half_mean - first_half_mean
+    change_percent = (change / first_half_mean * 100) if first_half_mean != 0 else 0
+
+    if abs(change_percent) > 5:
+        return {
+            "direction": "increasing" if change > 0 else "decreasing",
+            "change_percent": round(change_percent, 2),
+            "first_half_mean": round(first_half_mean, 2),
+            "second_half_mean": round(second_half_mean, 2)
+        }
+
+    return None
\ No newline at end of file
@@ -0,0 +1,231 @@
+import logging
+import os
+import json
+import shutil
+import hashlib
+import uuid
+from datetime import datetime
+from typing import Dict, Any, Optional, Sequence
+from app.utils.results_store import RESULTS_FILE, is_section_file, write_results
+from app.utils.json_codec import loads
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Content-addressed store of finished jobs:
+#   {RESULT_CACHE_DIR}/entries/{key}/  -> copy of processed/{job_id}/
+#   {RESULT_CACHE_DIR}/stats.json      -> hit/miss counters
+ENTRIES_DIR = os.path.join(settings.RESULT_CACHE_DIR, "entries")
+STATS_PATH = os.path.join(settings.RESULT_CACHE_DIR, "stats.json")
+
+
+# Settings that change analysis output: results computed under other values
+# are not reused
+ANALYSIS_SETTINGS = (
+    "SNIFF_SAMPLE_BYTES",
+    "SNIFF_MAX_LINES",
+    "DATETIME_SAMPLE_SIZE",
+    "DATETIME_MIN_SUCCESS_RATE",
+    "DTYPE_OPTIMIZATION_ENABLED",
+    "DTYPE_CATEGORY_MAX_RATIO",
+    "DUPLICATE_KEY_COLUMNS",
+    "CORRELATION_METHOD",
+    "CORRELATION_THRESHOLD",
+    "CORRELATION_TOP_K",
+    "CORRELATION_SAMPLE_ROWS",
+    "CORRELATION_KENDALL_SAMPLE_ROWS",
+    "CORRELATION_MATRIX_MAX_COLUMNS",
+    "CORRELATION_DECIMALS",
+    "OUTLIER_METHOD",
+    "OUTLIER_IQR_MULTIPLIER",
+    "OUTLIER_ZSCORE_THRESHOLD",
+    "OUTLIER_MAD_THRESHOLD",
+    "SAMPLING_THRESHOLD_ROWS",
+    "SAMPLING_ROWS",
+    "SAMPLING_STRATIFY_COLUMN",
+    "SAMPLING_MAX_STRATA",
+    "LINE_CHART_MAX_POINTS",
+    "LINE_CHART_DOWNSAMPLING",
+    "SCATTER_GRID_BINS",
+    "HISTOGRAM_BINS",
+    "CHUNKED_PROCESSING_THRESHOLD",
+    "CHUNK_SIZE_ROWS",
+    "CHUNKED_QUANTILE_SKETCH_K",
+    "CHUNKED_MAX_DISTINCT_VALUES",
+    "CHUNKED_CHART_SAMPLE_ROWS"
+)
+
+
+def make_cache_key(file_hash: str, prompt: str, pipeline_version: str, skip_stages: Sequence[str] = ()) -> str:
+    """
+    Cache key for an upload: content hash + user prompt + pipeline version +
+    skipped stages + analysis settings + Gemini model (charts and insights
+    come from it)
+    """
+    analysis = ",".join(f"{name}={getattr(settings, name)}" for name in ANALYSIS_SETTINGS)
+    raw = (
+        f"{pipeline_version}\0{file_hash}\0{prompt or ''}\0{','.join(sorted(skip_stages))}\0{analysis}"
+        f"\0{settings.GEMINI_MODEL}"
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hard-link src to dst, copying when links aren't supported (e.g. across devices)"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def load_cached_results(cache_key: str, job_id: str, processed_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Materialize a cached entry into processed_dir
+
+    Artifacts are hard-linked, results.json and its sections are rewritten
+    for the new job.
+    Returns the results dict on a hit, None on a miss.
+    """
+    entry_dir = os.path.join(ENTRIES_DIR, cache_key)
+    cached_results_path = os.path.join(entry_dir, RESULTS_FILE)
+
+    try:
+        with open(cached_results_path, 'rb') as f:
+            results = loads(f.read())
+
+        os.makedirs(processed_dir, exist_ok=True)
+        for name in os.listdir(entry_dir):
+            if name == RESULTS_FILE or is_section_file(name):
+                continue
+            dst = os.path.join(processed_dir, name)
+            if os.path.exists(dst):
+                os.remove(dst)
+            _link_or_copy(os.path.join(entry_dir, name), dst)
+    except (OSError, ValueError):
+        # Missing, corrupt or evicted while reading
+        _record("misses")
+        return None
+
+    results["cache"] = {
+        "hit": True,
+        "source_job_id": results.get("job_id"),
+        "key": cache_key
+    }
+    results["job_id"] = job_id
+    results["processed_at"] = datetime.now().isoformat()
+
+    write_results(processed_dir, results)
+
+    # Mark as recently used for LRU eviction
+    os.utime(entry_dir)
+    _record("hits")
+    return results
+
+
+def store_results(cache_key: str, processed_dir: str) -> None:
+    """Add a finished job's processed_dir to the cache, then evict down to the size limit"""
+    entry_dir = os.path.join(ENTRIES_DIR, cache_key)
+    if os.path.exists(entry_dir):
+        os.utime(entry_dir)
+        return
+
+    # Build the entry under a temp name so readers never see a partial entry
+    os.makedirs(ENTRIES_DIR, exist_ok=True)
+    tmp_dir = os.path.join(ENTRIES_DIR, f".tmp-{uuid.uuid4().hex}")
+    os.makedirs(tmp_dir)
+    try:
+        for name in os.listdir(processed_dir):
+            src = os.path.join(processed_dir, name)
+            if os.path.isfile(src):
+                _link_or_copy(src, os.path.join(tmp_dir, name))
+        os.rename(tmp_dir, entry_dir)
+    except OSError:
+        # Another worker stored the same key first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return
+
+    evict()
+
+
+def _dir_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(path, name))
+        for name in os.listdir(path)
+        if os.path.isfile(os.path.join(path, name))
+    )
+
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    """Remove least recently used entries until the cache fits in max_bytes. Returns entries removed."""
+    if max_bytes is None:
+        max_bytes = settings.RESULT_CACHE_MAX_BYTES
+    if not os.path.exists(ENTRIES_DIR):
+        return 0
+
+    entries = []
+    for name in os.listdir(ENTRIES_DIR):
+        if name.startswith("."):
+            continue
+        path = os.path.join(ENTRIES_DIR, name)
+        try:
+            entries.append((os.path.getmtime(path), _dir_size(path), path))
+        except OSError:
+            continue
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed += 1
+
+    if removed:
+        _record("evictions", removed)
+    return removed
+
+
+def _load_stats() -> Dict[str, int]:
+    try:
+        with open(STATS_PATH, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _record(counter: str, amount: int = 1) -> None:
+    """Bump a counter. Best-effort: concurrent workers may occasionally lose an increment."""
+    try:
+        stats = _load_stats()
+        stats[counter] = stats.get(counter, 0) + amount
+        os.makedirs(settings.RESULT_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{STATS_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(stats, f)
+        os.replace(tmp_path, STATS_PATH)
+    except OSError as e:
+        logger.warning("Result cache stats error: %s", e)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters plus current size of the cache"""
+    stats = _load_stats()
+    entries = 0
+    size = 0
+    if os.path.exists(ENTRIES_DIR):
+        for name in os.listdir(ENTRIES_DIR):
+            if name.startswith("."):
+                continue
+            entries += 1
+            size += _dir_size(os.path.join(ENTRIES_DIR, name))
+
+    lookups = stats.get("hits", 0) + stats.get("misses", 0)
+    return {
+        **stats,
+        "hit_rate": round(stats.get("hits", 0) / lookups, 4) if lookups else 0.0,
+        "entries": entries,
+        "size_bytes": size,
+        "max_bytes": settings.RESULT_CACHE_MAX_BYTES
+    }
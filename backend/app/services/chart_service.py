@@ -1,53 +1,111 @@
+import logging
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from google import genai
 from app.config import settings
+from app.utils.column_profile import ColumnProfile, CATEGORICAL_DTYPES
+from app.utils.sampling import RowSample, sample_rows, default_strata_column
+from app.utils.downsampling import downsample
+from app.utils.binning import grid_density, histogram
+from app.services.llm_cache import cached_generate
+from app.services.metrics import record_llm_usage
 import json
 import re
+import asyncio
+import time
 from datetime import datetime, date
 import numpy as np
 import math
 
+logger = logging.getLogger(__name__)
+
+
 # Configure Gemini Client
 client = None
 if settings.GEMINI_API_KEY:
     client = genai.Client(api_key=settings.GEMINI_API_KEY)
 
 
-def generate_charts(df: pd.DataFrame, user_prompt: str = "") -> List[Dict[str, Any]]:
+async def generate_charts(
+        df: pd.DataFrame,
+        user_prompt: str = "",
+        profile: Optional[ColumnProfile] = None,
+        use_cache: bool = True,
+        llm_stats: Optional[Dict[str, Any]] = None,
+        total_rows: Optional[int] = None
+) -> List[Dict[str, Any]]:
     """
     Generate chart configurations using AI
+
+    `total_rows` is the row count df was sampled from, if it is a sample
+    (chunked mode). Each chart is labeled exact or sampled under "sampling".
+    Sampling, binning and downsampling run in a thread so they don't block
+    the event loop the insights call shares.
     """
+    if profile is None:
+        profile = await asyncio.to_thread(ColumnProfile, df)
+
+    sample = await asyncio.to_thread(chart_sample, df, profile, total_rows)
+
     try:
         if client and settings.GEMINI_API_KEY:
-            return generate_charts_with_ai(df, user_prompt)
+            return await generate_charts_with_ai(df, user_prompt, profile, use_cache, llm_stats, sample)
         else:
-            return generate_charts_fallback(df)
+            return await asyncio.to_thread(generate_charts_fallback, df, profile, sample)
     except Exception as e:
-        print(f"AI chart generation failed: {e}")
-        return generate_charts_fallback(df)
+        logger.warning("AI chart generation failed: %s", e)
+        return await asyncio.to_thread(generate_charts_fallback, df, profile, sample)
 
 
-def generate_charts_with_ai(df: pd.DataFrame, user_prompt: str = "") -> List[Dict[str, Any]]:
+def chart_sample(df: pd.DataFrame, profile: ColumnProfile, total_rows: Optional[int] = None) -> RowSample:
+    """
+    Rows that row-level charts are built from: all of df, or above
+    SAMPLING_THRESHOLD_ROWS a sample of SAMPLING_ROWS stratified by
+    default_strata_column (uniform when there is none)
+    """
+    if len(df) <= settings.SAMPLING_THRESHOLD_ROWS:
+        return sample_rows(df, total_rows=total_rows)
+    return sample_rows(df, settings.SAMPLING_ROWS, default_strata_column(df, profile), total_rows)
+
+
+async def generate_charts_with_ai(
+        df: pd.DataFrame,
+        user_prompt: str = "",
+        profile: Optional[ColumnProfile] = None,
+        use_cache: bool = True,
+        llm_stats: Optional[Dict[str, Any]] = None,
+        sample: Optional[RowSample] = None
+) -> List[Dict[str, Any]]:
     """
     Use Gemini AI to intelligently select and configure charts
+
+    The Gemini response is cached per (data summary, user prompt, model),
+    see llm_cache; `llm_stats` records the call under "charts". Falls back to
+    generate_charts_fallback if the call fails or exceeds
+    LLM_CHARTS_TIMEOUT_SECONDS.
     """
-    # Convert datetime columns to strings for JSON serialization
-    df_safe = df.copy()
+    if profile is None:
+        profile = await asyncio.to_thread(ColumnProfile, df)
+    if sample is None:
+        sample = await asyncio.to_thread(chart_sample, df, profile)
+
+    # The prompt needs column types and a few values, not a copy of every row;
+    # datetime columns are converted to strings for JSON serialization
+    df_safe = df.head(5).copy()
     for col in df_safe.columns:
         if pd.api.types.is_datetime64_any_dtype(df_safe[col]):
             df_safe[col] = df_safe[col].dt.strftime('%Y-%m-%d %H:%M:%S')
 
     # Get column info
     numeric_cols = df_safe.select_dtypes(include=['number']).columns.tolist()
-    categorical_cols = df_safe.select_dtypes(include=['object']).columns.tolist()
+    categorical_cols = df_safe.select_dtypes(include=CATEGORICAL_DTYPES).columns.tolist()
 
     # Prepare data summary with JSON-safe values
     data_summary = {
         "columns": df_safe.columns.tolist(),
         "numeric_columns": numeric_cols,
         "categorical_columns": categorical_cols,
-        "row_count": len(df_safe),
+        "row_count": sample.total_rows,
         "sample_values": {}
     }
 
@@ -72,13 +130,14 @@ IMPORTANT RULES:
 2. For timestamps/dates, create TIME-SERIES charts with proper date formatting
 3. For categorical data with many unique values (>20), show only top 10
 4. Choose chart types that make BUSINESS SENSE
-5. Maximum 4 charts total
+5. Use "histogram" for the distribution of one numeric column, "scatter" for two numeric columns
+6. Maximum 4 charts total
 
 Suggest 3-4 charts in the following JSON format:
 {{
   "charts": [
     {{
-      "type": "bar|pie|line|scatter",
+      "type": "bar|pie|line|scatter|histogram",
       "title": "Clear descriptive title",
       "columns": ["column_name1", "column_name2"],
       "aggregation": "mean|sum|count|none",
@@ -91,13 +150,29 @@ Respond ONLY with valid JSON.
 """
 
     try:
-        response = client.models.generate_content(
-            model='gemini-2.0-flash-exp',
-            contents=prompt
+        async def call_gemini() -> Optional[str]:
+            started = time.perf_counter()
+            response = await asyncio.wait_for(
+                client.aio.models.generate_content(
+                    model=settings.GEMINI_MODEL,
+                    contents=prompt
+                ),
+                timeout=settings.LLM_CHARTS_TIMEOUT_SECONDS
+            )
+            record_llm_usage(llm_stats, "charts", response, started)
+            return response.text if response else None
+
+        response_text = await cached_generate(
+            "charts",
+            settings.GEMINI_MODEL,
+            {"data_summary": data_summary, "user_prompt": user_prompt},
+            call_gemini,
+            use_cache=use_cache,
+            llm_stats=llm_stats
         )
 
-        if response and response.text:
-            json_text = response.text.strip()
+        if response_text:
+            json_text = response_text.strip()
 
             # Remove markdown code blocks
             if '```' in json_text:
@@ -117,31 +192,60 @@ Respond ONLY with valid JSON.
                 else:
                     raise
 
-            print("=== AI CHART SUGGESTIONS ===")
-            print(json.dumps(ai_suggestions, indent=2))
+            logger.debug("AI chart suggestions: %s", json.dumps(ai_suggestions, indent=2))
 
-            # Convert AI suggestions to Chart.js configs
-            charts = []
-            for suggestion in ai_suggestions.get('charts', [])[:4]:
-                chart_config = create_chart_from_suggestion(df, suggestion)
-                if chart_config:
-                    # Clean the entire chart config recursively
-                    chart_config = clean_chart_data(chart_config)
-                    charts.append(chart_config)
+            return await asyncio.to_thread(
+                charts_from_suggestions, df, ai_suggestions.get('charts', [])[:4], profile, sample
+            )
 
-            return charts if charts else generate_charts_fallback(df)
+    except asyncio.TimeoutError:
+        logger.warning("AI chart generation timed out after %ss", settings.LLM_CHARTS_TIMEOUT_SECONDS)
+        if llm_stats is not None and "charts" in llm_stats:
+            llm_stats["charts"]["timed_out"] = True
+        return await asyncio.to_thread(generate_charts_fallback, df, profile, sample)
 
     except Exception as e:
-        print(f"AI chart generation error: {e}")
-        return generate_charts_fallback(df)
+        logger.warning("AI chart generation error: %s", e)
+        return await asyncio.to_thread(generate_charts_fallback, df, profile, sample)
+
+    return await asyncio.to_thread(generate_charts_fallback, df, profile, sample)
 
-    return generate_charts_fallback(df)
 
+def charts_from_suggestions(
+        df: pd.DataFrame,
+        suggestions: List[Dict[str, Any]],
+        profile: ColumnProfile,
+        sample: RowSample
+) -> List[Dict[str, Any]]:
+    """Convert AI suggestions to Chart.js configs, or fallback charts if none could be built"""
+    charts = []
+    for suggestion in suggestions:
+        chart_config = create_chart_from_suggestion(df, suggestion, profile, sample)
+        if chart_config:
+            charts.append(chart_config)
+
+    return charts if charts else generate_charts_fallback(df, profile, sample)
 
-def create_chart_from_suggestion(df: pd.DataFrame, suggestion: dict) -> Dict[str, Any]:
+
+def create_chart_from_suggestion(
+        df: pd.DataFrame,
+        suggestion: dict,
+        profile: Optional[ColumnProfile] = None,
+        sample: Optional[RowSample] = None
+) -> Dict[str, Any]:
     """
     Convert AI suggestion to Chart.js config
+
+    Charts from the column profile are exact; charts that scan rows (dates)
+    are built from `sample` with weighted (estimated) counts. Scatter,
+    histogram and non-date line charts read every row of df (labeled with
+    sample.frame_info(), which is exact unless df is itself a sample).
     """
+    if profile is None:
+        profile = ColumnProfile(df)
+    if sample is None:
+        sample = chart_sample(df, profile)
+
     chart_type = suggestion.get('type', 'bar')
     columns = suggestion.get('columns', [])
     title = suggestion.get('title', 'Chart')
@@ -156,23 +260,30 @@ def create_chart_from_suggestion(df: pd.DataFrame, suggestion: dict) -> Dict[str
 
             # Handle datetime columns
             if pd.api.types.is_datetime64_any_dtype(df[col]):
-                df_temp = df.copy()
-                df_temp[col] = df_temp[col].dt.strftime('%Y-%m-%d')
-                value_counts = df_temp[col].value_counts().head(10)
+                value_counts = sample.count(sample.df[col].dt.strftime('%Y-%m-%d'))
+                value_counts = value_counts.sort_values(ascending=False, kind='stable').head(10)
                 labels = value_counts.index.tolist()
                 values = value_counts.values.tolist()
-            elif aggregation == 'count' or df[col].dtype == 'object':
-                value_counts = df[col].value_counts().head(10)
+                sampling = sample.info()
+            elif aggregation == 'count' or col in profile.categorical_columns:
+                value_counts = sample.scale_counts(profile.value_counts(col).head(10))
                 labels = [str(x) for x in value_counts.index.tolist()]
                 values = value_counts.values.tolist()
+                sampling = sample.frame_info()
+            elif col in profile.numeric_columns:
+                labels = [col]
+                values = [float(profile.numeric_summary.at[col, "mean"])]
+                sampling = sample.frame_info()
             else:
                 labels = [col]
                 values = [float(df[col].mean())]
+                sampling = sample.frame_info()
 
             return {
                 "type": "bar",
                 "title": title,
                 "description": suggestion.get('description', ''),
+                "sampling": sampling,
                 "data": {
                     "labels": labels,
                     "datasets": [{
@@ -194,12 +305,13 @@ def create_chart_from_suggestion(df: pd.DataFrame, suggestion: dict) -> Dict[str
 
         elif chart_type == 'pie':
             col = columns[0]
-            value_counts = df[col].value_counts().head(10)
+            value_counts = sample.scale_counts(profile.value_counts(col).head(10))
 
             return {
                 "type": "pie",
                 "title": title,
                 "description": suggestion.get('description', ''),
+                "sampling": sample.frame_info(),
                 "data": {
                     "labels": [str(x) for x in value_counts.index.tolist()],
                     "datasets": [{
@@ -232,18 +344,23 @@ def create_chart_from_suggestion(df: pd.DataFrame, suggestion: dict) -> Dict[str
 
             # Check if it's a datetime column - TIME SERIES
             if pd.api.types.is_datetime64_any_dtype(df[col]):
-                # Group by date and count
-                df_sorted = df.copy()
-                df_sorted['date_only'] = df_sorted[col].dt.date
-                daily_counts = df_sorted.groupby('date_only').size().reset_index(name='count')
-                daily_counts = daily_counts.sort_values('date_only')
+                # Group by date and count (weighted rows of the sample)
+                dates = sample.df[col].dt.date
+                daily_counts = sample.count(dates)
 
                 # If there's a second column (like channel), break down by that
                 if len(columns) > 1 and columns[1] in df.columns:
                     col2 = columns[1]
                     # Multi-line chart by category
-                    df_sorted[col2] = df_sorted[col2].fillna('Unknown')
-                    pivot_data = df_sorted.groupby([df_sorted[col].dt.date, col2]).size().unstack(fill_value=0)
+                    categories = sample.df[col2]
+                    if isinstance(categories.dtype, pd.CategoricalDtype):
+                        categories = categories.astype(object)
+                    categories = categories.fillna('Unknown')
+                    pivot_data = sample.count([dates, categories]).unstack(fill_value=0)
+                    source_points = len(pivot_data)
+                    # The 5 categories with the most rows, largest first
+                    top_categories = pivot_data.sum().nlargest(5).index
+                    pivot_data = downsample_by_date(pivot_data[top_categories])
 
                     datasets = []
                     colors = [
@@ -254,7 +371,7 @@ def create_chart_from_suggestion(df: pd.DataFrame, suggestion: dict) -> Dict[str
                         "rgba(132, 204, 22, 1)"
                     ]
 
-                    for idx, category in enumerate(pivot_data.columns[:5]):  # Top 5 categories
+                    for idx, category in enumerate(pivot_data.columns):
                         datasets.append({
                             "label": str(category),
                             "data": pivot_data[category].tolist(),
@@ -269,6 +386,8 @@ def create_chart_from_suggestion(df: pd.DataFrame, suggestion: dict) -> Dict[str
                         "type": "line",
                         "title": title,
                         "description": suggestion.get('description', ''),
+                        "sampling": sample.info(),
+                        "downsampling": downsampling_info(len(pivot_data), source_points),
                         "data": {
                             "labels": [str(d) for d in pivot_data.index.tolist()],
                             "datasets": datasets
@@ -287,15 +406,19 @@ def create_chart_from_suggestion(df: pd.DataFrame, suggestion: dict) -> Dict[str
                     }
                 else:
                     # Single line - daily counts
+                    source_points = len(daily_counts)
+                    daily_counts = downsample_by_date(daily_counts.to_frame()).iloc[:, 0]
                     return {
                         "type": "line",
                         "title": title,
                         "description": suggestion.get('description', ''),
+                        "sampling": sample.info(),
+                        "downsampling": downsampling_info(len(daily_counts), source_points),
                         "data": {
-                            "labels": [str(d) for d in daily_counts['date_only'].tolist()],
+                            "labels": [str(d) for d in daily_counts.index.tolist()],
                             "datasets": [{
                                 "label": "Interactions",
-                                "data": daily_counts['count'].tolist(),
+                                "data": daily_counts.tolist(),
                                 "borderColor": "rgba(139, 92, 246, 1)",
                                 "backgroundColor": "rgba(139, 92, 246, 0.1)",
                                 "borderWidth": 2,
@@ -316,14 +439,31 @@ def create_chart_from_suggestion(df: pd.DataFrame, suggestion: dict) -> Dict[str
                         }
                     }
             else:
-                # Non-datetime line chart
-                labels = [f"Point {i + 1}" for i in range(min(len(df), 50))]
-                data_values = df[col].head(50).tolist()
+                # Non-datetime line chart: the whole column, downsampled
+                if col in profile.numeric_columns:
+                    # Row numbers in the cleaned data (a chunked-mode frame keeps them as its index)
+                    if sample.frame_rows == sample.total_rows:
+                        positions = np.arange(len(df))
+                    else:
+                        positions = df.index.to_numpy()
+                    values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                    present = ~np.isnan(values)
+                    positions, values = positions[present], values[present]
+                    kept = downsample(positions, values)
+                    labels = [f"Row {p + 1}" for p in positions[kept].tolist()]
+                    data_values = values[kept].tolist()
+                    downsampling = downsampling_info(len(kept), len(values))
+                else:
+                    labels = [f"Point {i + 1}" for i in range(min(len(df), 50))]
+                    data_values = df[col].head(50).tolist()
+                    downsampling = None
 
                 return {
                     "type": "line",
                     "title": title,
                     "description": suggestion.get('description', ''),
+                    "sampling": sample.frame_info(),
+                    "downsampling": downsampling,
                     "data": {
                         "labels": labels,
                         "datasets": [{
@@ -348,6 +488,9 @@ def create_chart_from_suggestion(df: pd.DataFrame, suggestion: dict) -> Dict[str
         elif chart_type == 'scatter' and len(columns) >= 2:
             col1, col2 = columns[0], columns[1]
 
+            if col1 in profile.numeric_columns and col2 in profile.numeric_columns:
+                return scatter_density_chart(df, col1, col2, title, suggestion.get('description', ''), sample)
+
             scatter_data = []
             for x, y in zip(df[col1].head(50), df[col2].head(50)):
                 scatter_data.append({
@@ -359,6 +502,7 @@ def create_chart_from_suggestion(df: pd.DataFrame, suggestion: dict) -> Dict[str
                 "type": "scatter",
                 "title": title,
                 "description": suggestion.get('description', ''),
+                "sampling": sample.frame_info(),
                 "data": {
                     "datasets": [{
                         "label": f"{col1} vs {col2}",
@@ -380,21 +524,164 @@ def create_chart_from_suggestion(df: pd.DataFrame, suggestion: dict) -> Dict[str
                 }
             }
 
+        elif chart_type == 'histogram' and columns[0] in profile.numeric_columns:
+            return histogram_chart(df, columns[0], title, suggestion.get('description', ''), profile, sample)
+
     except Exception as e:
-        print(f"Chart creation error: {e}")
+        logger.warning("Chart creation error: %s", e)
         return None
 
     return None
 
 
-def generate_charts_fallback(df: pd.DataFrame) -> List[Dict[str, Any]]:
+def scatter_density_chart(
+        df: pd.DataFrame,
+        col1: str,
+        col2: str,
+        title: str,
+        description: str,
+        sample: RowSample
+) -> Dict[str, Any]:
+    """
+    Scatter of two numeric columns over all rows, binned on a
+    SCATTER_GRID_BINS x SCATTER_GRID_BINS grid: one point per non-empty
+    cell at its centre, sized by the rows in it
+    """
+    bins = settings.SCATTER_GRID_BINS
+    x, y, counts = grid_density(
+        df[col1].to_numpy(dtype=np.float64, na_value=np.nan),
+        df[col2].to_numpy(dtype=np.float64, na_value=np.nan),
+        bins
+    )
+    counts = sample.scale_counts(pd.Series(counts)).to_numpy()
+    largest = counts.max() if len(counts) else 1
+    radii = np.round(2 + 8 * np.sqrt(counts / largest), 1)
+
+    return {
+        "type": "scatter",
+        "title": title,
+        "description": description,
+        "sampling": sample.frame_info(),
+        "binning": {"bins": [bins, bins], "points": len(counts), "rows": int(counts.sum())},
+        "data": {
+            "datasets": [{
+                "label": f"{col1} vs {col2} (rows per cell)",
+                "data": [
+                    {"x": cx, "y": cy, "count": count}
+                    for cx, cy, count in zip(x.tolist(), y.tolist(), counts.tolist())
+                ],
+                "pointRadius": radii.tolist(),
+                "backgroundColor": "rgba(236, 72, 153, 0.6)",
+                "borderColor": "rgba(236, 72, 153, 1)",
+            }]
+        },
+        "options": {
+            "responsive": True,
+            "plugins": {
+                "legend": {"display": True},
+                "title": {"display": True, "text": title}
+            },
+            "scales": {
+                "x": {"title": {"display": True, "text": col1}},
+                "y": {"title": {"display": True, "text": col2}}
+            }
+        }
+    }
+
+
+def histogram_chart(
+        df: pd.DataFrame,
+        col: str,
+        title: str,
+        description: str,
+        profile: ColumnProfile,
+        sample: RowSample
+) -> Dict[str, Any]:
+    """
+    Distribution of a numeric column in HISTOGRAM_BINS equal-width bins,
+    one np.histogram pass over the column (its range comes from the profile),
+    rendered as a bar chart
+    """
+    value_range = (profile.numeric_summary.at[col, "min"], profile.numeric_summary.at[col, "max"])
+    counts, edges = histogram(
+        df[col].to_numpy(dtype=np.float64, na_value=np.nan),
+        settings.HISTOGRAM_BINS,
+        value_range
+    )
+    counts = sample.scale_counts(pd.Series(counts))
+
+    return {
+        "type": "bar",
+        "title": title,
+        "description": description,
+        "sampling": sample.frame_info(),
+        "binning": {"bins": len(counts), "edges": edges.tolist()},
+        "data": {
+            "labels": [f"{lo:.4g} – {hi:.4g}" for lo, hi in zip(edges[:-1].tolist(), edges[1:].tolist())],
+            "datasets": [{
+                "label": col,
+                "data": counts.tolist(),
+                "backgroundColor": "rgba(34, 211, 238, 0.6)",
+                "borderColor": "rgba(34, 211, 238, 1)",
+                "borderWidth": 1,
+                "barPercentage": 1.0,
+                "categoryPercentage": 1.0
+            }]
+        },
+        "options": {
+            "responsive": True,
+            "plugins": {
+                "legend": {"display": False},
+                "title": {"display": True, "text": title}
+            },
+            "scales": {
+                "x": {"title": {"display": True, "text": col}},
+                "y": {"title": {"display": True, "text": "Count"}, "beginAtZero": True}
+            }
+        }
+    }
+
+
+def downsample_by_date(counts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-date counts (one column per series, dates ascending) reduced to about
+    LINE_CHART_MAX_POINTS dates: the union of each series' downsampled points
+    """
+    if len(counts) <= settings.LINE_CHART_MAX_POINTS or counts.shape[1] == 0:
+        return counts
+
+    x = pd.to_datetime(pd.Index(counts.index)).asi8
+    budget = max(3, settings.LINE_CHART_MAX_POINTS // counts.shape[1])
+    kept = np.unique(np.concatenate([
+        downsample(x, counts[series].to_numpy(dtype=np.float64), budget) for series in counts.columns
+    ]))
+    return counts.iloc[kept]
+
+
+def downsampling_info(points: int, source_points: int) -> Optional[Dict[str, Any]]:
+    """Chart label for a downsampled series, None if every point is plotted"""
+    if points >= source_points:
+        return None
+    return {"method": settings.LINE_CHART_DOWNSAMPLING, "points": points, "source_points": source_points}
+
+
+def generate_charts_fallback(
+        df: pd.DataFrame,
+        profile: Optional[ColumnProfile] = None,
+        sample: Optional[RowSample] = None
+) -> List[Dict[str, Any]]:
     """
     Fallback: Rule-based chart generation (improved)
     """
+    if profile is None:
+        profile = ColumnProfile(df)
+    if sample is None:
+        sample = chart_sample(df, profile)
+
     charts = []
 
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+    numeric_cols = list(profile.numeric_columns)
+    categorical_cols = list(profile.categorical_columns)
 
     # Filter out ID columns
     numeric_cols = [col for col in numeric_cols if not any(x in col.lower() for x in ['id', '_id', 'index'])]
@@ -408,32 +695,34 @@ def generate_charts_fallback(df: pd.DataFrame) -> List[Dict[str, Any]]:
             "type": "bar",
             "title": f"{col.replace('_', ' ').title()} Overview",
             "description": f"Statistical overview of {col}",
+            "sampling": sample.frame_info(),
             "data": {
                 "labels": ["Mean", "Median", "Max", "Min"],
                 "datasets": [{
                     "label": col,
                     "data": [
-                        df[col].mean(),
-                        df[col].median(),
-                        df[col].max(),
-                        df[col].min()
+                        profile.numeric_summary.at[col, "mean"],
+                        profile.numeric_summary.at[col, "median"],
+                        profile.numeric_summary.at[col, "max"],
+                        profile.numeric_summary.at[col, "min"]
                     ],
                     "backgroundColor": "rgba(99, 102, 241, 0.6)",
                 }]
             },
             "options": {"responsive": True}
         }
-        charts.append(clean_chart_data(chart))
+        charts.append(chart)
 
     # Chart 2: First categorical
     if len(categorical_cols) > 0:
         col = categorical_cols[0]
-        value_counts = df[col].value_counts().head(10)
+        value_counts = sample.scale_counts(profile.value_counts(col).head(10))
 
         chart = {
             "type": "pie",
             "title": f"{col.replace('_', ' ').title()} Distribution",
             "description": f"Distribution of {col}",
+            "sampling": sample.frame_info(),
             "data": {
                 "labels": [str(x) for x in value_counts.index.tolist()],
                 "datasets": [{
@@ -448,27 +737,26 @@ def generate_charts_fallback(df: pd.DataFrame) -> List[Dict[str, Any]]:
             },
             "options": {"responsive": True}
         }
-        charts.append(clean_chart_data(chart))
-
-    return charts
+        charts.append(chart)
 
+    # Chart 3: Distribution of the first meaningful numeric column
+    if len(numeric_cols) > 0:
+        col = numeric_cols[0]
+        chart = histogram_chart(
+            df, col, f"{col.replace('_', ' ').title()} Distribution",
+            f"Histogram of {col}", profile, sample
+        )
+        charts.append(chart)
 
-def clean_chart_data(obj):
-    """
-    Recursively clean chart data for JSON serialization
-    Handles NaN, datetime, numpy types
-    """
-    if isinstance(obj, dict):
-        return {key: clean_chart_data(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [clean_chart_data(item) for item in obj]
-    else:
-        return convert_to_json_safe(obj)
+    return charts
 
 
 def convert_to_json_safe(obj):
     """
     Convert non-JSON-serializable objects to JSON-safe format
+
+    Only used for the few sample values in the chart prompt; results are
+    encoded by json_codec.
     """
     # Handle NaN and infinity
     if isinstance(obj, float):
@@ -0,0 +1,164 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
+from fastapi import HTTPException
+from app.services.processing_service import process_file, SKIPPABLE_STAGES
+from app.services.job_store import update_job
+from app.services import progress
+from app.utils.logging_config import configure_logging
+from app.services.metrics import JOBS, observe_job
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Process pool shared by all requests, created lazily on first submit
+_executor: Optional[ProcessPoolExecutor] = None
+# Progress events from the workers (see progress.py)
+_progress_queue = None
+# Jobs that are queued or running, keyed by job_id
+_active_jobs: Dict[str, Future] = {}
+_lock = threading.Lock()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the worker pool, creating it on first use"""
+    global _executor, _progress_queue
+    if _executor is None:
+        # spawn: workers must not inherit the server's event loop and threads
+        context = multiprocessing.get_context("spawn")
+        if _progress_queue is None:
+            _progress_queue = context.Queue()
+            progress.start_broker(_progress_queue)
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.WORKER_PROCESSES,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(_progress_queue,)
+        )
+    return _executor
+
+
+def _init_worker(progress_queue) -> None:
+    """Worker process setup: logging, and progress events sent to the API process"""
+    configure_logging()
+    progress.set_worker_queue(progress_queue)
+
+
+def _run_job(job_id: str) -> dict:
+    """
+    Worker entry point. Returns a small summary instead of the full results:
+    status plus the stage timings and LLM usage observed by metrics.observe_job.
+    """
+    results = process_file(job_id)
+    cache_hit = bool(results.get("cache", {}).get("hit"))
+    return {
+        "job_id": job_id,
+        "status": results.get("status"),
+        "processing_mode": results.get("processing_mode"),
+        "cache_hit": cache_hit,
+        # A cache hit carries the timings of the job it was copied from
+        "timings": None if cache_hit else results.get("timings"),
+        "llm": None if cache_hit else results.get("llm")
+    }
+
+
+def submit_job(job_id: str, bypass_llm_cache: bool = False, skip_stages: Sequence[str] = ()) -> int:
+    """
+    Queue a job for background processing
+
+    bypass_llm_cache forces fresh Gemini calls (and skips the result cache);
+    skip_stages names pipeline stages not to run (see SKIPPABLE_STAGES).
+
+    Returns the number of jobs queued or running (including this one).
+    Raises 409 if the job is already active and 503 if the queue is full.
+    """
+    unknown = sorted(set(skip_stages) - set(SKIPPABLE_STAGES))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot skip stages: {', '.join(unknown)}. Skippable: {', '.join(SKIPPABLE_STAGES)}"
+        )
+
+    with _lock:
+        if job_id in _active_jobs:
+            raise HTTPException(status_code=409, detail="Job is already queued or processing")
+
+        if len(_active_jobs) >= settings.MAX_QUEUED_JOBS:
+            raise HTTPException(
+                status_code=503,
+                detail="Processing queue is full. Please try again later."
+            )
+
+        update_job(
+            job_id,
+            {"status": "pending", "bypass_llm_cache": bypass_llm_cache, "skip_stages": sorted(set(skip_stages))},
+            remove=("error",)
+        )
+        progress.publish(job_id, "pending", "queued", 0)
+
+        try:
+            future = get_executor().submit(_run_job, job_id)
+        except Exception as e:
+            error = f"Could not queue job: {str(e)}"
+            update_job(job_id, {"status": "failed", "error": error})
+            progress.publish(job_id, "failed", "failed", 0, error=error)
+            raise
+
+        _active_jobs[job_id] = future
+        queue_depth = len(_active_jobs)
+
+    future.add_done_callback(lambda f: _on_job_done(job_id, f))
+    return queue_depth
+
+
+def _on_job_done(job_id: str, future: Future) -> None:
+    """Release the queue slot and record failures the worker couldn't record itself"""
+    with _lock:
+        _active_jobs.pop(job_id, None)
+
+    if future.cancelled():
+        error = "Job was cancelled before it started"
+    else:
+        exc = future.exception()
+        if exc is None:
+            try:
+                observe_job(future.result())
+            except Exception as e:
+                logger.warning("Could not record metrics for job %s: %s", job_id, e)
+            return
+        error = str(exc)
+
+    JOBS.labels(status="failed").inc()
+
+    # process_file marks its own failures; this covers crashed or cancelled workers
+    try:
+        if update_job(job_id, {"status": "failed", "error": error}, only_if_status=("pending", "processing")):
+            progress.publish(job_id, "failed", "failed", 0, error=error)
+    except Exception as e:
+        logger.warning("Could not mark job %s as failed: %s", job_id, e)
+
+
+def get_queue_stats() -> dict:
+    """Current pool utilisation"""
+    with _lock:
+        active = len(_active_jobs)
+    return {
+        "active_jobs": active,
+        "max_workers": settings.WORKER_PROCESSES,
+        "max_queued_jobs": settings.MAX_QUEUED_JOBS
+    }
+
+
+def shutdown() -> None:
+    """Stop the worker pool, dropping jobs that haven't started"""
+    global _executor, _progress_queue
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    if _progress_queue is not None:
+        # Stops the broker thread
+        _progress_queue.put(None)
+        _progress_queue = None
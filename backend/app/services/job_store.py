@@ -0,0 +1,219 @@
+import logging
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from fastapi import HTTPException
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Job records in one embedded SQLite database (WAL mode, so status reads never
+# wait for the worker processes writing to it):
+#   jobs(job_id PRIMARY KEY, status, filename, created_at, updated_at, error, data)
+# data holds the full metadata document; the other columns are copies of its
+# keys so /status and job listings are answered from indexes alone.
+JOB_STATUSES = ("pending", "processing", "completed", "failed")
+# Lock waits longer than this raise "database is locked"
+BUSY_TIMEOUT_SECONDS = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    filename TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    error TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created_at ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at);
+"""
+
+SUMMARY_COLUMNS = ("job_id", "status", "filename", "created_at", "updated_at", "error")
+
+# One connection per thread (sqlite3 connections must not be shared across threads)
+_local = threading.local()
+
+
+def get_job_store_path() -> str:
+    return settings.JOB_STORE_PATH or os.path.join(settings.UPLOAD_DIR, "jobs.db")
+
+
+def _connect() -> sqlite3.Connection:
+    """This thread's connection, opened (and the schema created) on first use"""
+    conn = getattr(_local, "conn", None)
+    # A process started by fork must not reuse its parent's connection
+    if conn is None or _local.pid != os.getpid():
+        # Autocommit; transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(get_job_store_path(), timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _local.conn, _local.pid = conn, os.getpid()
+    return conn
+
+
+def _row_values(metadata: dict) -> tuple:
+    return (
+        metadata["job_id"],
+        metadata.get("status", "pending"),
+        metadata.get("filename"),
+        metadata["created_at"],
+        metadata["updated_at"],
+        metadata.get("error"),
+        json.dumps(metadata)
+    )
+
+
+def create_job(metadata: dict) -> None:
+    """Insert a new job record (job_id and created_at are required)"""
+    metadata.setdefault("updated_at", metadata["created_at"])
+    _connect().execute(
+        "INSERT INTO jobs (job_id, status, filename, created_at, updated_at, error, data) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        _row_values(metadata)
+    )
+
+
+def get_job(job_id: str) -> dict:
+    """Full job metadata, raising 404 if the job doesn't exist"""
+    row = _connect().execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return json.loads(row["data"])
+
+
+def get_job_summary(job_id: str) -> dict:
+    """Status columns of one job (a primary key lookup; the metadata document isn't parsed)"""
+    row = _connect().execute(
+        f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+    ).fetchone()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return dict(row)
+
+
+def update_job(
+        job_id: str,
+        changes: Dict[str, Any],
+        remove: Sequence[str] = (),
+        only_if_status: Optional[Sequence[str]] = None
+) -> Optional[dict]:
+    """
+    Atomically merge `changes` into the job's metadata and drop the `remove` keys
+
+    With only_if_status the update only happens while the job is in one of
+    those states (e.g. a crash handler must not overwrite "completed"), and
+    None is returned if it isn't. Raises 404 if the job doesn't exist.
+    """
+    conn = _connect()
+    # IMMEDIATE takes the write lock up front, so no other process can change
+    # the record between the read and the write
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT status, data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if only_if_status is not None and row["status"] not in only_if_status:
+            conn.execute("ROLLBACK")
+            return None
+
+        metadata = json.loads(row["data"])
+        metadata.update(changes)
+        for key in remove:
+            metadata.pop(key, None)
+        metadata["updated_at"] = datetime.now().isoformat()
+
+        conn.execute(
+            "UPDATE jobs SET status = ?, filename = ?, created_at = ?, updated_at = ?, error = ?, data = ? "
+            "WHERE job_id = ?",
+            _row_values(metadata)[1:] + (job_id,)
+        )
+        conn.execute("COMMIT")
+        return metadata
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def list_jobs(
+        status: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0
+) -> List[dict]:
+    """Job summaries, newest first, optionally filtered by status and creation time (inclusive)"""
+    where, params = _filters(status, since)
+    query = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM jobs{where} ORDER BY created_at DESC LIMIT ? OFFSET ?"
+    rows = _connect().execute(query, params + [limit, offset]).fetchall()
+    return [dict(row) for row in rows]
+
+
+def count_jobs(status: Optional[str] = None, since: Optional[datetime] = None) -> int:
+    """Number of jobs matching the list_jobs filters"""
+    where, params = _filters(status, since)
+    return _connect().execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+
+
+def _filters(status: Optional[str], since: Optional[datetime]) -> tuple:
+    """WHERE clause (served by the status/created_at indexes) and its parameters"""
+    conditions, params = [], []
+    if status is not None:
+        conditions.append("status = ?")
+        params.append(status)
+    if since is not None:
+        # created_at is stored as local ISO 8601, which sorts chronologically as text
+        conditions.append("created_at >= ?")
+        params.append(since.isoformat())
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+
+def migrate_metadata_files() -> int:
+    """
+    Import jobs still stored as {UPLOAD_DIR}/{job_id}/metadata.json
+
+    Jobs already in the database are left alone, so this is safe to run on
+    every start. The files are kept (and no longer written). Returns the
+    number of jobs imported.
+    """
+    rows = []
+    for name in os.listdir(settings.UPLOAD_DIR):
+        path = os.path.join(settings.UPLOAD_DIR, name, "metadata.json")
+        if not os.path.isfile(path):
+            continue
+        try:
+            with open(path, 'r') as f:
+                metadata = json.load(f)
+            metadata.setdefault("job_id", name)
+            if not metadata.get("created_at"):
+                metadata["created_at"] = datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+            metadata.setdefault("updated_at", metadata["created_at"])
+            rows.append(_row_values(metadata))
+        except (OSError, ValueError) as e:
+            logger.warning("Could not migrate job metadata %s: %s", path, e)
+
+    if not rows:
+        return 0
+
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO jobs (job_id, status, filename, created_at, updated_at, error, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        imported = conn.total_changes - before
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return imported
@@ -0,0 +1,190 @@
+import logging
+import os
+import json
+import math
+import numbers
+import time
+import hashlib
+import uuid
+from typing import Dict, Any, Awaitable, Callable, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Disk-backed memo of Gemini responses:
+#   {RESULT_CACHE_DIR}/llm/{key}.json -> {"kind", "model", "created_at", "response"}
+# Entries expire after LLM_CACHE_TTL_SECONDS; beyond LLM_CACHE_MAX_ENTRIES the
+# least recently used (by mtime) are evicted.
+LLM_CACHE_DIR = os.path.join(settings.RESULT_CACHE_DIR, "llm")
+
+
+def _normalize(value: Any) -> Any:
+    """
+    Canonical form of prompt inputs: floats rounded to LLM_CACHE_FLOAT_DIGITS
+    significant digits, NaN/inf as None, whitespace collapsed in strings
+    """
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        value = float(value)
+        if not math.isfinite(value):
+            return None
+        return float(f"{value:.{settings.LLM_CACHE_FLOAT_DIGITS}g}")
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return str(value)
+
+
+def make_llm_cache_key(kind: str, model: str, inputs: Dict[str, Any]) -> str:
+    """Hash of the normalized inputs a prompt is built from, plus the call kind and model"""
+    canonical = json.dumps(
+        {"kind": kind, "model": model, "inputs": _normalize(inputs)},
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(LLM_CACHE_DIR, f"{key}.json")
+
+
+def get_cached_response(key: str) -> Optional[str]:
+    """Cached response text, or None if missing or expired"""
+    path = _entry_path(key)
+    try:
+        with open(path, 'r') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - entry.get("created_at", 0) > settings.LLM_CACHE_TTL_SECONDS:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+    try:
+        # Mark as recently used for LRU eviction
+        os.utime(path)
+    except OSError:
+        pass
+    return entry.get("response")
+
+
+def store_response(key: str, kind: str, model: str, response: str) -> None:
+    os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+    path = _entry_path(key)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            "kind": kind,
+            "model": model,
+            "created_at": time.time(),
+            "response": response
+        }, f)
+    os.replace(tmp_path, path)
+    evict()
+
+
+def evict(max_entries: Optional[int] = None) -> int:
+    """Drop expired entries, then least recently used ones beyond max_entries. Returns entries removed."""
+    if max_entries is None:
+        max_entries = settings.LLM_CACHE_MAX_ENTRIES
+    if not os.path.exists(LLM_CACHE_DIR):
+        return 0
+
+    now = time.time()
+    entries = []
+    removed = 0
+    for name in os.listdir(LLM_CACHE_DIR):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(LLM_CACHE_DIR, name)
+        try:
+            mtime = os.path.getmtime(path)
+            # mtime is refreshed on every hit, so an entry unused for the TTL is surely expired
+            if now - mtime > settings.LLM_CACHE_TTL_SECONDS:
+                os.remove(path)
+                removed += 1
+            else:
+                entries.append((mtime, path))
+        except OSError:
+            continue
+
+    for _, path in sorted(entries)[:max(len(entries) - max_entries, 0)]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+async def cached_generate(
+        kind: str,
+        model: str,
+        inputs: Dict[str, Any],
+        generate: Callable[[], Awaitable[Optional[str]]],
+        use_cache: bool = True,
+        llm_stats: Optional[Dict[str, Any]] = None
+) -> Optional[str]:
+    """
+    Return the cached response for these inputs, or await `generate` and
+    cache its (non-empty) result
+
+    The outcome ("hit", "miss", "bypass" or "disabled") is recorded in
+    llm_stats[kind]["cache"] when llm_stats is given.
+    """
+    if not settings.LLM_CACHE_ENABLED:
+        status = "disabled"
+    elif not use_cache:
+        status = "bypass"
+    else:
+        status = "miss"
+
+    key = make_llm_cache_key(kind, model, inputs)
+    response = None
+    if status == "miss":
+        response = get_cached_response(key)
+        if response is not None:
+            status = "hit"
+
+    if llm_stats is not None:
+        llm_stats[kind] = {"cache": status, "model": model}
+
+    if response is not None:
+        return response
+
+    response = await generate()
+    if response and status != "disabled":
+        try:
+            store_response(key, kind, model, response)
+        except OSError as e:
+            logger.warning("LLM cache store error: %s", e)
+    return response
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    entries = 0
+    size = 0
+    if os.path.exists(LLM_CACHE_DIR):
+        for name in os.listdir(LLM_CACHE_DIR):
+            if name.endswith(".json"):
+                entries += 1
+                size += os.path.getsize(os.path.join(LLM_CACHE_DIR, name))
+    return {
+        "enabled": settings.LLM_CACHE_ENABLED,
+        "entries": entries,
+        "size_bytes": size,
+        "max_entries": settings.LLM_CACHE_MAX_ENTRIES,
+        "ttl_seconds": settings.LLM_CACHE_TTL_SECONDS
+    }
@@ -1,7 +1,16 @@
+import logging
 from google import genai
 from google.genai import types
+from typing import Any, Dict, Optional
 from app.config import settings
+from app.services.llm_cache import cached_generate
+from app.services.metrics import record_llm_usage
 import json
+import asyncio
+import time
+
+logger = logging.getLogger(__name__)
+
 
 # Configure Gemini Client
 client = None
@@ -9,14 +18,25 @@ if settings.GEMINI_API_KEY:
     client = genai.Client(api_key=settings.GEMINI_API_KEY)
 
 
-def generate_insights(df_info: dict, statistics: dict, cleaning_report: dict) -> str:
+async def generate_insights(
+        df_info: dict,
+        statistics: dict,
+        cleaning_report: dict,
+        use_cache: bool = True,
+        llm_stats: Optional[Dict[str, Any]] = None
+) -> str:
     """
     Generate AI-powered insights using Gemini
 
+    Uses the async client so it can run alongside chart generation; the call
+    is abandoned after LLM_INSIGHTS_TIMEOUT_SECONDS.
+
     Args:
         df_info: DataFrame information
         statistics: Statistical analysis results
         cleaning_report: Data cleaning report
+        use_cache: Reuse the response for effectively identical inputs (see llm_cache)
+        llm_stats: Per-job LLM call record, updated under "insights"
 
     Returns:
         AI-generated insights as string
@@ -50,16 +70,52 @@ Format your response in clear markdown with headers and bullet points.
 Keep it concise and business-focused.
 """
 
-        # Call Gemini API
-        response = client.models.generate_content(
-            model='gemini-2.0-flash-exp',
-            contents=prompt
+        async def call_gemini() -> Optional[str]:
+            started = time.perf_counter()
+            response = await asyncio.wait_for(
+                client.aio.models.generate_content(
+                    model=settings.GEMINI_MODEL,
+                    contents=prompt
+                ),
+                timeout=settings.LLM_INSIGHTS_TIMEOUT_SECONDS
+            )
+            record_llm_usage(llm_stats, "insights", response, started)
+            return response.text if response else None
+
+        # Same schema, (rounded) statistics and cleaning report -> same prompt
+        text = await cached_generate(
+            "insights",
+            settings.GEMINI_MODEL,
+            {
+                "schema": schema_fingerprint(df_info),
+                "statistics": statistics,
+                "cleaning_report": cleaning_report
+            },
+            call_gemini,
+            use_cache=use_cache,
+            llm_stats=llm_stats
         )
 
-        if response and response.text:
-            return response.text
+        if text:
+            return text
         else:
             return "⚠️ Unable to generate insights. Please try again."
 
+    except asyncio.TimeoutError:
+        logger.warning("Insight generation timed out after %ss", settings.LLM_INSIGHTS_TIMEOUT_SECONDS)
+        if llm_stats is not None and "insights" in llm_stats:
+            llm_stats["insights"]["timed_out"] = True
+        return "⚠️ Unable to generate insights. Please try again."
+
     except Exception as e:
-        return f"⚠️ Error generating insights: {str(e)}\n\nPlease check your Gemini API key."
\ No newline at end of file
+        return f"⚠️ Error generating insights: {str(e)}\n\nPlease check your Gemini API key."
+
+
+def schema_fingerprint(df_info: dict) -> Dict[str, Any]:
+    """Row/column counts plus column names and dtypes, the schema part of an LLM cache key"""
+    return {
+        "rows": df_info.get("rows", 0),
+        "columns": df_info.get("columns", 0),
+        "column_names": df_info.get("column_names", []),
+        "column_types": df_info.get("column_types", {})
+    }
\ No newline at end of file
@@ -0,0 +1,110 @@
+import sys
+import time
+from typing import Dict, Any, Optional
+from prometheus_client import Counter, Histogram
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Workers are separate processes, so they report stage timings in their job
+# summary and these metrics are observed in the API process (see job_service)
+
+STAGE_DURATION = Histogram(
+    "unstructiq_stage_duration_seconds",
+    "Wall time of a pipeline stage",
+    ["stage", "mode"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+STAGE_RSS_DELTA = Histogram(
+    "unstructiq_stage_peak_rss_delta_bytes",
+    "Growth of the worker's peak RSS during a pipeline stage",
+    ["stage", "mode"],
+    buckets=(0, 1e6, 1e7, 5e7, 1e8, 2.5e8, 5e8, 1e9, 2e9, 4e9)
+)
+STAGE_THROUGHPUT = Histogram(
+    "unstructiq_stage_rows_per_second",
+    "Rows processed per second by a pipeline stage",
+    ["stage", "mode"],
+    buckets=(1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7, 1e8)
+)
+JOB_DURATION = Histogram(
+    "unstructiq_job_duration_seconds",
+    "Wall time of the processing pipeline of a job",
+    ["mode"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+)
+JOBS = Counter(
+    "unstructiq_jobs_total",
+    "Finished jobs",
+    ["status"]
+)
+LLM_LATENCY = Histogram(
+    "unstructiq_llm_latency_seconds",
+    "Gemini round-trip time (cache misses only)",
+    ["call", "model"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+)
+LLM_TOKENS = Histogram(
+    "unstructiq_llm_tokens",
+    "Tokens per Gemini call",
+    ["call", "model", "direction"],
+    buckets=(50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+)
+LLM_CACHE_LOOKUPS = Counter(
+    "unstructiq_llm_cache_lookups_total",
+    "LLM response cache outcomes",
+    ["call", "outcome"]
+)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def record_llm_usage(llm_stats: Optional[Dict[str, Any]], kind: str, response: Any, started: float) -> None:
+    """Add latency and token counts of a Gemini response to llm_stats[kind]"""
+    if llm_stats is None:
+        return
+    entry = llm_stats.setdefault(kind, {})
+    entry["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        entry["prompt_tokens"] = getattr(usage, "prompt_token_count", None)
+        entry["completion_tokens"] = getattr(usage, "candidates_token_count", None)
+
+
+def observe_job(summary: Dict[str, Any]) -> None:
+    """Record a finished job's summary (see job_service._run_job)"""
+    JOBS.labels(status=summary.get("status") or "unknown").inc()
+
+    timings = summary.get("timings")
+    if not timings:
+        # Served from the result cache: nothing was run
+        return
+
+    mode = summary.get("processing_mode") or "unknown"
+    JOB_DURATION.labels(mode=mode).observe(timings["total_ms"] / 1000)
+    for stage, timing in timings.get("stages", {}).items():
+        if timing.get("skipped"):
+            continue
+        STAGE_DURATION.labels(stage=stage, mode=mode).observe(timing["wall_ms"] / 1000)
+        if timing.get("peak_rss_delta_bytes") is not None:
+            STAGE_RSS_DELTA.labels(stage=stage, mode=mode).observe(timing["peak_rss_delta_bytes"])
+        if timing.get("rows_per_sec") is not None:
+            STAGE_THROUGHPUT.labels(stage=stage, mode=mode).observe(timing["rows_per_sec"])
+
+    for call, stats in (summary.get("llm") or {}).items():
+        model = stats.get("model") or "unknown"
+        LLM_CACHE_LOOKUPS.labels(call=call, outcome=stats.get("cache", "unknown")).inc()
+        if stats.get("latency_ms") is not None:
+            LLM_LATENCY.labels(call=call, model=model).observe(stats["latency_ms"] / 1000)
+        for direction, key in (("prompt", "prompt_tokens"), ("completion", "completion_tokens")):
+            if stats.get(key) is not None:
+                LLM_TOKENS.labels(call=call, model=model, direction=direction).observe(stats[key])
@@ -0,0 +1,192 @@
+import time
+import asyncio
+import inspect
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from app.services.metrics import peak_rss_bytes
+
+# Event loop of this worker process, run in a background thread and reused
+# across jobs so the async Gemini client's connections stay bound to one loop
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """This process's background event loop, started on first use"""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="pipeline-event-loop", daemon=True).start()
+    return _loop
+
+
+class Stage:
+    """
+    One step of a Pipeline
+
+    `func` is called with the values named by `inputs` (positionally) and its
+    return value is bound to `outputs` (a tuple when there are several).
+    Coroutine functions run on the process event loop, so LLM stages overlap
+    with each other and with CPU stages. A skipped stage binds `defaults`
+    (one value per output) instead of running. `rows` counts the rows a stage
+    processed, from the context after it ran, for throughput metrics.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            func: Callable,
+            inputs: Sequence[str],
+            outputs: Sequence[str],
+            skippable: bool = False,
+            defaults: Optional[Sequence[Any]] = None,
+            rows: Optional[Callable[[Dict[str, Any]], int]] = None
+    ):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.skippable = skippable
+        self.defaults = list(defaults) if defaults is not None else [None] * len(self.outputs)
+        self.rows = rows
+        self.is_async = inspect.iscoroutinefunction(func)
+
+
+class Pipeline:
+    """
+    Stages scheduled as a DAG: every stage starts as soon as all its inputs
+    exist, independent CPU stages run in parallel on a thread pool (NumPy
+    and pandas release the GIL in their kernels)
+    """
+
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages: List[Stage] = list(stages)
+        produced = [output for stage in self.stages for output in stage.outputs]
+        duplicates = {output for output in produced if produced.count(output) > 1}
+        if duplicates:
+            raise ValueError(f"Outputs produced by more than one stage: {', '.join(sorted(duplicates))}")
+
+    @property
+    def skippable_stages(self) -> List[str]:
+        return [stage.name for stage in self.stages if stage.skippable]
+
+    def run(
+            self,
+            context: Dict[str, Any],
+            skip: Iterable[str] = (),
+            max_workers: int = 4,
+            on_stage_done: Optional[Callable[[str, int, int], None]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run all stages, adding their outputs to `context`
+
+        on_stage_done(name, finished, total) is called as each stage finishes
+        or is skipped, e.g. to report progress.
+
+        Returns per-stage timings: {"wall_ms", "peak_rss_delta_bytes", "rows",
+        "rows_per_sec"} or {"skipped": True}. The peak RSS delta is how much
+        the process high-water mark grew while the stage ran, so with stages
+        running in parallel it is shared by whichever got there first.
+        The first stage to raise aborts the run: running async stages are
+        cancelled and the error is raised without waiting for CPU stages.
+        """
+        skip = set(skip)
+        pending = {stage.name: stage for stage in self.stages}
+        running: Dict[Future, Stage] = {}
+        timings: Dict[str, Dict[str, Any]] = {}
+
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage")
+        try:
+            while pending or running:
+                # Launch everything whose inputs are ready; skipping a stage may unblock others
+                launched = True
+                while launched:
+                    launched = False
+                    for name, stage in list(pending.items()):
+                        if not all(key in context for key in stage.inputs):
+                            continue
+                        del pending[name]
+                        launched = True
+
+                        if stage.skippable and name in skip:
+                            context.update(zip(stage.outputs, stage.defaults))
+                            timings[name] = {"skipped": True}
+                            self._notify(on_stage_done, name, timings)
+                            continue
+
+                        args = [context[key] for key in stage.inputs]
+                        if stage.is_async:
+                            future = asyncio.run_coroutine_threadsafe(_timed_async(stage.func, args), get_event_loop())
+                        else:
+                            future = pool.submit(_timed, stage.func, args)
+                        running[future] = stage
+
+                if not running:
+                    if pending:
+                        raise RuntimeError(f"Pipeline stages with unmet inputs: {', '.join(pending)}")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    value, elapsed, rss_delta = future.result()
+                    self._bind(stage, value, context)
+                    timings[stage.name] = _stage_timing(stage, context, elapsed, rss_delta)
+                    self._notify(on_stage_done, stage.name, timings)
+        except BaseException:
+            # Stop the rest of the run: async stages (e.g. Gemini calls) are
+            # cancelled on the loop; CPU stages already running can't be
+            # interrupted, so they finish in the background instead of delaying the error
+            for future in running:
+                future.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+        # Report in declaration order
+        return {stage.name: timings[stage.name] for stage in self.stages if stage.name in timings}
+
+    def _notify(self, on_stage_done: Optional[Callable[[str, int, int], None]], name: str, timings: Dict[str, Any]) -> None:
+        if on_stage_done is not None:
+            on_stage_done(name, len(timings), len(self.stages))
+
+    @staticmethod
+    def _bind(stage: Stage, value: Any, context: Dict[str, Any]) -> None:
+        if len(stage.outputs) == 1:
+            context[stage.outputs[0]] = value
+        elif stage.outputs:
+            for output, item in zip(stage.outputs, value):
+                context[output] = item
+
+
+def _stage_timing(stage: Stage, context: Dict[str, Any], elapsed: float, rss_delta: Optional[int]) -> Dict[str, Any]:
+    timing = {
+        "wall_ms": round(elapsed * 1000, 2),
+        "peak_rss_delta_bytes": rss_delta
+    }
+    if stage.rows is not None:
+        rows = int(stage.rows(context))
+        timing["rows"] = rows
+        timing["rows_per_sec"] = round(rows / elapsed, 1) if elapsed > 0 else None
+    return timing
+
+
+def _rss_delta(before: Optional[int]) -> Optional[int]:
+    after = peak_rss_bytes()
+    return after - before if before is not None and after is not None else None
+
+
+def _timed(func: Callable, args: List[Any]) -> Tuple[Any, float, Optional[int]]:
+    rss_before = peak_rss_bytes()
+    started = time.perf_counter()
+    value = func(*args)
+    return value, time.perf_counter() - started, _rss_delta(rss_before)
+
+
+async def _timed_async(func: Callable, args: List[Any]) -> Tuple[Any, float, Optional[int]]:
+    rss_before = peak_rss_bytes()
+    started = time.perf_counter()
+    value = await func(*args)
+    return value, time.perf_counter() - started, _rss_delta(rss_before)
@@ -1,10 +1,23 @@
+import logging
 import os
-import json
+import time
 from datetime import datetime
-from app.utils.file_parser import parse_file, get_dataframe_info, get_data_preview
+from typing import Optional
+from app.utils.file_parser import parse_file, auto_parse_dates, get_dataframe_info, get_data_preview
 from app.utils.data_cleaner import clean_dataframe
+from app.utils.dtype_optimizer import optimize_dtypes
+from app.utils.file_sniffer import sniff_dialect
+from app.utils.column_profile import ColumnProfile
+from app.utils.row_fingerprint import duplicate_key_columns, duplicate_mask
+from app.services.job_store import update_job
+from app.services.progress import publish
+from app.utils.artifact_store import CLEANED_DATA_FILE, write_cleaned_data
+from app.utils.results_store import RESULTS_FILE, write_results
+from app.services.cache_service import make_cache_key, load_cached_results, store_results
+from app.services.streaming_service import should_process_in_chunks, process_in_chunks
 from app.services.chart_service import generate_charts
 from app.services.llm_service import generate_insights
+from app.services.pipeline import Pipeline, Stage
 from app.services.analytics_service import (
     generate_correlation_matrix,
     detect_outliers,
@@ -13,109 +26,153 @@ from app.services.analytics_service import (
 )
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+# Bump whenever results.json or the processed artifacts change shape,
+# so cached results from older pipelines are not reused
+PIPELINE_VERSION = "14"
+
+# Progress reported once every pipeline stage has finished; the rest is writing results
+PIPELINE_PROGRESS = 95
+
 
 def process_file(job_id: str) -> dict:
     """
     Process uploaded file
+
+    Runs inside a worker process (see job_service); the job's status in the
+    job store moves pending -> processing -> completed/failed, and every
+    finished stage is published as a progress event.
     """
+    metadata = None
     try:
-        # Load metadata
-        job_dir = os.path.join(settings.UPLOAD_DIR, job_id)
-        metadata_path = os.path.join(job_dir, "metadata.json")
-
-        with open(metadata_path, 'r') as f:
-            metadata = json.load(f)
-
+        # Mark as processing and load metadata in one transaction
+        metadata = update_job(job_id, {"status": "processing"}, remove=("error",))
         file_path = metadata["file_path"]
+        publish(job_id, "processing", "started", 0)
 
-        # Update status
-        metadata["status"] = "processing"
-        metadata["updated_at"] = datetime.now().isoformat()
-
-        # Step 1: Parse file
-        df = parse_file(file_path)
-        original_info = get_dataframe_info(df)
-        data_preview = get_data_preview(df, rows=10)
-
-        # Step 2: Detect anomalies BEFORE cleaning (important!)
-        anomalies_original = detect_anomalies(df)
-
-        # Step 3: Clean data
-        df_cleaned, cleaning_report = clean_dataframe(df)
-        cleaned_info = get_dataframe_info(df_cleaned)
-
-        # Step 4: Generate basic statistics
-        statistics = generate_statistics(df_cleaned)
-
-        # Step 5: Advanced analytics on cleaned data
-        correlation_matrix = generate_correlation_matrix(df_cleaned)
-        outliers = detect_outliers(df_cleaned)
-        trends = generate_trends(df_cleaned)
+        processed_dir = os.path.join(settings.PROCESSED_DIR, job_id)
 
-        # Step 6: Generate charts
-        charts = generate_charts(df_cleaned, metadata.get("prompt", ""))
+        # bypass_llm_cache asks for fresh Gemini responses, so cached results are skipped too
+        use_llm_cache = not metadata.get("bypass_llm_cache", False)
 
-        # Step 7: Generate AI insights
-        insights = generate_insights(cleaned_info, statistics, cleaning_report)
+        # Step 0: Serve identical uploads from the result cache
+        cache_key = None
+        if metadata.get("file_hash"):
+            cache_key = make_cache_key(
+                metadata["file_hash"],
+                metadata.get("prompt", ""),
+                PIPELINE_VERSION,
+                metadata.get("skip_stages", [])
+            )
+            cached_results = load_cached_results(cache_key, job_id, processed_dir) if use_llm_cache else None
+            if cached_results is not None:
+                update_job(job_id, {
+                    "status": "completed",
+                    "results_path": os.path.join(processed_dir, RESULTS_FILE),
+                    "cache_hit": True
+                })
+                publish(job_id, "completed", "completed", 100)
+                return cached_results
 
-        # Save processed data
-        processed_dir = os.path.join(settings.PROCESSED_DIR, job_id)
         os.makedirs(processed_dir, exist_ok=True)
+        cleaned_data_path = os.path.join(processed_dir, CLEANED_DATA_FILE)
+
+        # Sniff CSV/TXT dialect once so the file is parsed exactly once
+        dialect = None
+        if os.path.splitext(file_path)[1].lower() in ['.csv', '.txt']:
+            dialect = sniff_dialect(file_path)
+            update_job(job_id, {"dialect": dialect})
 
-        # Save cleaned CSV
-        cleaned_csv_path = os.path.join(processed_dir, "cleaned_data.csv")
-        df_cleaned.to_csv(cleaned_csv_path, index=False)
+        # Steps 1-7 as a DAG: independent stages run in parallel
+        processing_mode = "chunked" if should_process_in_chunks(file_path) else "in_memory"
+        pipeline = CHUNKED_PIPELINE if processing_mode == "chunked" else IN_MEMORY_PIPELINE
+        skip_stages = metadata.get("skip_stages", [])
+        context = {
+            "file_path": file_path,
+            "dialect": dialect,
+            "cleaned_data_path": cleaned_data_path,
+            "prompt": metadata.get("prompt", ""),
+            "use_llm_cache": use_llm_cache,
+            "llm_stats": {}
+        }
+        started = time.perf_counter()
+        stage_timings = pipeline.run(
+            context,
+            skip=skip_stages,
+            max_workers=settings.PIPELINE_THREADS,
+            on_stage_done=lambda stage, finished, total: publish(
+                job_id, "processing", stage, PIPELINE_PROGRESS * finished // total
+            )
+        )
+        total_ms = round((time.perf_counter() - started) * 1000, 2)
 
         # Save processing results
         results = {
             "job_id": job_id,
             "status": "completed",
-            "original_data_info": original_info,
-            "cleaned_data_info": cleaned_info,
-            "data_preview": data_preview,
-            "cleaning_report": cleaning_report,
-            "statistics": statistics,
+            "processing_mode": processing_mode,
+            "datetime_formats": context["datetime_formats"],
+            "original_data_info": context["original_info"],
+            "cleaned_data_info": context["cleaned_info"],
+            "data_preview": context["data_preview"],
+            "cleaning_report": context["cleaning_report"],
+            "statistics": context["statistics"],
             "advanced_analytics": {
-                "correlation_matrix": correlation_matrix,
-                "outliers": outliers,
-                "anomalies": anomalies_original,  # From original data
-                "trends": trends
+                "correlation_matrix": context["correlation_matrix"],
+                "outliers": context["outliers"],
+                "anomalies": context["anomalies"],  # From original data
+                "trends": context["trends"]
+            },
+            "charts": context["charts"],
+            "insights": context["insights"],
+            "llm": context["llm_stats"],
+            "skipped_stages": sorted(skip_stages),
+            "timings": {
+                "total_ms": total_ms,
+                "stages": stage_timings
             },
-            "charts": charts,
-            "insights": insights,
             "processed_at": datetime.now().isoformat()
         }
 
-        results_path = os.path.join(processed_dir, "results.json")
-        with open(results_path, 'w') as f:
-            json.dump(results, f, indent=2)
+        persist_started = time.perf_counter()
+        results_path = write_results(processed_dir, results)
 
-        # Update metadata
-        metadata["status"] = "completed"
-        metadata["updated_at"] = datetime.now().isoformat()
-        metadata["results_path"] = results_path
+        if cache_key:
+            try:
+                store_results(cache_key, processed_dir)
+            except OSError as e:
+                logger.warning("Result cache store error: %s", e)
+
+        # Written after results.json, so only reported in the job summary and /metrics
+        results["timings"]["stages"]["persist_results"] = {
+            "wall_ms": round((time.perf_counter() - persist_started) * 1000, 2)
+        }
 
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        # Update metadata
+        update_job(job_id, {"status": "completed", "results_path": results_path})
+        publish(job_id, "completed", "completed", 100)
 
         return results
 
     except Exception as e:
         # Update metadata with error
         try:
-            metadata["status"] = "failed"
-            metadata["error"] = str(e)
-            metadata["updated_at"] = datetime.now().isoformat()
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            if metadata is not None:
+                update_job(job_id, {"status": "failed", "error": str(e)})
+                publish(job_id, "failed", "failed", 0, error=str(e))
         except:
             pass
 
         raise Exception(f"Processing failed: {str(e)}")
 
 
-def generate_statistics(df):
+def generate_statistics(df, profile: Optional[ColumnProfile] = None):
     """Generate basic statistics from DataFrame"""
+    if profile is None:
+        profile = ColumnProfile(df)
+
     stats = {
         "summary": {},
         "numeric_stats": {},
@@ -124,33 +181,155 @@ def generate_statistics(df):
 
     # Overall summary
     stats["summary"] = {
-        "total_rows": len(df),
-        "total_columns": len(df.columns),
-        "numeric_columns": len(df.select_dtypes(include=['number']).columns),
-        "categorical_columns": len(df.select_dtypes(include=['object']).columns),
-        "datetime_columns": len(df.select_dtypes(include=['datetime64']).columns)
+        "total_rows": profile.row_count,
+        "total_columns": len(profile.columns),
+        "numeric_columns": len(profile.numeric_columns),
+        "categorical_columns": len(profile.categorical_columns),
+        "datetime_columns": len(profile.datetime_columns)
     }
 
     # Numeric columns statistics
-    numeric_cols = df.select_dtypes(include=['number']).columns
-    for col in numeric_cols:
-        stats["numeric_stats"][col] = {
-            "mean": float(df[col].mean()),
-            "median": float(df[col].median()),
-            "std": float(df[col].std()),
-            "min": float(df[col].min()),
-            "max": float(df[col].max()),
-            "q25": float(df[col].quantile(0.25)),
-            "q75": float(df[col].quantile(0.75))
-        }
+    for col in profile.numeric_columns:
+        stats["numeric_stats"][col] = profile.numeric_stats(col)
 
     # Categorical columns statistics
-    categorical_cols = df.select_dtypes(include=['object']).columns
-    for col in categorical_cols:
-        value_counts = df[col].value_counts().head(10).to_dict()
+    for col in profile.categorical_columns:
+        value_counts = profile.value_counts(col).head(10).to_dict()
         stats["categorical_stats"][col] = {
-            "unique_values": int(df[col].nunique()),
+            "unique_values": profile.nunique(col),
             "most_common": value_counts
         }
 
-    return stats
\ No newline at end of file
+    return stats
+
+
+# ==================== PIPELINE STAGES ====================
+
+def _parse(file_path: str, dialect):
+    return parse_file(file_path, dialect, parse_dates=False)
+
+
+def _infer_dates(df):
+    df = auto_parse_dates(df)
+    return df, df.attrs["datetime_formats"]
+
+
+def _clean(df, duplicates, dtype_report):
+    """clean_dataframe, with the dtype optimization reported as its first operation"""
+    df_cleaned, cleaning_report = clean_dataframe(df, duplicates)
+    if dtype_report["conversions"]:
+        before = dtype_report["memory_before_bytes"] / 1024
+        after = dtype_report["memory_after_bytes"] / 1024
+        cleaning_report["operations"].insert(0, {
+            "step": "dtypes_optimized",
+            "detail": f"Memory {before:.2f} KB -> {after:.2f} KB ({len(dtype_report['conversions'])} columns converted)",
+            **dtype_report
+        })
+    return df_cleaned, cleaning_report
+
+
+def _preview(df):
+    return get_data_preview(df, rows=10)
+
+
+def _duplicates(df):
+    return duplicate_mask(df, duplicate_key_columns(df.columns))
+
+
+def _chunked_analysis(file_path: str, cleaned_data_path: str, dialect):
+    """Steps 1-5 out-of-core; the cleaned data is written chunk by chunk"""
+    return process_in_chunks(file_path, cleaned_data_path, dialect)
+
+
+def _chunked_correlation(chunked, df_sample):
+    """Pearson comes exact from the chunked pass; rank correlations use the row sample"""
+    if settings.CORRELATION_METHOD == "pearson":
+        return chunked["correlation_matrix"]
+    report = generate_correlation_matrix(df_sample)
+    if report is not None and len(df_sample) < chunked["cleaned_data_info"]["rows"]:
+        report["sampled_rows"] = len(df_sample)
+    return report
+
+
+async def _charts(df, prompt, profile, use_cache, llm_stats, cleaned_info):
+    """Charts from df, which in chunked mode is a sample of the cleaned_info["rows"] rows"""
+    return await generate_charts(df, prompt, profile, use_cache, llm_stats, total_rows=cleaned_info["rows"])
+
+
+def _rows(key: str):
+    """Row count of a frame in the pipeline context (for throughput metrics)"""
+    return lambda context: len(context[key])
+
+
+def _section(key: str):
+    """Stage function picking one section out of the chunked results"""
+    return lambda chunked: chunked[key]
+
+
+# Skipped analytics stages bind empty reports of the usual shape, so readers of
+# results.json need no special case (a skipped correlation is None, as for a
+# frame with fewer than two numeric columns)
+SKIPPED_ANOMALIES = {"duplicate_rows": 0, "columns_with_single_value": [], "columns_with_high_null_rate": []}
+SKIPPED_STATISTICS = {"summary": {}, "numeric_stats": {}, "categorical_stats": {}}
+
+# Steps 6-7 run on the event loop, so both Gemini calls are in flight at once
+_LLM_STAGES = [
+    Stage("charts", _charts,
+          ["df_cleaned", "prompt", "cleaned_profile", "use_llm_cache", "llm_stats", "cleaned_info"], ["charts"],
+          skippable=True, defaults=[[]], rows=_rows("df_cleaned")),
+    Stage("insights", generate_insights,
+          ["cleaned_info", "statistics", "cleaning_report", "use_llm_cache", "llm_stats"], ["insights"],
+          skippable=True, defaults=[""])
+]
+
+IN_MEMORY_PIPELINE = Pipeline([
+    Stage("parse", _parse, ["file_path", "dialect"], ["df_raw"], rows=_rows("df_raw")),
+    Stage("date_inference", _infer_dates, ["df_raw"], ["df_parsed", "datetime_formats"], rows=_rows("df_parsed")),
+    # Category / Arrow string / downcast int dtypes for every later stage
+    Stage("optimize_dtypes", optimize_dtypes, ["df_parsed"], ["df", "dtype_report"], rows=_rows("df")),
+    Stage("profile", ColumnProfile, ["df"], ["profile"], rows=_rows("df")),
+    Stage("original_info", get_dataframe_info, ["df", "profile"], ["original_info"], rows=_rows("df")),
+    Stage("preview", _preview, ["df"], ["data_preview"]),
+    # Row fingerprints are hashed once for the anomaly report and de-duplication
+    Stage("duplicates", _duplicates, ["df"], ["duplicate_mask"], rows=_rows("df")),
+    # Anomalies are detected BEFORE cleaning (important!)
+    Stage("anomalies", detect_anomalies, ["df", "profile", "duplicate_mask"], ["anomalies"],
+          skippable=True, defaults=[SKIPPED_ANOMALIES], rows=_rows("df")),
+    Stage("clean", _clean, ["df", "duplicate_mask", "dtype_report"], ["df_cleaned", "cleaning_report"], rows=_rows("df")),
+    Stage("cleaned_profile", ColumnProfile, ["df_cleaned"], ["cleaned_profile"], rows=_rows("df_cleaned")),
+    Stage("cleaned_info", get_dataframe_info, ["df_cleaned", "cleaned_profile"], ["cleaned_info"], rows=_rows("df_cleaned")),
+    Stage("statistics", generate_statistics, ["df_cleaned", "cleaned_profile"], ["statistics"],
+          skippable=True, defaults=[SKIPPED_STATISTICS], rows=_rows("df_cleaned")),
+    Stage("correlation", generate_correlation_matrix, ["df_cleaned"], ["correlation_matrix"],
+          skippable=True, rows=_rows("df_cleaned")),
+    Stage("outliers", detect_outliers, ["df_cleaned", "cleaned_profile"], ["outliers"],
+          skippable=True, defaults=[{}], rows=_rows("df_cleaned")),
+    Stage("trends", generate_trends, ["df_cleaned"], ["trends"],
+          skippable=True, defaults=[{}], rows=_rows("df_cleaned")),
+    # Parquet; CSV is generated on export
+    Stage("save_cleaned_data", write_cleaned_data, ["df_cleaned", "cleaned_data_path"], [], rows=_rows("df_cleaned")),
+    *_LLM_STAGES
+])
+
+# Analytics come out of one out-of-core pass; the section stages keep stage
+# names (and skipping) the same as in memory
+CHUNKED_PIPELINE = Pipeline([
+    Stage("chunked_analysis", _chunked_analysis, ["file_path", "cleaned_data_path", "dialect"], ["chunked"],
+          rows=lambda context: context["chunked"]["original_data_info"]["rows"]),
+    Stage("datetime_formats", _section("datetime_formats"), ["chunked"], ["datetime_formats"]),
+    Stage("original_info", _section("original_data_info"), ["chunked"], ["original_info"]),
+    Stage("preview", _section("data_preview"), ["chunked"], ["data_preview"]),
+    Stage("anomalies", _section("anomalies"), ["chunked"], ["anomalies"], skippable=True, defaults=[SKIPPED_ANOMALIES]),
+    Stage("clean", _section("cleaning_report"), ["chunked"], ["cleaning_report"]),
+    Stage("cleaned_info", _section("cleaned_data_info"), ["chunked"], ["cleaned_info"]),
+    Stage("statistics", _section("statistics"), ["chunked"], ["statistics"], skippable=True, defaults=[SKIPPED_STATISTICS]),
+    Stage("correlation", _chunked_correlation, ["chunked", "df_cleaned"], ["correlation_matrix"], skippable=True),
+    Stage("outliers", _section("outliers"), ["chunked"], ["outliers"], skippable=True, defaults=[{}]),
+    Stage("trends", _section("trends"), ["chunked"], ["trends"], skippable=True, defaults=[{}]),
+    # Charts are built from a uniform row sample of the cleaned data
+    Stage("chart_sample", _section("chart_sample"), ["chunked"], ["df_cleaned"]),
+    Stage("cleaned_profile", ColumnProfile, ["df_cleaned"], ["cleaned_profile"], rows=_rows("df_cleaned")),
+    *_LLM_STAGES
+])
+
+SKIPPABLE_STAGES = sorted(set(IN_MEMORY_PIPELINE.skippable_stages) | set(CHUNKED_PIPELINE.skippable_stages))
\ No newline at end of file
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Job progress events: {"job_id", "status", "stage", "progress", "updated_at"}
+# (plus "error" when failed). Worker processes put them on a multiprocessing
+# queue (set by job_service's pool initializer); a broker thread in the API
+# process keeps the latest event of every running job and hands each event to
+# the asyncio queues of the /status/{job_id}/stream clients, so waiting
+# clients cost no I/O. Without a worker queue (process_file called in the API
+# process) events are dispatched directly.
+TERMINAL_STATUSES = ("completed", "failed")
+
+# Worker side
+_worker_queue = None
+
+# API process side
+_latest: Dict[str, dict] = {}
+_subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+_lock = threading.Lock()
+
+
+def set_worker_queue(queue) -> None:
+    """Publish this process's events to `queue` (called in each worker process)"""
+    global _worker_queue
+    _worker_queue = queue
+
+
+def publish(job_id: str, status: str, stage: str, progress: int, error: Optional[str] = None) -> None:
+    """Report a job's status, the stage it reached and its progress (0-100)"""
+    event = {
+        "job_id": job_id,
+        "status": status,
+        "stage": stage,
+        "progress": progress,
+        "updated_at": datetime.now().isoformat()
+    }
+    if error is not None:
+        event["error"] = error
+
+    if _worker_queue is not None:
+        try:
+            # Non-blocking: a feeder thread writes to the pipe
+            _worker_queue.put(event)
+        except Exception as e:
+            logger.warning("Could not publish progress for job %s: %s", job_id, e)
+    else:
+        dispatch(event)
+
+
+def dispatch(event: dict) -> None:
+    """Record an event and wake up every stream subscribed to its job"""
+    job_id = event["job_id"]
+    with _lock:
+        if event["status"] in TERMINAL_STATUSES:
+            # Finished jobs are answered from the job store
+            _latest.pop(job_id, None)
+        else:
+            _latest[job_id] = event
+        subscribers = list(_subscribers.get(job_id, ()))
+
+    for loop, queue in subscribers:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+        except RuntimeError:
+            # The subscriber's event loop is closed
+            pass
+
+
+def start_broker(queue) -> None:
+    """Dispatch events from the worker queue on a background thread (until None is put on it)"""
+    def run():
+        while True:
+            try:
+                event = queue.get()
+            except (EOFError, OSError):
+                return
+            if event is None:
+                return
+            dispatch(event)
+
+    threading.Thread(target=run, name="progress-broker", daemon=True).start()
+
+
+def subscribe(job_id: str) -> asyncio.Queue:
+    """Queue receiving the job's events on the calling event loop"""
+    queue = asyncio.Queue()
+    with _lock:
+        _subscribers.setdefault(job_id, set()).add((asyncio.get_running_loop(), queue))
+    return queue
+
+
+def unsubscribe(job_id: str, queue: asyncio.Queue) -> None:
+    with _lock:
+        subscribers = _subscribers.get(job_id)
+        if subscribers is None:
+            return
+        subscribers.difference_update({entry for entry in subscribers if entry[1] is queue})
+        if not subscribers:
+            del _subscribers[job_id]
+
+
+def current_progress(job_id: str, status: str) -> Dict[str, Any]:
+    """Stage and progress of a job whose stored status is `status`"""
+    if status == "pending":
+        return {"stage": "queued", "progress": 0}
+    if status == "completed":
+        return {"stage": "completed", "progress": 100}
+    if status == "failed":
+        return {"stage": "failed", "progress": 0}
+
+    with _lock:
+        latest = _latest.get(job_id)
+    if latest is not None and latest["status"] == status:
+        return {"stage": latest["stage"], "progress": latest["progress"]}
+    # Processing, but no event seen yet (or the API process restarted)
+    return {"stage": "started", "progress": 0}
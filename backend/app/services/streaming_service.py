@@ -0,0 +1,605 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Iterator
+from app.utils.file_parser import infer_datetime_formats, get_data_preview
+from app.utils.file_sniffer import dialect_read_options
+from app.utils.artifact_store import CleanedDataWriter
+from app.utils.sketches import RunningMoments, KLLSketch
+from app.utils.row_fingerprint import duplicate_key_columns, row_fingerprints
+from app.services.analytics_service import build_correlation_report, outlier_bounds, summarize_trend
+from app.config import settings
+
+CHUNKABLE_EXTENSIONS = ('.csv', '.txt')
+
+# dtype passed to read_csv for each inferred column kind (bool is left to pandas)
+_READ_DTYPES = {"int": "int64", "float": "float64", "object": "object"}
+
+# Marker for columns with more than one distinct value
+_MULTIPLE = object()
+
+
+def should_process_in_chunks(file_path: str) -> bool:
+    """Large CSV/TXT files are processed out-of-core instead of loaded whole"""
+    file_ext = os.path.splitext(file_path)[1].lower()
+    return (
+        file_ext in CHUNKABLE_EXTENSIONS
+        and os.path.getsize(file_path) > settings.CHUNKED_PROCESSING_THRESHOLD
+    )
+
+
+def process_in_chunks(file_path: str, cleaned_data_path: str, dialect: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Out-of-core equivalent of parse -> detect_anomalies -> clean -> analytics
+
+    Reads the file with the sniffed `dialect` in CHUNK_SIZE_ROWS chunks, three times:
+    1. infer one dtype per column for the whole file
+    2. fingerprint rows for de-duplication and collect mergeable aggregates
+       (null counts, moments, quantile sketches, value counts)
+    3. clean each chunk, append it to the cleaned_data_path Parquet file and collect the
+       correlation, outlier and trend aggregates
+
+    Peak memory is bounded by the chunk size plus fixed-size sketches and
+    8 bytes per distinct row for the duplicate fingerprints. Quantiles are
+    exact up to CHUNKED_QUANTILE_SKETCH_K values per column and come from a
+    KLL sketch beyond that. Columns keep the int64/float64/object dtypes they
+    are read with: dtype optimization only runs in the in-memory pipeline.
+
+    Returns the same sections process_file builds in memory, plus
+    "chart_sample": a uniform row sample of the cleaned data for charts.
+    """
+    read_options = dialect_read_options(dialect)
+    schema = _infer_schema(file_path, read_options)
+    aggregates = _aggregate_raw(file_path, read_options, schema)
+    plan = _plan_cleaning(schema, aggregates)
+    return _clean_and_analyze(file_path, read_options, schema, aggregates, plan, cleaned_data_path)
+
+
+# ==================== READING ====================
+
+def _read_chunks(file_path: str, read_options: Dict[str, Any], schema: Dict[str, Any] = None) -> Iterator[pd.DataFrame]:
+    """Yield chunks; with a schema every chunk gets the same dtypes"""
+    dtype = None
+    if schema is not None:
+        dtype = {col: _READ_DTYPES[kind] for col, kind in schema["read_kinds"].items() if kind in _READ_DTYPES}
+
+    reader = pd.read_csv(file_path, chunksize=settings.CHUNK_SIZE_ROWS, dtype=dtype, **read_options)
+    for chunk in reader:
+        if schema is not None:
+            for col, fmt in schema["datetime_formats"].items():
+                chunk[col] = pd.to_datetime(chunk[col], format=fmt, errors='coerce')
+        yield chunk
+
+
+def _infer_schema(file_path: str, read_options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pass 1: one dtype kind per column that holds for the whole file
+
+    Mirrors what a single pd.read_csv would infer: int + float -> float,
+    any other disagreement between chunks -> object.
+    """
+    try:
+        return _infer_schema_with(file_path, read_options)
+    except UnicodeDecodeError:
+        # Non-UTF-8 bytes after the sniffed sample
+        read_options["encoding"] = "latin-1"
+        return _infer_schema_with(file_path, read_options)
+
+
+def _infer_schema_with(file_path: str, read_options: Dict[str, Any]) -> Dict[str, Any]:
+    columns = None
+    datetime_formats = {}
+    read_kinds = {}
+    total_rows = 0
+
+    for chunk in _read_chunks(file_path, read_options):
+        if columns is None:
+            columns = chunk.columns.tolist()
+            # Formats inferred once from the first chunk apply to every chunk
+            datetime_formats = infer_datetime_formats(chunk)
+
+        total_rows += len(chunk)
+        for col in columns:
+            kind = _dtype_kind(chunk[col])
+            previous = read_kinds.get(col)
+            if previous is None or previous == kind:
+                read_kinds[col] = kind
+            elif {previous, kind} == {"int", "float"}:
+                read_kinds[col] = "float"
+            else:
+                read_kinds[col] = "object"
+
+    if not columns or total_rows == 0:
+        raise ValueError("File is empty or couldn't be parsed")
+
+    # Kind after parsing: date columns are converted once read
+    kinds = {col: "datetime" if col in datetime_formats else kind for col, kind in read_kinds.items()}
+
+    return {
+        "columns": columns,
+        "read_kinds": read_kinds,
+        "kinds": kinds,
+        "datetime_formats": datetime_formats,
+        "total_rows": total_rows
+    }
+
+
+def _dtype_kind(series: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(series):
+        return "bool"
+    if pd.api.types.is_integer_dtype(series):
+        return "int"
+    if pd.api.types.is_float_dtype(series):
+        return "float"
+    return "object"
+
+
+# ==================== AGGREGATION ====================
+
+class _SeenRows:
+    """
+    Fingerprints of rows already seen, for first-occurrence de-duplication
+
+    Kept as sorted, disjoint runs whose sizes drop by at least a power of two
+    along the list: a chunk's new fingerprints are appended as a run, merged
+    into the previous run while they reach its power of two. A lookup searches
+    at most log2(n) runs and each fingerprint is merged O(log n) times, instead
+    of rewriting everything seen so far for every chunk.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def first_occurrences(self, hashes: np.ndarray) -> np.ndarray:
+        """Boolean mask of rows not seen before (in earlier chunks or earlier in this one)"""
+        # Sorted distinct fingerprints of the chunk and their first rows;
+        # sorted lookups walk each run in order
+        new, first = np.unique(hashes, return_index=True)
+        unseen = np.ones(len(new), dtype=bool)
+        for run in self._runs:
+            positions = np.minimum(np.searchsorted(run, new), len(run) - 1)
+            unseen &= run[positions] != new
+        new, first = new[unseen], first[unseen]
+
+        keep = np.zeros(len(hashes), dtype=bool)
+        keep[first] = True
+        if len(new):
+            self._runs.append(new)
+            while len(self._runs) > 1 and len(self._runs[-1]).bit_length() >= len(self._runs[-2]).bit_length():
+                # Disjoint sorted runs: timsort merges them in linear time
+                merged = np.concatenate([self._runs[-2], self._runs.pop()])
+                self._runs[-1] = np.sort(merged, kind='stable')
+        return keep
+
+
+def _aggregate_raw(file_path: str, read_options: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pass 2: raw-data anomalies plus aggregates over de-duplicated rows
+    """
+    columns = schema["columns"]
+    numeric_cols = [col for col in columns if schema["kinds"][col] in ("int", "float")]
+    object_cols = [col for col in columns if schema["kinds"][col] == "object"]
+
+    raw_nulls = pd.Series(0, index=columns, dtype="int64")
+    unique_nulls = pd.Series(0, index=columns, dtype="int64")
+    single_value = {col: None for col in columns}  # first value seen, or _MULTIPLE
+    moments = {col: RunningMoments() for col in numeric_cols}
+    sketches = {
+        col: KLLSketch(settings.CHUNKED_QUANTILE_SKETCH_K, seed=i)
+        for i, col in enumerate(numeric_cols)
+    }
+    value_counts = {col: pd.Series(dtype="int64") for col in object_cols}
+    truncated_counts = set()
+
+    seen_rows = _SeenRows()
+    key_columns = duplicate_key_columns(columns)
+    keep_masks = []
+    preview = None
+    column_types = None
+    memory_bytes = 0
+
+    for chunk in _read_chunks(file_path, read_options, schema):
+        if preview is None:
+            preview = get_data_preview(chunk, rows=10)
+            column_types = chunk.dtypes.astype(str).to_dict()
+
+        memory_bytes += int(chunk.memory_usage(deep=True).sum())
+        raw_nulls += chunk.isnull().sum()
+
+        for col, nunique in chunk.nunique().items():
+            if nunique > 1:
+                single_value[col] = _MULTIPLE
+            elif nunique == 1 and single_value[col] is not _MULTIPLE:
+                value = chunk[col].dropna().iloc[0]
+                if single_value[col] is None:
+                    single_value[col] = value
+                elif single_value[col] != value:
+                    single_value[col] = _MULTIPLE
+
+        # Row fingerprints for duplicate detection across chunks
+        hashes = row_fingerprints(chunk, key_columns)
+        keep = seen_rows.first_occurrences(hashes)
+        keep_masks.append(np.packbits(keep))
+
+        unique = chunk[keep]
+        unique_nulls += unique.isnull().sum()
+
+        for col in numeric_cols:
+            values = unique[col].to_numpy(dtype=np.float64)
+            values = values[~np.isnan(values)]
+            moments[col].update(values)
+            sketches[col].update(values)
+
+        for col in object_cols:
+            counts = value_counts[col].add(unique[col].value_counts(), fill_value=0)
+            if len(counts) > settings.CHUNKED_MAX_DISTINCT_VALUES:
+                counts = counts.nlargest(settings.CHUNKED_MAX_DISTINCT_VALUES)
+                truncated_counts.add(col)
+            value_counts[col] = counts.astype("int64")
+
+    return {
+        "preview": preview,
+        "column_types": column_types,
+        "memory_bytes": memory_bytes,
+        "raw_nulls": raw_nulls,
+        "unique_nulls": unique_nulls,
+        "unique_rows": int(sum(np.unpackbits(mask).sum() for mask in keep_masks)),
+        "keep_masks": keep_masks,
+        "single_value": single_value,
+        "moments": moments,
+        "sketches": sketches,
+        "value_counts": value_counts,
+        "truncated_counts": truncated_counts
+    }
+
+
+# ==================== CLEANING PLAN ====================
+
+def _plan_cleaning(schema: Dict[str, Any], aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decide what clean_dataframe would do, from the pass 2 aggregates
+
+    Fill values follow clean_dataframe: median for numeric columns, mode
+    (or 'Unknown') for object columns. The cleaned numeric distribution is
+    the de-duplicated one plus one copy of the median per filled null.
+    """
+    columns = schema["columns"]
+    kinds = schema["kinds"]
+    n_rows = aggregates["unique_rows"]
+    unique_nulls = aggregates["unique_nulls"]
+
+    renamed = pd.Index(columns).str.strip().str.lower().str.replace(' ', '_')
+    rename_map = dict(zip(columns, renamed))
+
+    fill_values = {}
+    null_columns = []
+    numeric_stats = {}
+    mads = {}
+    categorical_counts = {}
+
+    for col in columns:
+        nulls = int(unique_nulls[col])
+        if kinds[col] in ("int", "float"):
+            moments = aggregates["moments"][col]
+            if moments.count == 0:
+                null_columns.append(col)
+                continue
+            sketch = aggregates["sketches"][col]
+            median = sketch.quantiles([0.5])[0]
+            if nulls:
+                fill_values[col] = median
+
+            cleaned = RunningMoments()
+            cleaned.merge(moments)
+            cleaned.add_constant(median, nulls)
+            q25, q50, q75 = sketch.quantiles([0.25, 0.5, 0.75], extra_value=median, extra_count=nulls)
+            if settings.OUTLIER_METHOD == "mad":
+                mads[col] = sketch.mad(q50, extra_count=nulls)
+            numeric_stats[col] = {
+                "mean": cleaned.mean,
+                "median": q50,
+                "std": cleaned.std,
+                "min": cleaned.min,
+                "max": cleaned.max,
+                "q25": q25,
+                "q75": q75
+            }
+
+        elif kinds[col] == "object":
+            counts = aggregates["value_counts"][col]
+            if len(counts) > 0:
+                top = counts[counts == counts.max()].index.tolist()
+                try:
+                    fill_value = sorted(top)[0]
+                except TypeError:
+                    fill_value = top[0]
+            else:
+                fill_value = 'Unknown'
+            if nulls:
+                fill_values[col] = fill_value
+                counts = counts.add(pd.Series({fill_value: nulls}), fill_value=0).astype("int64")
+            categorical_counts[col] = counts.sort_values(ascending=False, kind="stable")
+
+        elif nulls == n_rows:
+            # Datetime/bool columns aren't filled; entirely empty ones are dropped
+            null_columns.append(col)
+
+    missing_before = int(unique_nulls.sum())
+    missing_after = int(sum(unique_nulls[col] for col in columns if col not in fill_values))
+
+    return {
+        "rename_map": rename_map,
+        "fill_values": fill_values,
+        "null_columns": null_columns,
+        "numeric_stats": numeric_stats,
+        "mads": mads,
+        "categorical_counts": categorical_counts,
+        "missing_before": missing_before,
+        "missing_after": missing_after,
+        "kept_columns": [col for col in columns if col not in null_columns]
+    }
+
+
+# ==================== CLEAN, WRITE, ANALYZE ====================
+
+def _clean_and_analyze(
+        file_path: str,
+        read_options: Dict[str, Any],
+        schema: Dict[str, Any],
+        aggregates: Dict[str, Any],
+        plan: Dict[str, Any],
+        cleaned_data_path: str
+) -> Dict[str, Any]:
+    """
+    Pass 3: write cleaned chunks and collect correlation/outlier/trend aggregates
+    """
+    rename_map = plan["rename_map"]
+    kept_columns = plan["kept_columns"]
+    numeric_cols = [col for col in kept_columns if col in plan["numeric_stats"]]
+    n_rows = aggregates["unique_rows"]
+    half = n_rows // 2
+
+    # Outlier bounds from the cleaned statistics (quantiles from the sketches)
+    stats = {
+        key: np.array([plan["numeric_stats"][col][key] for col in numeric_cols], dtype=np.float64)
+        for key in ("q25", "q75", "mean", "std", "median")
+    }
+    if settings.OUTLIER_METHOD == "mad":
+        stats["mad"] = np.array([plan["mads"][col] for col in numeric_cols], dtype=np.float64)
+    lower, upper = outlier_bounds(stats)
+
+    # Centre on the known means so the cross-product sums stay well conditioned
+    means = np.array([plan["numeric_stats"][col]["mean"] for col in numeric_cols])
+    centred_sum = np.zeros(len(numeric_cols))
+    cross_products = np.zeros((len(numeric_cols), len(numeric_cols)))
+
+    outlier_counts = np.zeros(len(numeric_cols), dtype=np.int64)
+    outlier_values = {col: [] for col in numeric_cols}
+    half_sums = np.zeros((2, len(numeric_cols)))
+    half_counts = np.zeros(2, dtype=np.int64)
+
+    rng = np.random.default_rng(0)
+    sample_size = settings.CHUNKED_CHART_SAMPLE_ROWS
+    sample_rows = None
+    sample_keys = np.empty(0)
+
+    cleaned_types = None
+    memory_bytes = 0
+    row_offset = 0
+
+    with CleanedDataWriter(cleaned_data_path) as writer:
+        for chunk, packed_keep in zip(_read_chunks(file_path, read_options, schema), aggregates["keep_masks"]):
+            keep = np.unpackbits(packed_keep, count=len(chunk)).astype(bool)
+            cleaned = chunk.loc[keep, kept_columns].fillna(plan["fill_values"])
+            cleaned.columns = [rename_map[col] for col in kept_columns]
+            cleaned.index = pd.RangeIndex(row_offset, row_offset + len(cleaned))
+
+            writer.write(cleaned)
+            if cleaned_types is None:
+                cleaned_types = cleaned.dtypes.astype(str).to_dict()
+            memory_bytes += int(cleaned.memory_usage(deep=True).sum())
+
+            if numeric_cols:
+                block = chunk.loc[keep, numeric_cols].fillna(plan["fill_values"])
+                values = block.to_numpy(dtype=np.float64)
+
+                centred = values - means
+                centred_sum += centred.sum(axis=0)
+                cross_products += centred.T @ centred
+
+                mask = (values < lower) | (values > upper)
+                outlier_counts += mask.sum(axis=0)
+                for j, col in enumerate(numeric_cols):
+                    missing = 10 - len(outlier_values[col])
+                    if missing > 0 and outlier_counts[j]:
+                        outlier_values[col].extend(block[col].to_numpy()[mask[:, j]][:missing].tolist())
+
+                split = int(np.clip(half - row_offset, 0, len(values)))
+                half_sums[0] += values[:split].sum(axis=0)
+                half_sums[1] += values[split:].sum(axis=0)
+                half_counts += [split, len(values) - split]
+
+            # Uniform row sample for chart generation (bottom-k random keys)
+            keys = np.concatenate([sample_keys, rng.random(len(cleaned))])
+            candidates = cleaned if sample_rows is None else pd.concat([sample_rows, cleaned])
+            if len(candidates) > sample_size:
+                chosen = np.argpartition(keys, sample_size - 1)[:sample_size]
+                candidates, keys = candidates.iloc[chosen], keys[chosen]
+            sample_rows, sample_keys = candidates, keys
+
+            row_offset += len(cleaned)
+
+    renamed_numeric = [rename_map[col] for col in numeric_cols]
+    correlation_matrix = None
+    if len(numeric_cols) >= 2 and n_rows > 1:
+        covariance = (cross_products - np.outer(centred_sum, centred_sum) / n_rows) / (n_rows - 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(np.diag(covariance))
+            corr = covariance / np.outer(std, std)
+        corr = np.clip(corr, -1, 1)
+        correlation_matrix = build_correlation_report(
+            pd.DataFrame(corr, index=renamed_numeric, columns=renamed_numeric)
+        )
+
+    outliers = {}
+    for j, col in enumerate(numeric_cols):
+        if outlier_counts[j] > 0:
+            outliers[rename_map[col]] = {
+                "count": int(outlier_counts[j]),
+                "percentage": round(int(outlier_counts[j]) / n_rows * 100, 2),
+                "lower_bound": float(lower[j]),
+                "upper_bound": float(upper[j]),
+                "method": settings.OUTLIER_METHOD,
+                "outlier_values": outlier_values[col]
+            }
+
+    trends = {}
+    if n_rows > 2:
+        for j, col in enumerate(numeric_cols):
+            trend = summarize_trend(half_sums[0, j] / half_counts[0], half_sums[1, j] / half_counts[1])
+            if trend:
+                trends[rename_map[col]] = trend
+
+    sample_df = sample_rows.sort_index() if sample_rows is not None else pd.DataFrame()
+
+    return {
+        "original_data_info": _original_info(schema, aggregates),
+        "data_preview": {**aggregates["preview"], "total_rows": schema["total_rows"]},
+        "anomalies": _anomalies(schema, aggregates),
+        "cleaning_report": _cleaning_report(schema, aggregates, plan),
+        "cleaned_data_info": _cleaned_info(aggregates, plan, cleaned_types, memory_bytes),
+        "statistics": _statistics(schema, aggregates, plan),
+        "correlation_matrix": correlation_matrix,
+        "outliers": outliers,
+        "trends": trends,
+        "datetime_formats": schema["datetime_formats"],
+        "chart_sample": sample_df
+    }
+
+
+# ==================== REPORT SECTIONS ====================
+
+def _original_info(schema: Dict[str, Any], aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "rows": schema["total_rows"],
+        "columns": len(schema["columns"]),
+        "column_names": schema["columns"],
+        "column_types": aggregates["column_types"],
+        "missing_values": {col: int(v) for col, v in aggregates["raw_nulls"].items()},
+        "memory_usage": f"{aggregates['memory_bytes'] / 1024:.2f} KB"
+    }
+
+
+def _anomalies(schema: Dict[str, Any], aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    total_rows = schema["total_rows"]
+    anomalies = {
+        "duplicate_rows": total_rows - aggregates["unique_rows"],
+        "columns_with_single_value": [],
+        "columns_with_high_null_rate": []
+    }
+    key_columns = duplicate_key_columns(schema["columns"])
+    if key_columns:
+        anomalies["duplicate_key_columns"] = key_columns
+
+    for col in schema["columns"]:
+        value = aggregates["single_value"][col]
+        if value is not None and value is not _MULTIPLE:
+            anomalies["columns_with_single_value"].append(col)
+
+    for col in schema["columns"]:
+        null_rate = aggregates["raw_nulls"][col] / total_rows
+        if null_rate > 0.5:
+            anomalies["columns_with_high_null_rate"].append({
+                "column": col,
+                "null_percentage": round(float(null_rate) * 100, 2)
+            })
+
+    return anomalies
+
+
+def _cleaning_report(schema: Dict[str, Any], aggregates: Dict[str, Any], plan: Dict[str, Any]) -> Dict[str, Any]:
+    rename_map = plan["rename_map"]
+    report = {
+        "original_rows": schema["total_rows"],
+        "original_columns": len(schema["columns"]),
+        "operations": []
+    }
+
+    if any(old != new for old, new in rename_map.items()):
+        report["operations"].append({
+            "step": "column_names_cleaned",
+            "detail": "Removed spaces and special characters from column names"
+        })
+
+    duplicates = schema["total_rows"] - aggregates["unique_rows"]
+    if duplicates > 0:
+        report["operations"].append({
+            "step": "duplicates_removed",
+            "count": int(duplicates)
+        })
+
+    if plan["missing_before"] > 0:
+        report["operations"].append({
+            "step": "missing_values_handled",
+            "before": plan["missing_before"],
+            "after": plan["missing_after"]
+        })
+
+    if plan["null_columns"]:
+        report["operations"].append({
+            "step": "null_columns_removed",
+            "columns": [rename_map[col] for col in plan["null_columns"]]
+        })
+
+    report["cleaned_rows"] = aggregates["unique_rows"]
+    report["cleaned_columns"] = len(plan["kept_columns"])
+    report["rows_removed"] = report["original_rows"] - report["cleaned_rows"]
+    report["processing_mode"] = "chunked"
+    return report
+
+
+def _cleaned_info(aggregates: Dict[str, Any], plan: Dict[str, Any], cleaned_types: Dict[str, str], memory_bytes: int) -> Dict[str, Any]:
+    rename_map = plan["rename_map"]
+    kept_columns = plan["kept_columns"]
+    return {
+        "rows": aggregates["unique_rows"],
+        "columns": len(kept_columns),
+        "column_names": [rename_map[col] for col in kept_columns],
+        "column_types": cleaned_types or {},
+        "missing_values": {
+            rename_map[col]: 0 if col in plan["fill_values"] else int(aggregates["unique_nulls"][col])
+            for col in kept_columns
+        },
+        "memory_usage": f"{memory_bytes / 1024:.2f} KB"
+    }
+
+
+def _statistics(schema: Dict[str, Any], aggregates: Dict[str, Any], plan: Dict[str, Any]) -> Dict[str, Any]:
+    rename_map = plan["rename_map"]
+    kinds = schema["kinds"]
+    kept_columns = plan["kept_columns"]
+
+    stats = {
+        "summary": {
+            "total_rows": aggregates["unique_rows"],
+            "total_columns": len(kept_columns),
+            "numeric_columns": sum(kinds[col] in ("int", "float") for col in kept_columns),
+            "categorical_columns": sum(kinds[col] == "object" for col in kept_columns),
+            "datetime_columns": sum(kinds[col] == "datetime" for col in kept_columns)
+        },
+        "numeric_stats": {},
+        "categorical_stats": {}
+    }
+
+    for col, values in plan["numeric_stats"].items():
+        stats["numeric_stats"][rename_map[col]] = {key: float(v) for key, v in values.items()}
+
+    for col, counts in plan["categorical_counts"].items():
+        stats["categorical_stats"][rename_map[col]] = {
+            "unique_values": int(len(counts)),
+            "most_common": {key: int(v) for key, v in counts.head(10).items()}
+        }
+        if col in aggregates["truncated_counts"]:
+            stats["categorical_stats"][rename_map[col]]["unique_values_truncated"] = True
+
+    return stats
@@ -0,0 +1,134 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Iterator, List, Optional, Tuple
+from app.config import settings
+
+# Cleaned dataset of a job: typed, columnar and memory-mappable.
+# CSV is only produced on demand (see iter_csv).
+CLEANED_DATA_FILE = "cleaned_data.parquet"
+# Written by pipelines before the Parquet store; still served by exports
+LEGACY_CLEANED_CSV_FILE = "cleaned_data.csv"
+
+
+def _to_arrow_table(df: pd.DataFrame, schema: Optional[pa.Schema] = None) -> pa.Table:
+    """
+    Arrow table for a DataFrame (pandas dtypes are kept in the schema metadata)
+
+    Object columns mixing types (e.g. numbers and strings) are stored as strings.
+    """
+    try:
+        return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df = df.copy()
+        for col in df.select_dtypes(include=['object']).columns:
+            if pd.api.types.infer_dtype(df[col], skipna=True) not in ('string', 'empty'):
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def write_cleaned_data(df: pd.DataFrame, path: str) -> None:
+    """Write a cleaned DataFrame as Parquet"""
+    pq.write_table(
+        _to_arrow_table(df),
+        path,
+        row_group_size=settings.PARQUET_ROW_GROUP_SIZE,
+        compression=settings.PARQUET_COMPRESSION
+    )
+
+
+class CleanedDataWriter:
+    """
+    Append DataFrame chunks with identical columns to one Parquet file
+
+    The schema is fixed by the first chunk; columns that are entirely null
+    there are typed as strings (CSV text columns are the only ones that can be).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._schema: Optional[pa.Schema] = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self._writer is None:
+            table = _to_arrow_table(df)
+            fields = [
+                pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                for field in table.schema
+            ]
+            self._schema = pa.schema(fields, metadata=table.schema.metadata)
+            table = table.cast(self._schema)
+            self._writer = pq.ParquetWriter(
+                self.path,
+                self._schema,
+                compression=settings.PARQUET_COMPRESSION
+            )
+        else:
+            table = _to_arrow_table(df, schema=self._schema)
+        self._writer.write_table(table, row_group_size=settings.PARQUET_ROW_GROUP_SIZE)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self) -> "CleanedDataWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_cleaned_rows(
+        path: str,
+        offset: int,
+        limit: int,
+        columns: Optional[List[str]] = None
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Rows [offset, offset + limit) of a cleaned dataset, plus its total row count
+
+    Only the row groups overlapping the window (and the requested columns)
+    are read; the row count comes from the Parquet footer.
+    """
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    metadata = parquet_file.metadata
+
+    groups = []
+    window_start = None
+    group_start = 0
+    for i in range(metadata.num_row_groups):
+        group_rows = metadata.row_group(i).num_rows
+        if group_start + group_rows > offset and group_start < offset + limit:
+            if window_start is None:
+                window_start = group_start
+            groups.append(i)
+        group_start += group_rows
+
+    if not groups:
+        table = parquet_file.schema_arrow.empty_table()
+        if columns is not None:
+            table = table.select(columns)
+        return table.to_pandas(), metadata.num_rows
+
+    table = parquet_file.read_row_groups(groups, columns=columns)
+    return table.slice(offset - window_start, limit).to_pandas(), metadata.num_rows
+
+
+def cleaned_columns(path: str) -> List[str]:
+    """Column names of a cleaned dataset, from the Parquet schema"""
+    return pq.ParquetFile(path, memory_map=True).schema_arrow.names
+
+
+def iter_csv(path: str, batch_size: Optional[int] = None) -> Iterator[bytes]:
+    """Stream a Parquet dataset as CSV, one record batch at a time"""
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    header = True
+    for batch in parquet_file.iter_batches(batch_size=batch_size or settings.PARQUET_ROW_GROUP_SIZE):
+        df = batch.to_pandas()
+        yield df.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+
+    if header:
+        # No rows: header line only
+        yield pd.DataFrame(columns=parquet_file.schema_arrow.names).to_csv(index=False).encode('utf-8')
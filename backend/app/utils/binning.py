@@ -0,0 +1,56 @@
+import numpy as np
+from typing import Optional, Tuple
+
+
+def grid_density(x: np.ndarray, y: np.ndarray, bins: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rows per cell of a bins x bins grid over (x, y), non-finite pairs skipped
+
+    Returns the x and y centres and row count of every non-empty cell, so
+    the output size is bounded by the grid, not by the number of rows.
+    """
+    present = np.isfinite(x) & np.isfinite(y)
+    x, y = x[present], y[present]
+    if len(x) == 0:
+        return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+
+    # Cell index per row and one bincount (several times faster than histogram2d)
+    x_edges, x_cells = _bin_index(x, bins)
+    y_edges, y_cells = _bin_index(y, bins)
+    counts = np.bincount(x_cells * bins + y_cells, minlength=bins * bins)
+
+    cells = np.flatnonzero(counts)
+    x_centres = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centres = (y_edges[:-1] + y_edges[1:]) / 2
+    return x_centres[cells // bins], y_centres[cells % bins], counts[cells].astype(np.int64)
+
+
+def _bin_index(values: np.ndarray, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Equal-width edges over the values' range (widened by 0.5 if constant, like numpy) and each value's bin"""
+    low, high = values.min(), values.max()
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    edges = np.linspace(low, high, bins + 1)
+    index = ((values - low) * (bins / (high - low))).astype(np.int64)
+    return edges, np.clip(index, 0, bins - 1)
+
+
+def histogram(
+        values: np.ndarray,
+        bins: int,
+        value_range: Optional[Tuple[float, float]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Counts and bin edges of the finite values in one np.histogram pass
+
+    Passing the column's min/max as `value_range` (e.g. from its
+    ColumnProfile) saves the passes that find them; values outside the
+    range, and NaN, are not counted.
+    """
+    if value_range is None or not np.isfinite(value_range).all():
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        value_range = (values.min(), values.max())
+    counts, edges = np.histogram(values, bins=bins, range=value_range)
+    return counts.astype(np.int64), edges
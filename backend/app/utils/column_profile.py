@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List
+
+QUANTILES = [0.25, 0.5, 0.75]
+# Text columns: plain object, category and Arrow strings (see dtype_optimizer)
+CATEGORICAL_DTYPES = ['object', 'category', 'string']
+
+
+class ColumnProfile:
+    """
+    Per-column aggregates of a DataFrame, computed once and shared by
+    get_dataframe_info, detect_anomalies, generate_statistics,
+    detect_outliers and chart generation
+
+    Numeric aggregates come from one vectorized pass over the numeric block
+    (a single batched quantile call for all columns). Distinct and value
+    counts are computed lazily per column and cached.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self.row_count = len(df)
+        self.columns: List[str] = df.columns.tolist()
+        self.numeric_columns: List[str] = df.select_dtypes(include=['number']).columns.tolist()
+        self.categorical_columns: List[str] = df.select_dtypes(include=CATEGORICAL_DTYPES).columns.tolist()
+        self.datetime_columns: List[str] = df.select_dtypes(include=['datetime64']).columns.tolist()
+        self.null_counts: pd.Series = df.isnull().sum()
+        self.numeric_summary: pd.DataFrame = self._summarize_numeric(df)
+        self._value_counts: Dict[str, pd.Series] = {}
+        self._nunique: Dict[str, int] = {}
+
+    def _summarize_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
+        """One row per numeric column: count, mean, std, min, max, q25, median, q75"""
+        columns = ["count", "mean", "std", "min", "max", "q25", "median", "q75"]
+        if not self.numeric_columns or self.row_count == 0:
+            return pd.DataFrame(index=self.numeric_columns, columns=columns, dtype=np.float64)
+
+        block = df[self.numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        has_nulls = self.null_counts[self.numeric_columns].to_numpy() > 0
+
+        # Reductions only run on columns with values (std: two values), so all-
+        # null columns are NaN like in pandas without numpy's empty-slice
+        # warnings; errstate (thread-local, unlike a warnings filter) covers inf
+        counts = self.row_count - self.null_counts[self.numeric_columns].to_numpy()
+        summary = {"count": counts}
+        for key in ("mean", "std", "min", "max"):
+            summary[key] = np.full(block.shape[1], np.nan)
+        filled = counts > 0
+        spread = counts > 1
+        with np.errstate(invalid="ignore", over="ignore"):
+            if filled.any():
+                summary["mean"][filled] = np.nanmean(block[:, filled], axis=0)
+                summary["min"][filled] = np.nanmin(block[:, filled], axis=0)
+                summary["max"][filled] = np.nanmax(block[:, filled], axis=0)
+            if spread.any():
+                summary["std"][spread] = np.nanstd(block[:, spread], axis=0, ddof=1)
+
+            # One batched quantile call for every column without nulls,
+            # per-column on the non-null values for the rest
+            quantiles = np.full((len(QUANTILES), block.shape[1]), np.nan)
+            if (~has_nulls).any():
+                quantiles[:, ~has_nulls] = np.quantile(block[:, ~has_nulls], QUANTILES, axis=0)
+            for j in np.flatnonzero(has_nulls & filled):
+                values = block[:, j][~np.isnan(block[:, j])]
+                quantiles[:, j] = np.quantile(values, QUANTILES)
+
+        summary["q25"], summary["median"], summary["q75"] = quantiles
+        return pd.DataFrame(summary, index=self.numeric_columns)[columns]
+
+    def nunique(self, col: str) -> int:
+        """Distinct non-null values (cached)"""
+        if col not in self._nunique:
+            self._nunique[col] = int(self._df[col].nunique())
+        return self._nunique[col]
+
+    def has_single_value(self, col: str) -> bool:
+        """Exactly one distinct non-null value; numeric columns answer from min/max"""
+        if col in self.numeric_summary.index:
+            row = self.numeric_summary.loc[col]
+            return bool(row["count"] > 0 and row["min"] == row["max"])
+        return self.nunique(col) == 1
+
+    def numeric_stats(self, col: str) -> Dict[str, float]:
+        """mean/median/std/min/max/q25/q75 for a numeric column"""
+        row = self.numeric_summary.loc[col]
+        return {
+            "mean": float(row["mean"]),
+            "median": float(row["median"]),
+            "std": float(row["std"]),
+            "min": float(row["min"]),
+            "max": float(row["max"]),
+            "q25": float(row["q25"]),
+            "q75": float(row["q75"])
+        }
+
+    def value_counts(self, col: str) -> pd.Series:
+        """Cached df[col].value_counts(), without unused categories of category columns"""
+        if col not in self._value_counts:
+            counts = self._df[col].value_counts()
+            if isinstance(self._df[col].dtype, pd.CategoricalDtype):
+                counts = counts[counts > 0]
+            self._value_counts[col] = counts
+        return self._value_counts[col]
+
+    def missing_values(self) -> Dict[str, Any]:
+        return self.null_counts.to_dict()
@@ -1,12 +1,16 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.utils.row_fingerprint import duplicate_key_columns, duplicate_mask
+from app.utils.column_profile import CATEGORICAL_DTYPES
 
 
-def clean_dataframe(df: pd.DataFrame) -> tuple[pd.DataFrame, Dict[str, Any]]:
+def clean_dataframe(df: pd.DataFrame, duplicates: Optional[np.ndarray] = None) -> tuple[pd.DataFrame, Dict[str, Any]]:
     """
     Clean DataFrame and return cleaned version with cleaning report
 
+    `duplicates` is the duplicate_mask of df when already computed.
+
     Operations:
     - Remove duplicate rows
     - Handle missing values
@@ -31,12 +35,14 @@ def clean_dataframe(df: pd.DataFrame) -> tuple[pd.DataFrame, Dict[str, Any]]:
         })
 
     # 2. Remove duplicate rows
-    duplicates = df_cleaned.duplicated().sum()
-    if duplicates > 0:
-        df_cleaned = df_cleaned.drop_duplicates()
+    if duplicates is None:
+        duplicates = duplicate_mask(df, duplicate_key_columns(df.columns))
+    duplicate_count = int(duplicates.sum())
+    if duplicate_count > 0:
+        df_cleaned = df_cleaned[~duplicates]
         cleaning_report["operations"].append({
             "step": "duplicates_removed",
-            "count": int(duplicates)
+            "count": duplicate_count
         })
 
     # 3. Handle missing values
@@ -49,12 +55,14 @@ def clean_dataframe(df: pd.DataFrame) -> tuple[pd.DataFrame, Dict[str, Any]]:
                 df_cleaned[col] = df_cleaned[col].fillna(df_cleaned[col].median())
 
         # For categorical columns: fill with mode or 'Unknown'
-        categorical_columns = df_cleaned.select_dtypes(include=['object']).columns
+        categorical_columns = df_cleaned.select_dtypes(include=CATEGORICAL_DTYPES).columns
         for col in categorical_columns:
             if df_cleaned[col].isnull().any():
                 mode_value = df_cleaned[col].mode()
                 if len(mode_value) > 0:
                     df_cleaned[col] = df_cleaned[col].fillna(mode_value[0])
+                elif isinstance(df_cleaned[col].dtype, pd.CategoricalDtype):
+                    df_cleaned[col] = df_cleaned[col].cat.add_categories('Unknown').fillna('Unknown')
                 else:
                     df_cleaned[col] = df_cleaned[col].fillna('Unknown')
 
@@ -0,0 +1,76 @@
+import numpy as np
+from typing import Optional
+from app.config import settings
+
+DOWNSAMPLING_METHODS = ("lttb", "minmax")
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: Optional[int] = None, method: Optional[str] = None) -> np.ndarray:
+    """
+    Indices of at most about `max_points` points that keep the shape of a series
+
+    x must be increasing and neither x nor y may hold NaN. method is lttb
+    (Largest-Triangle-Three-Buckets) or minmax (default
+    LINE_CHART_DOWNSAMPLING); max_points defaults to LINE_CHART_MAX_POINTS.
+    Short series are returned whole.
+    """
+    max_points = max_points or settings.LINE_CHART_MAX_POINTS
+    method = method or settings.LINE_CHART_DOWNSAMPLING
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unknown downsampling method: {method}")
+
+    if len(y) <= max_points or max_points < 3:
+        return np.arange(len(y))
+    if method == "minmax":
+        return minmax_indices(y, max_points)
+    return lttb_indices(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), max_points)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets (Steinarsson, 2013)
+
+    Keeps the first and last points and, from each of n_out - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket. Bucket
+    averages are computed at once; the remaining loop runs once per output
+    point over that bucket's values.
+    """
+    n = len(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    # Average of every bucket, plus the last point standing in after the final one
+    counts = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts, x[-1])
+    avg_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        ax, ay = x[previous], y[previous]
+        # Twice the triangle area; the constant factor does not change the argmax
+        areas = np.abs((ax - avg_x[i + 1]) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y[i + 1] - ay))
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    First and last points plus the minimum and maximum of each of
+    (n_out - 2) / 2 equal buckets, so every peak and dip survives
+    """
+    n = len(y)
+    buckets = max(1, (n_out - 2) // 2)
+    size = -(-n // buckets)
+
+    # Pad to whole buckets with NaN, then one argmin/argmax per row
+    padded = np.full(size * (-(-n // size)), np.nan)
+    padded[:n] = y
+    rows = padded.reshape(-1, size)
+    offsets = np.arange(len(rows)) * size
+    minima = offsets + np.nanargmin(rows, axis=1)
+    maxima = offsets + np.nanargmax(rows, axis=1)
+    return np.unique(np.concatenate([[0], minima, maxima, [n - 1]]))
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any
+from app.config import settings
+
+# Arrow-backed strings with NaN as the missing value (the pandas 3 "str"
+# dtype), so code written for object columns keeps working
+ARROW_STRING = pd.StringDtype("pyarrow", na_value=np.nan)
+
+
+def optimize_dtypes(df: pd.DataFrame) -> tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Shrink a parsed DataFrame without changing its values
+
+    - string columns with few distinct values (at most DTYPE_CATEGORY_MAX_RATIO
+      of the rows) become `category`, other string columns Arrow strings
+    - integer columns are downcast to the smallest signed type that holds them
+
+    Object columns mixing strings with other types and float columns are
+    left alone (float32 would change values and their text form).
+    Returns the frame and a report with the memory before and after.
+    """
+    memory_before = int(df.memory_usage(deep=True).sum())
+    conversions = {}
+
+    if settings.DTYPE_OPTIMIZATION_ENABLED and len(df) > 0:
+        df = df.copy(deep=False)
+        max_distinct = settings.DTYPE_CATEGORY_MAX_RATIO * len(df)
+        for col in df.columns:
+            series = df[col]
+            before = str(series.dtype)
+
+            if series.dtype == object:
+                if pd.api.types.infer_dtype(series, skipna=True) != "string":
+                    continue
+                if series.nunique() <= max_distinct:
+                    df[col] = series.astype("category")
+                else:
+                    df[col] = series.astype(ARROW_STRING)
+            elif pd.api.types.is_integer_dtype(series) and not pd.api.types.is_extension_array_dtype(series):
+                df[col] = pd.to_numeric(series, downcast="integer")
+            else:
+                continue
+
+            after = str(df[col].dtype)
+            if after != before:
+                conversions[col] = f"{before} -> {after}"
+
+    memory_after = int(df.memory_usage(deep=True).sum()) if conversions else memory_before
+    return df, {
+        "memory_before_bytes": memory_before,
+        "memory_after_bytes": memory_after,
+        "conversions": conversions
+    }
@@ -1,5 +1,6 @@
 import os
 import uuid
+import hashlib
 from datetime import datetime
 from fastapi import UploadFile, HTTPException
 from app.config import settings
@@ -28,7 +29,13 @@ def validate_file(file: UploadFile) -> None:
 
 
 async def save_upload_file(file: UploadFile, job_id: str) -> dict:
-    """Save uploaded file to disk"""
+    """
+    Stream uploaded file to disk in UPLOAD_CHUNK_SIZE chunks
+
+    The size limit is enforced as bytes arrive and the SHA-256 content hash
+    is computed in the same pass, so memory per upload stays constant.
+    """
+    file_path = None
     try:
         # Create job directory
         job_dir = os.path.join(settings.UPLOAD_DIR, job_id)
@@ -37,24 +44,42 @@ async def save_upload_file(file: UploadFile, job_id: str) -> dict:
         # Save file
         file_path = os.path.join(job_dir, file.filename)
 
-        content = await file.read()
-        file_size = len(content)
-
-        # Check file size
-        if file_size > settings.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Max size: {settings.MAX_FILE_SIZE / 1_000_000}MB"
-            )
+        file_size = 0
+        file_hash = hashlib.sha256()
 
         with open(file_path, "wb") as f:
-            f.write(content)
+            while True:
+                chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                file_size += len(chunk)
+
+                # Check file size
+                if file_size > settings.MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File too large. Max size: {settings.MAX_FILE_SIZE / 1_000_000}MB"
+                    )
+
+                file_hash.update(chunk)
+                f.write(chunk)
 
         return {
             "file_path": file_path,
             "file_size": file_size,
+            "file_hash": file_hash.hexdigest(),
             "job_dir": job_dir
         }
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
\ No newline at end of file
+        # Don't leave partial uploads behind
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+            if not os.listdir(os.path.dirname(file_path)):
+                os.rmdir(os.path.dirname(file_path))
+
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
+
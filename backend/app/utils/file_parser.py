@@ -1,26 +1,58 @@
 import pandas as pd
+import numpy as np
 import json
+import re
 import os
-from typing import Dict, Any
+import time
+import logging
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from pandas.tseries.api import guess_datetime_format
 from fastapi import HTTPException
 from datetime import datetime
+from app.utils.column_profile import ColumnProfile
+from app.utils.file_sniffer import sniff_dialect, dialect_read_options
+from app.config import settings
 
+logger = logging.getLogger(__name__)
 
-def parse_file(file_path: str) -> pd.DataFrame:
+# Tried after the formats pandas guesses from the sampled values
+DATETIME_FORMATS = [
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y/%m/%d',
+    '%d/%m/%Y',
+    '%m/%d/%Y',
+    '%d.%m.%Y',
+    '%d-%m-%Y',
+    '%d/%m/%Y %H:%M',
+    '%m/%d/%Y %H:%M'
+]
+# UTC offset at the end of a value parsed with %z
+OFFSET_PATTERN = r'(Z|[+-]\d{2}:?\d{2})$'
+# One- or two-digit numbers that can be a day but not a month
+DAY_ONLY_NUMBER = re.compile(r'(?<!\d)(1[3-9]|2\d|3[01])(?!\d)')
+
+
+def parse_file(file_path: str, dialect: Optional[Dict[str, Any]] = None, parse_dates: bool = True) -> pd.DataFrame:
     """
     Parse various file formats and return pandas DataFrame
 
-    Supported formats: CSV, JSON, Excel (xlsx, xls)
+    Supported formats: CSV, JSON, Excel (xlsx, xls), TXT
+
+    CSV/TXT are read exactly once using `dialect` (see sniff_dialect),
+    sniffed from the start of the file when not given. With parse_dates=False
+    datetime detection is left to the caller (see auto_parse_dates).
     """
     try:
         file_ext = os.path.splitext(file_path)[1].lower()
 
-        if file_ext == '.csv':
-            # Try different encodings
-            try:
-                df = pd.read_csv(file_path, encoding='utf-8')
-            except UnicodeDecodeError:
-                df = pd.read_csv(file_path, encoding='latin-1')
+        if file_ext in ['.csv', '.txt']:
+            if dialect is None:
+                dialect = sniff_dialect(file_path)
+            df = pd.read_csv(file_path, **dialect_read_options(dialect))
 
         elif file_ext == '.json':
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -35,15 +67,6 @@ def parse_file(file_path: str) -> pd.DataFrame:
         elif file_ext in ['.xlsx', '.xls']:
             df = pd.read_excel(file_path)
 
-        elif file_ext == '.txt':
-            for delimiter in [',', '\t', ';', '|']:
-                try:
-                    df = pd.read_csv(file_path, delimiter=delimiter)
-                    if len(df.columns) > 1:
-                        break
-                except:
-                    continue
-
         else:
             raise HTTPException(
                 status_code=400,
@@ -56,8 +79,9 @@ def parse_file(file_path: str) -> pd.DataFrame:
                 detail="File is empty or couldn't be parsed"
             )
 
-        # Auto-detect and parse datetime columns
-        df = auto_parse_dates(df)
+        # Detect datetime columns and parse each with one explicit format
+        if parse_dates:
+            df = auto_parse_dates(df)
 
         return df
 
@@ -68,47 +92,138 @@ def parse_file(file_path: str) -> pd.DataFrame:
         )
 
 
-def auto_parse_dates(df: pd.DataFrame) -> pd.DataFrame:
+def auto_parse_dates(df: pd.DataFrame, formats: Optional[Dict[str, str]] = None) -> pd.DataFrame:
     """
-    Automatically detect and parse datetime columns
+    Convert datetime columns, each parsed with one explicit format
+
+    Formats are inferred with infer_datetime_formats unless given (e.g.
+    inferred once from the first chunk of a large file). The formats used
+    are reported in df.attrs["datetime_formats"].
+    """
+    if formats is None:
+        formats = infer_datetime_formats(df)
+
+    for col, fmt in formats.items():
+        df[col] = pd.to_datetime(df[col], format=fmt, errors='coerce')
+
+    df.attrs["datetime_formats"] = formats
+    return df
+
+
+def infer_datetime_formats(df: pd.DataFrame) -> Dict[str, str]:
+    """
+    One strptime format per text column that holds dates
+
+    Only a sample of DATETIME_SAMPLE_SIZE values per column is parsed; a
+    column qualifies when at least DATETIME_MIN_SUCCESS_RATE of the sample
+    parses with a single format. Numeric columns are never converted.
     """
+    started = time.perf_counter()
+    formats = {}
+
     for col in df.columns:
-        # Skip if already datetime
-        if pd.api.types.is_datetime64_any_dtype(df[col]):
+        series = df[col]
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
             continue
 
-        # Check for common datetime column names
-        datetime_keywords = ['date', 'time', 'timestamp', 'created', 'updated', 'dt']
-        if any(keyword in col.lower() for keyword in datetime_keywords):
-            try:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-                print(f"Parsed datetime column: {col}")
-            except:
-                pass
-
-        # Try parsing if column is object type and sample looks like date
-        elif df[col].dtype == 'object':
-            try:
-                sample = df[col].dropna().head(10).astype(str)
-                if sample.str.match(r'\d{4}[-/]\d{2}[-/]\d{2}').any():
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-                    print(f"Auto-detected and parsed datetime column: {col}")
-            except:
-                pass
+        sample = _sample_text_values(series)
+        if not sample:
+            continue
 
-    return df
+        fmt, success_rate = _infer_format(sample)
+        if fmt is not None:
+            formats[col] = fmt
+            logger.info(
+                "stage=datetime_inference column=%s format=%s success_rate=%.3f sample_size=%d",
+                col, fmt, success_rate, len(sample)
+            )
+
+    logger.info(
+        "stage=datetime_inference columns=%d datetime_columns=%d duration_ms=%.1f",
+        len(df.columns), len(formats), (time.perf_counter() - started) * 1000
+    )
+    return formats
+
+
+def _sample_text_values(series: pd.Series) -> Tuple[str, ...]:
+    """Up to DATETIME_SAMPLE_SIZE evenly spaced non-null values, as stripped strings"""
+    size = settings.DATETIME_SAMPLE_SIZE
+    if len(series) > size:
+        series = series.iloc[np.linspace(0, len(series) - 1, size).astype(np.int64)]
+    values = series.dropna().astype(str).str.strip()
+    return tuple(values[values != ''])
+
+
+@lru_cache(maxsize=256)
+def _infer_format(sample: Tuple[str, ...]) -> Tuple[Optional[str], float]:
+    """
+    Best (format, success rate) for a sample, or (None, rate) below the threshold
+
+    Candidates are the formats pandas guesses from the first few values
+    (month-first and day-first), then DATETIME_FORMATS. Cached per sample.
+    """
+    values = pd.Series(sample, dtype=object)
+    has_digits = float(values.str.contains(r'\d', regex=True).mean())
+    if has_digits < settings.DATETIME_MIN_SUCCESS_RATE:
+        return None, 0.0
+
+    candidates = []
+    for value in sample[:5]:
+        # Numbers above 12 are replaced first: pandas warns when a value can
+        # only be read against its dayfirst argument. The day-first reading is
+        # then the month-first one with %d and %m swapped.
+        guessed = guess_datetime_format(DAY_ONLY_NUMBER.sub('12', value))
+        if not guessed:
+            continue
+        for fmt in (guessed, _swap_day_month(guessed)):
+            if fmt not in candidates:
+                candidates.append(fmt)
+    candidates += [fmt for fmt in DATETIME_FORMATS if fmt not in candidates]
+
+    best, best_rate = None, 0.0
+    for fmt in candidates:
+        # A date needs at least a year and a month (rules out bare times and numbers)
+        if not ('%Y' in fmt or '%y' in fmt) or not any(d in fmt for d in ('%m', '%b', '%B')):
+            continue
+        tz_aware = '%z' in fmt
+        try:
+            # utc=True: pandas warns about mixed offsets otherwise
+            parsed = pd.to_datetime(values, format=fmt, errors='coerce', utc=tz_aware)
+        except (ValueError, TypeError):
+            continue
+        if tz_aware and values[parsed.notna()].str.extract(OFFSET_PATTERN)[0].nunique() > 1:
+            # Mixed UTC offsets would leave auto_parse_dates with object values
+            continue
+        rate = float(parsed.notna().mean())
+        if rate > best_rate:
+            best, best_rate = fmt, rate
+        if rate == 1.0:
+            break
+
+    if best_rate < settings.DATETIME_MIN_SUCCESS_RATE:
+        return None, best_rate
+    return best, best_rate
 
 
-def get_dataframe_info(df: pd.DataFrame) -> Dict[str, Any]:
+def _swap_day_month(fmt: str) -> str:
+    if '%d' not in fmt or '%m' not in fmt:
+        return fmt
+    return fmt.replace('%d', '\0').replace('%m', '%d').replace('\0', '%m')
+
+
+def get_dataframe_info(df: pd.DataFrame, profile: Optional[ColumnProfile] = None) -> Dict[str, Any]:
     """
     Get basic information about the DataFrame
     """
+    if profile is None:
+        profile = ColumnProfile(df)
+
     info = {
         "rows": len(df),
         "columns": len(df.columns),
         "column_names": df.columns.tolist(),
         "column_types": df.dtypes.astype(str).to_dict(),
-        "missing_values": df.isnull().sum().to_dict(),
+        "missing_values": profile.missing_values(),
         "memory_usage": f"{df.memory_usage(deep=True).sum() / 1024:.2f} KB"
     }
     return info
@@ -118,25 +233,56 @@ def get_data_preview(df: pd.DataFrame, rows: int = 10) -> Dict[str, Any]:
     """
     Get preview of DataFrame (first N rows)
     """
-    preview_df = df.head(rows)
-
-    # Convert to JSON-serializable format
-    preview_data = []
-    for _, row in preview_df.iterrows():
-        row_dict = {}
-        for col in df.columns:
-            val = row[col]
-            # Handle different types
-            if pd.isna(val):
-                row_dict[col] = None
-            elif isinstance(val, (pd.Timestamp, datetime)):
-                row_dict[col] = val.isoformat()
-            else:
-                row_dict[col] = str(val)
-        preview_data.append(row_dict)
-
     return {
         "columns": df.columns.tolist(),
-        "data": preview_data,
+        "data": dataframe_to_records(df.head(rows)),
         "total_rows": len(df)
-    }
\ No newline at end of file
+    }
+
+
+def dataframe_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    JSON-serializable rows: None for nulls, ISO strings for datetimes,
+    str() of everything else
+
+    Converted column by column, then zipped into row dicts.
+    """
+    names = df.columns.tolist()
+    if not names:
+        return [{} for _ in range(len(df))]
+    columns = [_json_column(df.iloc[:, j]) for j in range(df.shape[1])]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def _json_column(series: pd.Series) -> List[Any]:
+    """One column of dataframe_to_records"""
+    nulls = series.isna().to_numpy()
+
+    if pd.api.types.is_datetime64_any_dtype(series) and series.dt.tz is None:
+        text = _isoformat(series.to_numpy(dtype="datetime64[ns]"))
+    elif pd.api.types.is_datetime64_any_dtype(series) or (
+            series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) not in ("string", "empty")
+    ):
+        # Timezone-aware or mixed values: convert value by value
+        text = np.array([
+            value.isoformat() if isinstance(value, (pd.Timestamp, datetime)) else str(value)
+            for value in series.tolist()
+        ], dtype=object)
+    else:
+        text = series.astype(str).to_numpy(dtype=object)
+
+    return np.where(nulls, None, text).tolist()
+
+
+def _isoformat(values: np.ndarray) -> np.ndarray:
+    """Timestamp.isoformat() of naive datetime64[ns] values (fractions only where non-zero)"""
+    ticks = values.view("i8")
+    return np.where(
+        ticks % 1_000_000_000 == 0,
+        np.datetime_as_string(values, unit="s"),
+        np.where(
+            ticks % 1_000 == 0,
+            np.datetime_as_string(values, unit="us"),
+            np.datetime_as_string(values, unit="ns")
+        )
+    ).astype(object)
\ No newline at end of file
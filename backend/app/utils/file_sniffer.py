@@ -0,0 +1,161 @@
+import codecs
+import csv
+import re
+from collections import Counter
+from typing import BinaryIO, Dict, Any, List
+from app.config import settings
+
+CANDIDATE_DELIMITERS = [',', ';', '\t', '|']
+# Block size for checking that the rest of a UTF-8 file decodes
+UTF8_CHECK_BLOCK_BYTES = 1024 * 1024
+
+_COMMA_DECIMAL = re.compile(r'^[-+]?\d+(\.\d{3})*,\d+$')
+_DOT_DECIMAL = re.compile(r'^[-+]?\d+(,\d{3})*\.\d+$')
+_NUMBER = re.compile(r'^[-+]?(\d+([.,]\d+)*|[.,]\d+)([eE][-+]?\d+)?$')
+
+
+def sniff_dialect(file_path: str) -> Dict[str, Any]:
+    """
+    Detect encoding, delimiter, quoting, header presence and decimal
+    separator from the first SNIFF_SAMPLE_BYTES of a delimited text file
+
+    A UTF-8 sample of a longer file is confirmed by decoding the rest of the
+    raw bytes (latin-1 if that fails), so parse_file reads the whole file
+    exactly once with the right encoding.
+    """
+    with open(file_path, 'rb') as f:
+        raw = f.read(settings.SNIFF_SAMPLE_BYTES)
+        truncated = len(raw) == settings.SNIFF_SAMPLE_BYTES
+
+        encoding = detect_encoding(raw, truncated)
+        if encoding == 'utf-8' and truncated and not _decodes_as_utf8(raw, f):
+            # Non-UTF-8 bytes after the sample
+            encoding = 'latin-1'
+
+    text = raw.decode(encoding, errors='ignore')
+    if truncated and '\n' in text:
+        # Drop the partial last line
+        text = text[:text.rfind('\n') + 1]
+
+    lines = [line for line in text.splitlines() if line.strip()][:settings.SNIFF_MAX_LINES]
+    quotechar = _detect_quotechar(text)
+    delimiter = _detect_delimiter(lines, quotechar)
+    rows = list(csv.reader(lines, delimiter=delimiter, quotechar=quotechar))
+    decimal = _detect_decimal(rows[1:], delimiter)
+
+    return {
+        "encoding": encoding,
+        "delimiter": delimiter,
+        "quotechar": quotechar,
+        "has_header": _detect_header(rows, delimiter),
+        "column_count": Counter(len(row) for row in rows).most_common(1)[0][0] if rows else 0,
+        "decimal": decimal,
+        "thousands": '.' if decimal == ',' else None,
+        "sample_bytes": len(raw)
+    }
+
+
+def dialect_read_options(dialect: Dict[str, Any]) -> Dict[str, Any]:
+    """pd.read_csv keyword arguments for a sniffed dialect"""
+    options = {
+        "encoding": dialect["encoding"],
+        "sep": dialect["delimiter"],
+        "quotechar": dialect["quotechar"],
+        "decimal": dialect["decimal"],
+        "thousands": dialect["thousands"]
+    }
+    if not dialect["has_header"]:
+        options["header"] = None
+        options["names"] = [f"column_{i + 1}" for i in range(dialect["column_count"])]
+    return options
+
+
+def detect_encoding(raw: bytes, truncated: bool = False) -> str:
+    """BOM, then strict UTF-8, then latin-1 (which decodes anything)"""
+    if raw.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8-sig'
+    if raw.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return 'utf-16'
+
+    # A truncated sample may end in the middle of a multi-byte character
+    for cut in range(4 if truncated else 1):
+        try:
+            raw[:len(raw) - cut].decode('utf-8')
+            return 'utf-8'
+        except UnicodeDecodeError:
+            continue
+
+    return 'latin-1'
+
+
+def _decodes_as_utf8(raw: bytes, f: BinaryIO) -> bool:
+    """True if `raw` followed by the rest of `f` is valid UTF-8 (read block by block)"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        decoder.decode(raw)
+        for block in iter(lambda: f.read(UTF8_CHECK_BLOCK_BYTES), b''):
+            decoder.decode(block)
+        decoder.decode(b'', final=True)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _detect_quotechar(text: str) -> str:
+    try:
+        quotechar = csv.Sniffer().sniff(text[:65536], delimiters=''.join(CANDIDATE_DELIMITERS)).quotechar
+        if quotechar in ('"', "'"):
+            return quotechar
+    except csv.Error:
+        pass
+    return '"'
+
+
+def _detect_delimiter(lines: List[str], quotechar: str) -> str:
+    """
+    Delimiter that splits the sample into the most consistent number of
+    fields (>1); earlier candidates win ties, so ',' is preferred
+    """
+    best, best_score = ',', (0.0, 0)
+    for delimiter in CANDIDATE_DELIMITERS:
+        counts = [len(row) for row in csv.reader(lines, delimiter=delimiter, quotechar=quotechar)]
+        if not counts:
+            continue
+        fields, occurrences = Counter(counts).most_common(1)[0]
+        if fields < 2:
+            continue
+        score = (occurrences / len(counts), fields)
+        if score > best_score:
+            best, best_score = delimiter, score
+    return best
+
+
+def _detect_header(rows: List[List[str]], delimiter: str) -> bool:
+    """
+    Assume a header unless every field of the first row is numeric AND
+    csv.Sniffer agrees there is none (column names are rarely all numbers)
+    """
+    if len(rows) < 2:
+        return True
+    if not all(_NUMBER.match(field.strip()) or not field.strip() for field in rows[0]):
+        return True
+    try:
+        sample = '\n'.join(delimiter.join(row) for row in rows[:50])
+        return csv.Sniffer().has_header(sample)
+    except csv.Error:
+        return True
+
+
+def _detect_decimal(rows: List[List[str]], delimiter: str) -> str:
+    """',' when numeric fields consistently use a decimal comma (only possible if ',' isn't the delimiter)"""
+    if delimiter == ',':
+        return '.'
+    comma = dot = 0
+    for row in rows:
+        for field in row:
+            field = field.strip()
+            if _COMMA_DECIMAL.match(field):
+                comma += 1
+            elif _DOT_DECIMAL.match(field):
+                dot += 1
+    return ',' if comma > dot else '.'
@@ -0,0 +1,35 @@
+import orjson
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Any
+
+# NumPy arrays and scalars are encoded natively; int/float dict keys are
+# written as strings like the json module does
+OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Compact JSON in one pass: NaN/Inf become null, timestamps ISO strings,
+    pandas NA/NaT null, and anything else unknown its str()
+    """
+    return orjson.dumps(data, default=_default, option=OPTIONS)
+
+
+def loads(data: bytes) -> Any:
+    return orjson.loads(data)
+
+
+def _default(obj: Any) -> Any:
+    """Values orjson does not encode itself (its result is encoded in turn)"""
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (pd.Timestamp, datetime)):
+        return obj.isoformat()
+    if isinstance(obj, np.ndarray):
+        # Object and string arrays
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
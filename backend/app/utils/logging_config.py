@@ -0,0 +1,14 @@
+import logging
+from app.config import settings
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(processName)s %(name)s %(message)s"
+
+
+def configure_logging() -> None:
+    """
+    Root logger setup for the API process and each worker process
+
+    Pipeline stages log key=value pairs (stage=..., column=...) so the
+    output stays greppable.
+    """
+    logging.basicConfig(level=settings.LOG_LEVEL.upper(), format=LOG_FORMAT)
@@ -0,0 +1,98 @@
+import os
+import uuid
+from typing import Dict, Any, Callable, List, Optional
+from fastapi import HTTPException
+from app.utils.json_codec import dumps
+
+RESULTS_FILE = "results.json"
+
+# Sections of results.json persisted as separate files, so a panel can
+# fetch only what it shows: name -> extractor from the full results
+RESULT_SECTIONS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "info": lambda r: {
+        "job_id": r.get("job_id"),
+        "status": r.get("status"),
+        "processing_mode": r.get("processing_mode"),
+        "datetime_formats": r.get("datetime_formats"),
+        "original_data_info": r.get("original_data_info"),
+        "cleaned_data_info": r.get("cleaned_data_info"),
+        "cleaning_report": r.get("cleaning_report"),
+        "cache": r.get("cache"),
+        "llm": r.get("llm"),
+        "skipped_stages": r.get("skipped_stages"),
+        "timings": r.get("timings"),
+        "processed_at": r.get("processed_at")
+    },
+    "preview": lambda r: r.get("data_preview"),
+    "statistics": lambda r: r.get("statistics"),
+    "correlation": lambda r: r.get("advanced_analytics", {}).get("correlation_matrix"),
+    "outliers": lambda r: r.get("advanced_analytics", {}).get("outliers"),
+    "anomalies": lambda r: r.get("advanced_analytics", {}).get("anomalies"),
+    "trends": lambda r: r.get("advanced_analytics", {}).get("trends"),
+    "charts": lambda r: r.get("charts"),
+    "insights": lambda r: r.get("insights")
+}
+
+
+def section_filename(section: str) -> str:
+    return f"results.{section}.json"
+
+
+def is_section_file(name: str) -> bool:
+    return name.startswith("results.") and name.endswith(".json") and name != RESULTS_FILE
+
+
+def _write_json(path: str, data: Any) -> None:
+    """Compact JSON (see json_codec), written to a temp file and renamed so readers never see a partial file"""
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps(data))
+    os.replace(tmp_path, path)
+
+
+def write_results(processed_dir: str, results: Dict[str, Any]) -> str:
+    """Persist the full results.json plus one file per section. Returns the results.json path."""
+    for section, extract in RESULT_SECTIONS.items():
+        _write_json(os.path.join(processed_dir, section_filename(section)), extract(results))
+
+    results_path = os.path.join(processed_dir, RESULTS_FILE)
+    _write_json(results_path, results)
+    return results_path
+
+
+def read_raw(processed_dir: str, section: Optional[str] = None) -> bytes:
+    """
+    Stored JSON bytes of the full results or one section, without parsing
+
+    Raises 404 for unknown sections and jobs without results.
+    """
+    if section is None:
+        path = os.path.join(processed_dir, RESULTS_FILE)
+    elif section in RESULT_SECTIONS:
+        path = os.path.join(processed_dir, section_filename(section))
+    else:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown results section: {section}. Available: {', '.join(RESULT_SECTIONS)}"
+        )
+
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=404,
+            detail="Results not found. Job may not be completed yet."
+        )
+
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def select_fields(data: Any, fields: List[str]) -> Any:
+    """
+    Keep only `fields` of a section: top-level keys of a dict, or the keys
+    of each item of a list of dicts (e.g. chart titles without their data)
+    """
+    if isinstance(data, dict):
+        return {key: data[key] for key in fields if key in data}
+    if isinstance(data, list):
+        return [select_fields(item, fields) if isinstance(item, dict) else item for item in data]
+    return data
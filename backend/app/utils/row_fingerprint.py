@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Sequence
+from app.config import settings
+
+# Rows are compared by a 64-bit fingerprint: pandas' hash of each column's
+# values, combined per row. Two distinct rows collide with probability about
+# n² / 2**65 (a few in a million for 10M rows).
+
+_CATEGORIZE_SAMPLE_SIZE = 1000
+
+
+def duplicate_key_columns(columns: Sequence[str]) -> Optional[List[str]]:
+    """
+    DUPLICATE_KEY_COLUMNS that exist in `columns`, or None to compare whole
+    rows (also when none of the configured columns exist)
+    """
+    configured = [col.strip() for col in settings.DUPLICATE_KEY_COLUMNS.split(",") if col.strip()]
+    present = [col for col in configured if col in set(columns)]
+    return present or None
+
+
+def row_fingerprints(df: pd.DataFrame, subset: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    One uint64 hash per row over all columns, or only `subset` (for
+    near-duplicates that differ elsewhere)
+
+    Hashes depend only on the values, so fingerprints of chunks of a file
+    can be compared with each other.
+    """
+    if subset is not None:
+        df = df[list(subset)]
+
+    fingerprints = np.full(len(df), 0x345678, dtype=np.uint64)
+    multiplier = np.uint64(1000003)
+    for j in range(df.shape[1]):
+        series = df.iloc[:, j]
+        column_hash = pd.util.hash_pandas_object(series, index=False, categorize=_categorize(series)).to_numpy()
+        fingerprints ^= column_hash
+        fingerprints *= multiplier
+        multiplier += np.uint64(82520 + 2 * (df.shape[1] - j))
+    return fingerprints
+
+
+def _categorize(series: pd.Series) -> bool:
+    """
+    Hash distinct values once (factorize first) unless the column looks
+    mostly unique, where factorizing costs more than it saves
+    """
+    if series.dtype != object or len(series) <= _CATEGORIZE_SAMPLE_SIZE:
+        return True
+    step = len(series) // _CATEGORIZE_SAMPLE_SIZE
+    sample = series.iloc[::step]
+    return sample.nunique(dropna=False) < len(sample) / 2
+
+
+def duplicate_mask(df: pd.DataFrame, subset: Optional[Sequence[str]] = None) -> np.ndarray:
+    """Boolean mask of rows that repeat an earlier row, like df.duplicated(subset)"""
+    return pd.Series(row_fingerprints(df, subset)).duplicated().to_numpy()
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, Optional
+from app.config import settings
+from app.utils.column_profile import ColumnProfile
+
+
+class RowSample:
+    """
+    Rows standing in for a larger frame, with inverse-probability weights
+
+    `frame_rows` rows were available (already a uniform sample of
+    `total_rows` in chunked mode); `df` holds the rows actually scanned and
+    `weights[i]` how many of the total rows row i represents. Counts from
+    weighted rows are unbiased estimates of the counts over all rows, and
+    exact per stratum for a stratified sample.
+    """
+
+    def __init__(
+            self,
+            df: pd.DataFrame,
+            weights: np.ndarray,
+            frame_rows: int,
+            total_rows: int,
+            method: str = "exact",
+            stratified_by: Optional[str] = None
+    ):
+        self.df = df
+        self.weights = weights
+        self.frame_rows = frame_rows
+        self.total_rows = total_rows
+        self.method = method
+        self.stratified_by = stratified_by
+
+    @property
+    def frame_scale(self) -> float:
+        """Total rows per frame row (1.0 unless the frame itself is a sample)"""
+        return self.total_rows / self.frame_rows if self.frame_rows else 1.0
+
+    def count(self, keys) -> pd.Series:
+        """Rows per key (a Series, or list of Series, aligned with df), estimated when sampled"""
+        counts = pd.Series(self.weights, index=self.df.index).groupby(keys, observed=True).sum()
+        return counts.round().astype(np.int64)
+
+    def scale_counts(self, counts: pd.Series) -> pd.Series:
+        """Counts over the frame (e.g. from its ColumnProfile) scaled to all rows"""
+        if self.frame_rows == self.total_rows:
+            return counts
+        return (counts * self.frame_scale).round().astype(np.int64)
+
+    def info(self) -> Dict[str, Any]:
+        """Label for figures computed from the sampled rows"""
+        if self.method == "exact":
+            return {"mode": "exact"}
+        return {
+            "mode": "sampled",
+            "method": self.method,
+            "stratified_by": self.stratified_by,
+            "sample_rows": len(self.df),
+            "total_rows": self.total_rows
+        }
+
+    def frame_info(self) -> Dict[str, Any]:
+        """Label for figures computed from the whole frame"""
+        if self.frame_rows == self.total_rows:
+            return {"mode": "exact"}
+        return {
+            "mode": "sampled",
+            "method": "uniform",
+            "stratified_by": None,
+            "sample_rows": self.frame_rows,
+            "total_rows": self.total_rows
+        }
+
+
+def sample_rows(
+        df: pd.DataFrame,
+        max_rows: Optional[int] = None,
+        stratify_by: Optional[str] = None,
+        total_rows: Optional[int] = None,
+        seed: int = 0
+) -> RowSample:
+    """
+    At most `max_rows` rows of df, uniformly or stratified by a column
+
+    A stratified sample allocates rows to the groups of `stratify_by`
+    proportionally (at least one per group), so small groups are still
+    represented. Dates are grouped by day, month or year, whichever gives
+    at most SAMPLING_MAX_STRATA groups; with more groups the sample is
+    uniform. `total_rows` is the row count df was sampled from, if any.
+    Rows keep their original order.
+    """
+    frame_rows = len(df)
+    total_rows = total_rows or frame_rows
+    frame_weights = np.full(frame_rows, total_rows / frame_rows if frame_rows else 1.0)
+    method = "exact" if frame_rows == total_rows else "uniform"
+
+    if max_rows is None or frame_rows <= max_rows:
+        return RowSample(df, frame_weights, frame_rows, total_rows, method)
+
+    rng = np.random.default_rng(seed)
+    codes = _strata_codes(df[stratify_by]) if stratify_by is not None and stratify_by in df.columns else None
+
+    if codes is None:
+        chosen = np.sort(rng.choice(frame_rows, max_rows, replace=False))
+        weights = frame_weights[chosen] * (frame_rows / max_rows)
+        return RowSample(df.iloc[chosen], weights, frame_rows, total_rows, "uniform")
+
+    sizes = np.bincount(codes)
+    allocation = _allocate(sizes, max_rows)
+
+    # Random order within each stratum (shuffle, then a stable radix sort on
+    # the small codes); keep the first allocation[h] rows of stratum h
+    shuffled = rng.permutation(frame_rows)
+    order = shuffled[np.argsort(codes[shuffled].astype(np.min_scalar_type(len(sizes))), kind="stable")]
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    sorted_codes = codes[order]
+    rank = np.arange(frame_rows) - starts[sorted_codes]
+    chosen = np.sort(order[rank < allocation[sorted_codes]])
+
+    weights = frame_weights[chosen] * (sizes / allocation)[codes[chosen]]
+    return RowSample(df.iloc[chosen], weights, frame_rows, total_rows, "stratified", stratify_by)
+
+
+def _strata_codes(series: pd.Series) -> Optional[np.ndarray]:
+    """Group code per row (nulls are a group), or None if there are too many groups"""
+    for keys in _strata_keys(series):
+        codes, uniques = pd.factorize(keys, use_na_sentinel=False)
+        if len(uniques) <= settings.SAMPLING_MAX_STRATA:
+            return codes.astype(np.int64)
+    return None
+
+
+def _strata_keys(series: pd.Series) -> Iterator[pd.Series]:
+    """Grouping keys, finest first: the values, or days, months and years of dates"""
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        yield series
+        return
+    yield series.dt.floor("D")
+    yield series.dt.to_period("M")
+    yield series.dt.to_period("Y")
+
+
+def _allocate(sizes: np.ndarray, max_rows: int) -> np.ndarray:
+    """Proportional allocation (largest remainder), at least one row per group"""
+    exact = sizes * (max_rows / sizes.sum())
+    allocation = np.floor(exact).astype(np.int64)
+    shortfall = max_rows - allocation.sum()
+    if shortfall > 0:
+        allocation[np.argsort(allocation - exact, kind="stable")[:shortfall]] += 1
+    return np.clip(allocation, 1, sizes)
+
+
+def default_strata_column(df: pd.DataFrame, profile: ColumnProfile) -> Optional[str]:
+    """
+    SAMPLING_STRATIFY_COLUMN if set and present, else the first date column,
+    else the first categorical column with at most SAMPLING_MAX_STRATA values
+    """
+    configured = settings.SAMPLING_STRATIFY_COLUMN.strip()
+    if configured:
+        return configured if configured in df.columns else None
+
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            return col
+    for col in profile.categorical_columns:
+        if profile.nunique(col) <= settings.SAMPLING_MAX_STRATA:
+            return col
+    return None
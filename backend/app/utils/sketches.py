@@ -0,0 +1,164 @@
+import numpy as np
+from typing import List, Sequence, Tuple
+
+
+class RunningMoments:
+    """
+    Mergeable count/mean/variance/min/max (Chan et al. parallel update)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of non-null values"""
+        n = len(values)
+        if n == 0:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        self._merge(n, batch_mean, batch_m2)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def add_constant(self, value: float, n: int) -> None:
+        """Add n copies of the same value (e.g. a fill value)"""
+        if n <= 0:
+            return
+        self._merge(n, float(value), 0.0)
+        self.min = min(self.min, float(value))
+        self.max = max(self.max, float(value))
+
+    def merge(self, other: "RunningMoments") -> None:
+        if other.count == 0:
+            return
+        self._merge(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def _merge(self, n: int, mean: float, m2: float) -> None:
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, same as pandas)"""
+        if self.count < 2:
+            return float("nan")
+        return float(np.sqrt(self.m2 / (self.count - 1)))
+
+
+class KLLSketch:
+    """
+    Mergeable streaming quantile sketch (Karnin, Lang & Liberty, 2016)
+
+    Level h holds values that each stand for 2**h stream values. A level over
+    its capacity is sorted and every other value (random offset) is promoted
+    to the next level. The top level holds up to `k` values and lower levels
+    shrink geometrically, so memory stays under ~3k values; every value is
+    kept (quantiles are exact) until more than `k` have been added.
+    """
+
+    def __init__(self, k: int, seed: int = 0):
+        self.k = k
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+        self._levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of non-null values"""
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self._levels[0] = np.concatenate([self._levels[0], np.asarray(values, dtype=np.float64)])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0, dtype=np.float64))
+        for h, level in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], level])
+        self.count += other.count
+        self._compress()
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self._levels) - 1 - h
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self._levels):
+            level = self._levels[h]
+            if len(level) > self._capacity(h):
+                if h + 1 == len(self._levels):
+                    self._levels.append(np.empty(0, dtype=np.float64))
+                level = np.sort(level)
+                # An odd value out stays at this level
+                leftover, level = level[:len(level) % 2], level[len(level) % 2:]
+                promoted = level[self._rng.integers(2)::2]
+                self._levels[h] = leftover
+                self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+            h += 1
+
+    def items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Retained values and how many stream values each stands for"""
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self._levels)])
+        return values, weights
+
+    def quantiles(self, qs: Sequence[float], extra_value: float = None, extra_count: int = 0) -> List[float]:
+        """
+        Quantiles of the stream, optionally with `extra_count` copies of
+        `extra_value` mixed in (used for values filled in after sketching)
+        """
+        values, weights = self.items()
+        if extra_count > 0:
+            values = np.append(values, extra_value)
+            weights = np.append(weights, float(extra_count))
+        return weighted_quantiles(values, weights, qs)
+
+    def mad(self, center: float, extra_count: int = 0) -> float:
+        """
+        Median absolute deviation from `center`, with `extra_count` values
+        equal to the center mixed in
+        """
+        values, weights = self.items()
+        deviations = np.abs(values - center)
+        if extra_count > 0:
+            deviations = np.append(deviations, 0.0)
+            weights = np.append(weights, float(extra_count))
+        return weighted_quantiles(deviations, weights, [0.5])[0]
+
+
+def weighted_quantiles(values: np.ndarray, weights: np.ndarray, qs: Sequence[float]) -> List[float]:
+    """
+    Quantiles of values where each value occurs `weight` times
+
+    Uses linear interpolation like numpy/pandas, so integer weights give the
+    same answer as expanding the data.
+    """
+    if len(values) == 0:
+        return [float("nan")] * len(qs)
+
+    order = np.argsort(values, kind="stable")
+    values = values[order]
+    cumulative = np.cumsum(weights[order])
+    total = cumulative[-1]
+    last = len(values) - 1
+
+    results = []
+    for q in qs:
+        position = (total - 1) * q
+        lower = np.floor(position)
+        i_lower = min(int(np.searchsorted(cumulative, lower, side="right")), last)
+        i_upper = min(int(np.searchsorted(cumulative, lower + 1, side="right")), last)
+        fraction = position - lower
+        results.append(float(values[i_lower] + fraction * (values[i_upper] - values[i_lower])))
+    return results
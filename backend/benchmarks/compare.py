@@ -0,0 +1,60 @@
+"""
+Compare two benchmark result files
+
+    python -m benchmarks.compare benchmarks/results/before.json benchmarks/results/after.json
+
+Prints the median of each (function, rows, width, format) in both runs and
+the speedup (before / after; above 1 means faster).
+"""
+import sys
+import json
+import argparse
+from typing import Any, Dict, List, Tuple
+
+Key = Tuple[str, int, int, str]
+
+
+def _load(path: str) -> Dict[Key, Dict[str, Any]]:
+    with open(path, 'r') as f:
+        report = json.load(f)
+    return {
+        (r["function"], r["rows"], r["width"], r["format"]): r
+        for r in report["results"]
+        if "median_s" in r
+    }
+
+
+def compare(before_path: str, after_path: str) -> List[Dict[str, Any]]:
+    before = _load(before_path)
+    after = _load(after_path)
+    rows = []
+    for key in sorted(before.keys() & after.keys(), key=lambda k: (k[1], k[2], k[0], k[3])):
+        b, a = before[key]["median_s"], after[key]["median_s"]
+        rows.append({
+            "function": key[0],
+            "rows": key[1],
+            "width": key[2],
+            "format": key[3],
+            "before_s": b,
+            "after_s": a,
+            "speedup": round(b / a, 3) if a > 0 else None
+        })
+    return rows
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args(argv)
+
+    for r in compare(args.before, args.after):
+        print(
+            f"{r['function']:<28} {r['rows']:>10} x {r['width']:<3} {r['format']:<5} "
+            f"{r['before_s'] * 1000:10.2f} ms -> {r['after_s'] * 1000:10.2f} ms  x{r['speedup']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import List
+
+# Column kinds, cycled to reach the requested width
+COLUMN_KINDS = ["int", "float", "category", "date", "messy_string", "messy_date", "bool", "skewed"]
+
+FORMATS = ["csv", "json", "xlsx", "txt"]
+# Excel sheets hold at most 1,048,576 rows (header included)
+EXCEL_MAX_ROWS = 1_048_575
+
+_CATEGORIES = np.array(["north", "south", "east", "west", "central"])
+_MESSY_STRINGS = np.array([
+    "Alpha", " alpha", "ALPHA ", "beta", "Beta", "gamma", "N/A", "", "delta-1", "delta 1", "?", "Épsilon"
+])
+
+
+def generate_dataframe(rows: int, width: int = 8, seed: int = 42, null_rate: float = 0.05,
+                       duplicate_rate: float = 0.02) -> pd.DataFrame:
+    """
+    Deterministic synthetic dataset: the same (rows, width, seed) always gives
+    the same frame
+
+    Mixes numeric, categorical, ISO date strings, date strings with garbage,
+    messy free text, booleans and a skewed column with outliers. About
+    `null_rate` of the non-integer values are nulls and `duplicate_rate` of
+    the rows are exact duplicates of earlier rows.
+    """
+    rng = np.random.default_rng(seed)
+    unique_rows = rows - int(rows * duplicate_rate)
+    columns = {}
+
+    for i in range(width):
+        kind = COLUMN_KINDS[i % len(COLUMN_KINDS)]
+        name = f"{kind}_{i // len(COLUMN_KINDS)}"
+        columns[name] = _column(kind, unique_rows, rng)
+
+    df = pd.DataFrame(columns)
+
+    # Nulls everywhere except the integer id-like columns
+    for name in df.columns:
+        if name.startswith("int_"):
+            continue
+        mask = rng.random(unique_rows) < null_rate
+        df[name] = df[name].astype(object).where(~mask, None) if df[name].dtype == bool else df[name].mask(mask)
+
+    if rows > unique_rows:
+        duplicates = df.iloc[rng.integers(0, unique_rows, rows - unique_rows)]
+        df = pd.concat([df, duplicates], ignore_index=True)
+
+    return df
+
+
+def _column(kind: str, n: int, rng: np.random.Generator):
+    if kind == "int":
+        return rng.integers(0, 1_000_000, n)
+    if kind == "float":
+        return rng.normal(100, 15, n).round(3)
+    if kind == "category":
+        return _CATEGORIES[rng.integers(0, len(_CATEGORIES), n)]
+    if kind == "date":
+        days = rng.integers(0, 3650, n)
+        return (np.datetime64("2015-01-01") + days.astype("timedelta64[D]")).astype(str)
+    if kind == "messy_date":
+        seconds = rng.integers(0, 3650 * 86400, n)
+        values = (np.datetime64("2015-01-01T00:00:00") + seconds.astype("timedelta64[s]")).astype(str)
+        values = np.char.replace(values, "T", " ")
+        garbage = rng.random(n) < 0.03
+        values[garbage] = "unknown"
+        return values
+    if kind == "messy_string":
+        return _MESSY_STRINGS[rng.integers(0, len(_MESSY_STRINGS), n)]
+    if kind == "bool":
+        return rng.random(n) < 0.5
+    if kind == "skewed":
+        values = rng.lognormal(3, 1, n).round(2)
+        outliers = rng.random(n) < 0.01
+        values[outliers] *= 100
+        return values
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+def write_dataset(df: pd.DataFrame, fmt: str, path: str) -> str:
+    """Write df in one of FORMATS (txt is tab-separated). Returns the path."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "txt":
+        df.to_csv(path, index=False, sep="\t")
+    elif fmt == "json":
+        # A list of records, the shape parse_file expects
+        df.to_json(path, orient="records", force_ascii=False)
+    elif fmt == "xlsx":
+        if len(df) > EXCEL_MAX_ROWS:
+            raise ValueError(f"xlsx holds at most {EXCEL_MAX_ROWS} rows")
+        df.to_excel(path, index=False)
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+    return path
+
+
+def dataset_path(data_dir: str, rows: int, width: int, seed: int, fmt: str) -> str:
+    return os.path.join(data_dir, f"synthetic_r{rows}_w{width}_s{seed}.{fmt}")
+
+
+def ensure_datasets(data_dir: str, rows: int, width: int, seed: int, formats: List[str]) -> dict:
+    """Generate (or reuse) the dataset files for one size/width. Returns {format: path}."""
+    paths = {}
+    df = None
+    for fmt in formats:
+        path = dataset_path(data_dir, rows, width, seed, fmt)
+        if not os.path.exists(path):
+            if df is None:
+                df = generate_dataframe(rows, width, seed)
+            write_dataset(df, fmt, path)
+        paths[fmt] = path
+    return paths
@@ -0,0 +1,210 @@
+"""
+Benchmark the processing pipeline stages on synthetic datasets
+
+    cd backend
+    python -m benchmarks.run --sizes 10k,1m,10m --widths 8,32 --output benchmarks/results/baseline.json
+
+Each function is timed `--repeat` times on the same input; the median is the
+number to compare (see benchmarks/compare.py).
+"""
+import os
+import sys
+import gc
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.datasets import FORMATS, EXCEL_MAX_ROWS, ensure_datasets
+from app.utils.file_parser import parse_file, auto_parse_dates
+from app.utils.dtype_optimizer import optimize_dtypes
+from app.utils.data_cleaner import clean_dataframe
+from app.utils.column_profile import ColumnProfile
+from app.utils.row_fingerprint import duplicate_mask
+from app.services.processing_service import PIPELINE_VERSION, generate_statistics
+from app.services.chart_service import generate_charts_fallback
+from app.services.analytics_service import (
+    generate_correlation_matrix,
+    detect_outliers,
+    detect_anomalies,
+    generate_trends
+)
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# JSON is parsed whole by pandas; beyond this it mostly measures swap
+JSON_MAX_ROWS = 1_000_000
+
+
+def parse_size(value: str) -> int:
+    """'10k' -> 10_000, '1m' -> 1_000_000, '2500' -> 2500"""
+    value = value.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    if multiplier > 1:
+        value = value[:-1]
+    return int(float(value) * multiplier)
+
+
+def time_call(func: Callable[[], Any], repeat: int, setup: Callable[[], Any] = None) -> Dict[str, Any]:
+    """
+    Time func() `repeat` times. If `setup` is given, its (untimed) result is
+    passed to func instead, for functions that mutate their input.
+    """
+    runs = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        gc.collect()
+        started = time.perf_counter()
+        func(arg) if setup is not None else func()
+        runs.append(time.perf_counter() - started)
+    return {
+        "runs_s": [round(r, 6) for r in runs],
+        "median_s": round(statistics.median(runs), 6),
+        "min_s": round(min(runs), 6)
+    }
+
+
+def _record(results: List[Dict[str, Any]], name: str, rows: int, width: int, fmt: str, timing: Dict[str, Any]) -> None:
+    median = timing["median_s"]
+    timing["rows_per_sec"] = round(rows / median, 1) if median > 0 else None
+    results.append({"function": name, "rows": rows, "width": width, "format": fmt, **timing})
+    print(f"  {name:<28} {fmt:<5} median {median * 1000:10.2f} ms  ({timing['rows_per_sec']} rows/s)")
+
+
+def _skip(results: List[Dict[str, Any]], name: str, rows: int, width: int, fmt: str, reason: str) -> None:
+    results.append({"function": name, "rows": rows, "width": width, "format": fmt, "skipped": reason})
+    print(f"  {name:<28} {fmt:<5} skipped: {reason}")
+
+
+def bench_case(rows: int, width: int, formats: List[str], repeat: int, seed: int, data_dir: str,
+               include_large_json: bool) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    print(f"rows={rows} width={width}")
+
+    usable = []
+    for fmt in formats:
+        if fmt == "xlsx" and rows > EXCEL_MAX_ROWS:
+            _skip(results, "parse_file", rows, width, fmt, f"xlsx holds at most {EXCEL_MAX_ROWS} rows")
+        elif fmt == "json" and rows > JSON_MAX_ROWS and not include_large_json:
+            _skip(results, "parse_file", rows, width, fmt, f"over {JSON_MAX_ROWS} rows (--include-large-json)")
+        else:
+            usable.append(fmt)
+
+    # CSV is always generated: the per-function benchmarks below run on it
+    paths = ensure_datasets(data_dir, rows, width, seed, sorted(set(usable) | {"csv"}))
+
+    for fmt in usable:
+        _record(results, "parse_file", rows, width, fmt,
+                time_call(lambda: parse_file(paths[fmt], parse_dates=False), repeat))
+
+    df_raw = parse_file(paths["csv"], parse_dates=False)
+
+    # Same order and inputs as the in-memory pipeline (processing_service)
+    _record(results, "auto_parse_dates", rows, width, "csv",
+            time_call(auto_parse_dates, repeat, setup=df_raw.copy))
+    df = auto_parse_dates(df_raw.copy())
+
+    _record(results, "optimize_dtypes", rows, width, "csv", time_call(lambda: optimize_dtypes(df), repeat))
+    df, _ = optimize_dtypes(df)
+
+    _record(results, "ColumnProfile", rows, width, "csv", time_call(lambda: ColumnProfile(df), repeat))
+    profile = ColumnProfile(df)
+
+    _record(results, "duplicate_mask", rows, width, "csv", time_call(lambda: duplicate_mask(df), repeat))
+    _record(results, "detect_anomalies", rows, width, "csv",
+            time_call(lambda: detect_anomalies(df, profile), repeat))
+    _record(results, "clean_dataframe", rows, width, "csv",
+            time_call(clean_dataframe, repeat, setup=df.copy))
+
+    df_cleaned, _ = clean_dataframe(df.copy())
+    cleaned_profile = ColumnProfile(df_cleaned)
+
+    for name, func in [
+        ("generate_statistics", lambda: generate_statistics(df_cleaned, cleaned_profile)),
+        ("generate_correlation_matrix", lambda: generate_correlation_matrix(df_cleaned)),
+        ("detect_outliers", lambda: detect_outliers(df_cleaned, cleaned_profile)),
+        ("generate_trends", lambda: generate_trends(df_cleaned)),
+        ("generate_charts_fallback", lambda: generate_charts_fallback(df_cleaned, cleaned_profile))
+    ]:
+        _record(results, name, rows, width, "csv", time_call(func, repeat))
+
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BENCHMARK_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "git_commit": commit,
+        "pipeline_version": PIPELINE_VERSION,
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def main(argv: List[str] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Benchmark the UnstructIQ processing pipeline")
+    parser.add_argument("--sizes", default="10k,1m,10m", help="Comma-separated row counts (k/m suffixes allowed)")
+    parser.add_argument("--widths", default="8,32", help="Comma-separated column counts")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="Comma-separated input formats for parse_file")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per function")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset generator seed")
+    parser.add_argument("--data-dir", default=os.path.join(BENCHMARK_DIR, "data"),
+                        help="Where generated datasets are kept (reused across runs)")
+    parser.add_argument("--output", default=None, help="Results JSON (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--include-large-json", action="store_true",
+                        help=f"Also parse JSON datasets over {JSON_MAX_ROWS} rows")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    widths = [int(w) for w in args.widths.split(",") if w.strip()]
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"Unknown formats: {', '.join(sorted(unknown))}. Available: {', '.join(FORMATS)}")
+
+    report = {
+        "environment": environment(),
+        "config": {
+            "sizes": sizes,
+            "widths": widths,
+            "formats": formats,
+            "repeat": args.repeat,
+            "seed": args.seed
+        },
+        "results": []
+    }
+    for rows in sizes:
+        for width in widths:
+            report["results"].extend(
+                bench_case(rows, width, formats, args.repeat, args.seed, args.data_dir, args.include_large_json)
+            )
+
+    output = args.output or os.path.join(
+        BENCHMARK_DIR, "results", f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
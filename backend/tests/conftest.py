@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.config import settings
+from app.services import cache_service, job_store, llm_cache
+
+
+@pytest.fixture
+def data_dirs(tmp_path, monkeypatch):
+    """Upload, processed and cache directories and the job database under tmp_path"""
+    upload_dir, processed_dir, cache_dir = tmp_path / "uploads", tmp_path / "processed", tmp_path / "cache"
+    for path in (upload_dir, processed_dir, cache_dir):
+        path.mkdir()
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(upload_dir))
+    monkeypatch.setattr(settings, "PROCESSED_DIR", str(processed_dir))
+    monkeypatch.setattr(settings, "RESULT_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(cache_service, "ENTRIES_DIR", str(cache_dir / "entries"))
+    monkeypatch.setattr(cache_service, "STATS_PATH", str(cache_dir / "stats.json"))
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_DIR", str(cache_dir / "llm"))
+    monkeypatch.setattr(settings, "JOB_STORE_PATH", str(tmp_path / "jobs.db"))
+    # Connections are cached per thread, so start without them
+    monkeypatch.setattr(job_store, "_local", type(job_store._local)())
+    yield tmp_path
+    conn = getattr(job_store._local, "conn", None)
+    if conn is not None:
+        conn.close()
+
+
+def sales_frame(rows: int = 3000, seed: int = 1) -> pd.DataFrame:
+    """Mixed-type frame with missing amounts, like a typical upload"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "order_id": np.arange(rows),
+        "amount": rng.normal(100, 10, rows).round(2),
+        "qty": rng.integers(1, 10, rows),
+        "region": rng.choice(["north", "south", "east", "west"], rows),
+        "order_date": pd.date_range("2024-01-01", periods=rows, freq="h").strftime("%Y-%m-%d %H:%M:%S")
+    })
+    df.loc[rng.choice(rows, rows // 30, replace=False), "amount"] = np.nan
+    return df
+
+
+@pytest.fixture
+def sales_csv(tmp_path):
+    """sales_frame written as CSV, with its first 50 rows repeated at the end"""
+    df = sales_frame()
+    path = tmp_path / "sales.csv"
+    pd.concat([df, df.iloc[:50]]).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def sales_df():
+    return sales_frame()
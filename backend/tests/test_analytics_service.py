@@ -0,0 +1,156 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from app.config import settings
+from app.services.analytics_service import detect_outliers, generate_correlation_matrix, outlier_bounds
+
+
+@pytest.fixture
+def numeric_frame():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=2_000)
+    return pd.DataFrame({
+        "x": x,
+        "follows_x": 2 * x + rng.normal(scale=0.1, size=2_000),
+        "against_x": -x + rng.normal(scale=0.1, size=2_000),
+        "noise": rng.normal(size=2_000),
+        "label": rng.choice(["a", "b"], 2_000)
+    })
+
+
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def test_correlation_matches_pandas(numeric_frame, method):
+    report = generate_correlation_matrix(numeric_frame, method=method)
+    expected = numeric_frame.select_dtypes("number").corr(method=method)
+
+    assert report["method"] == method
+    assert report["columns"] == expected.columns.tolist()
+    assert np.allclose(np.array(report["matrix"], dtype=float), expected.round(settings.CORRELATION_DECIMALS), atol=1e-3)
+
+
+def test_correlation_with_nulls_uses_pairwise_complete_rows(numeric_frame):
+    numeric_frame.loc[::7, "noise"] = np.nan
+    report = generate_correlation_matrix(numeric_frame)
+    expected = numeric_frame.select_dtypes("number").corr()
+
+    assert np.allclose(np.array(report["matrix"], dtype=float), expected.round(settings.CORRELATION_DECIMALS), atol=1e-3)
+
+
+def test_strong_pairs_strongest_first(numeric_frame, monkeypatch):
+    monkeypatch.setattr(settings, "CORRELATION_THRESHOLD", 0.7)
+    report = generate_correlation_matrix(numeric_frame)
+
+    pairs = [(pair["col1"], pair["col2"], pair["strength"]) for pair in report["pairs"]]
+    assert set(pairs) == {
+        ("x", "follows_x", "strong positive"),
+        ("x", "against_x", "strong negative"),
+        ("follows_x", "against_x", "strong negative")
+    }
+    strengths = [abs(pair["correlation"]) for pair in report["pairs"]]
+    assert strengths == sorted(strengths, reverse=True)
+    assert report["strong_pairs_total"] == 3
+
+    monkeypatch.setattr(settings, "CORRELATION_TOP_K", 1)
+    assert len(generate_correlation_matrix(numeric_frame)["pairs"]) == 1
+
+
+def test_constant_column_has_no_correlation(numeric_frame):
+    numeric_frame["constant"] = 5.0
+    matrix = generate_correlation_matrix(numeric_frame)["matrix"]
+
+    assert all(value is None for value in matrix[-1])
+
+
+def test_large_frames_are_sampled(numeric_frame, monkeypatch):
+    monkeypatch.setattr(settings, "CORRELATION_SAMPLE_ROWS", 500)
+    report = generate_correlation_matrix(numeric_frame)
+
+    assert report["sampled_rows"] == 500
+    assert abs(report["pairs"][0]["correlation"]) > 0.95
+
+
+def test_wide_matrices_are_left_out(numeric_frame, monkeypatch):
+    monkeypatch.setattr(settings, "CORRELATION_MATRIX_MAX_COLUMNS", 3)
+    report = generate_correlation_matrix(numeric_frame)
+
+    assert report["matrix"] is None
+    assert report["pairs"]
+
+
+def test_fewer_than_two_numeric_columns(numeric_frame):
+    assert generate_correlation_matrix(numeric_frame[["x", "label"]]) is None
+
+
+def _expected_bounds(values: pd.Series, method: str):
+    if method == "iqr":
+        q25, q75 = values.quantile(0.25), values.quantile(0.75)
+        spread = settings.OUTLIER_IQR_MULTIPLIER * (q75 - q25)
+        return q25 - spread, q75 + spread
+    if method == "zscore":
+        spread = settings.OUTLIER_ZSCORE_THRESHOLD * values.std()
+        return values.mean() - spread, values.mean() + spread
+    median = values.median()
+    spread = settings.OUTLIER_MAD_THRESHOLD * (values - median).abs().median() / 0.6745
+    return median - spread, median + spread
+
+
+@pytest.fixture
+def skewed_frame():
+    rng = np.random.default_rng(1)
+    values = rng.normal(100, 10, size=1_000)
+    values[[0, 1, 2]] = [400, -250, 1_000]
+    with_nulls = rng.normal(size=1_000)
+    with_nulls[::10] = np.nan
+    with_nulls[1] = 50
+    return pd.DataFrame({"values": values, "with_nulls": with_nulls, "flat": 1.0})
+
+
+@pytest.mark.parametrize("method", ["iqr", "zscore", "mad"])
+def test_outliers_match_reference(skewed_frame, method):
+    report = detect_outliers(skewed_frame, method=method)
+
+    for col in ("values", "with_nulls"):
+        values = skewed_frame[col]
+        lower, upper = _expected_bounds(values, method)
+        expected = values[(values < lower) | (values > upper)]
+
+        assert report[col]["method"] == method
+        assert report[col]["lower_bound"] == pytest.approx(lower)
+        assert report[col]["upper_bound"] == pytest.approx(upper)
+        assert report[col]["count"] == len(expected)
+        assert report[col]["percentage"] == round(len(expected) / len(values) * 100, 2)
+        assert report[col]["outlier_values"] == expected.tolist()[:10]
+
+
+@pytest.mark.parametrize("method", ["iqr", "zscore", "mad"])
+def test_extreme_values_are_flagged_and_nulls_never_are(skewed_frame, method):
+    report = detect_outliers(skewed_frame, method=method)
+
+    assert {400, -250, 1_000} <= set(report["values"]["outlier_values"])
+    assert 50 in report["with_nulls"]["outlier_values"]
+    assert not any(np.isnan(value) for value in report["with_nulls"]["outlier_values"])
+    # A constant column has no spread, so nothing in it is an outlier
+    assert "flat" not in report
+
+
+@pytest.mark.parametrize("method", ["iqr", "zscore", "mad"])
+def test_empty_and_infinite_columns_in_parallel_without_warnings(skewed_frame, method):
+    frame = skewed_frame.assign(
+        empty=np.nan,
+        infinite=np.where(np.arange(len(skewed_frame)) % 2, np.inf, -np.inf)
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            reports = list(pool.map(lambda _: detect_outliers(frame, method=method), range(8)))
+
+    assert all(report == reports[0] for report in reports)
+    assert "empty" not in reports[0]
+    assert {400, -250, 1_000} <= set(reports[0]["values"]["outlier_values"])
+
+
+def test_unknown_outlier_method():
+    with pytest.raises(ValueError):
+        outlier_bounds({"q25": 0, "q75": 1}, method="percentile")
@@ -0,0 +1,106 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.utils.artifact_store import CLEANED_DATA_FILE, CleanedDataWriter, iter_csv, read_cleaned_rows, write_cleaned_data
+
+
+@pytest.fixture
+def cleaned(sales_df):
+    return sales_df.assign(
+        order_date=pd.to_datetime(sales_df["order_date"]),
+        region=sales_df["region"].astype("category"),
+        shipped=np.arange(len(sales_df)) % 3 == 0
+    )
+
+
+def test_round_trip_keeps_values_and_dtypes(cleaned, tmp_path):
+    path = str(tmp_path / "cleaned.parquet")
+    write_cleaned_data(cleaned, path)
+
+    pd.testing.assert_frame_equal(pd.read_parquet(path), cleaned)
+    pd.testing.assert_frame_equal(pd.read_parquet(path, columns=["qty", "region"]), cleaned[["qty", "region"]])
+
+
+def test_row_groups_follow_the_setting(cleaned, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PARQUET_ROW_GROUP_SIZE", 1000)
+    path = str(tmp_path / "cleaned.parquet")
+    write_cleaned_data(cleaned, path)
+
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups == 3
+    assert [metadata.row_group(i).num_rows for i in range(3)] == [1000, 1000, 1000]
+
+
+
+@pytest.mark.parametrize("offset, limit", [(0, 10), (990, 20), (1500, 1000), (2995, 100), (5000, 10)])
+def test_row_window_reads_match_slicing(cleaned, tmp_path, monkeypatch, offset, limit):
+    monkeypatch.setattr(settings, "PARQUET_ROW_GROUP_SIZE", 1000)
+    path = str(tmp_path / "cleaned.parquet")
+    write_cleaned_data(cleaned, path)
+
+    page, total_rows = read_cleaned_rows(path, offset, limit, ["order_id", "amount"])
+
+    assert total_rows == len(cleaned)
+    pd.testing.assert_frame_equal(
+        page,
+        cleaned[["order_id", "amount"]].iloc[offset:offset + limit].reset_index(drop=True)
+    )
+
+def test_mixed_object_columns_are_stored_as_strings(tmp_path):
+    path = str(tmp_path / "cleaned.parquet")
+    write_cleaned_data(pd.DataFrame({"code": [1, "A2", None, 3.5]}), path)
+
+    assert pd.read_parquet(path)["code"].tolist() == ["1", "A2", None, "3.5"]
+
+
+def test_writer_appends_chunks(cleaned, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PARQUET_ROW_GROUP_SIZE", 500)
+    path = str(tmp_path / "cleaned.parquet")
+    plain = cleaned.astype({"region": object}).assign(note=None)
+
+    with CleanedDataWriter(path) as writer:
+        for start in range(0, len(plain), 800):
+            writer.write(plain.iloc[start:start + 800])
+        # A column that was all null in the first chunk is typed as text
+        writer.write(plain.iloc[:10].assign(note="checked"))
+
+    result = pd.read_parquet(path)
+    assert len(result) == len(plain) + 10
+    assert result["note"].iloc[-1] == "checked"
+    pd.testing.assert_frame_equal(result.iloc[:len(plain)], plain.astype({"note": object}))
+
+
+def test_csv_export_matches_to_csv(cleaned, tmp_path):
+    path = str(tmp_path / "cleaned.parquet")
+    write_cleaned_data(cleaned, path)
+
+    exported = b"".join(iter_csv(path, batch_size=700))
+
+    assert exported == cleaned.to_csv(index=False).encode("utf-8")
+    write_cleaned_data(cleaned.iloc[:0], path)
+    assert b"".join(iter_csv(path)) == b"order_id,amount,qty,region,order_date,shipped\n"
+
+
+def test_data_page_route(cleaned, data_dirs, monkeypatch):
+    monkeypatch.setattr(settings, "DATA_PAGE_MAX_ROWS", 100)
+    processed_dir = os.path.join(settings.PROCESSED_DIR, "job")
+    os.makedirs(processed_dir)
+    write_cleaned_data(cleaned, os.path.join(processed_dir, CLEANED_DATA_FILE))
+    client = TestClient(app)
+
+    page = client.get("/api/data/job", params={"offset": 10, "limit": 2, "columns": "order_id, qty"}).json()
+    assert page["total_rows"] == len(cleaned)
+    assert page["columns"] == ["order_id", "qty"]
+    assert page["data"] == [
+        {"order_id": str(row.order_id), "qty": str(row.qty)} for row in cleaned.iloc[10:12].itertuples()
+    ]
+
+    assert client.get("/api/data/job", params={"columns": "missing"}).status_code == 400
+    assert client.get("/api/data/job", params={"limit": 101}).status_code == 400
+    assert client.get("/api/data/job", params={"offset": -1}).status_code == 400
+    assert client.get("/api/data/other").status_code == 404
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from app.utils.binning import grid_density, histogram
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=20_000)
+    y = 0.5 * x + rng.normal(size=20_000)
+    return x, y
+
+
+def test_grid_density_matches_histogram2d(points):
+    x, y = points
+    x_centres, y_centres, counts = grid_density(x, y, 20)
+
+    expected, x_edges, y_edges = np.histogram2d(x, y, bins=20)
+    cells = np.nonzero(expected)
+    assert counts.sum() == len(x)
+    assert np.array_equal(counts, expected[cells].astype(np.int64))
+    assert np.allclose(x_centres, ((x_edges[:-1] + x_edges[1:]) / 2)[cells[0]])
+    assert np.allclose(y_centres, ((y_edges[:-1] + y_edges[1:]) / 2)[cells[1]])
+
+
+def test_grid_density_skips_non_finite_pairs(points):
+    x, y = points
+    x, y = x.copy(), y.copy()
+    x[:100] = np.nan
+    y[100:150] = np.inf
+
+    assert grid_density(x, y, 10)[2].sum() == len(x) - 150
+    assert [len(part) for part in grid_density(x[:100], y[:100], 10)] == [0, 0, 0]
+
+
+def test_grid_density_of_a_constant_column():
+    x_centres, y_centres, counts = grid_density(np.full(10, 3.0), np.arange(10.0), 5)
+
+    assert np.all(x_centres == pytest.approx(3.0, abs=0.5))
+    assert counts.tolist() == [2, 2, 2, 2, 2]
+
+
+def test_histogram_matches_numpy(points):
+    x, _ = points
+    counts, edges = histogram(x, 30)
+    expected_counts, expected_edges = np.histogram(x, bins=30)
+
+    assert np.array_equal(counts, expected_counts)
+    assert np.allclose(edges, expected_edges)
+
+
+def test_histogram_skips_nan_and_uses_the_given_range(points):
+    x, _ = points
+    with_nan = np.append(x, [np.nan, np.nan])
+
+    assert histogram(with_nan, 30)[0].sum() == len(x)
+    counts, edges = histogram(with_nan, 10, value_range=(-1.0, 1.0))
+    assert edges[0] == -1 and edges[-1] == 1
+    assert counts.sum() == np.count_nonzero((x >= -1) & (x <= 1))
+
+
+def test_histogram_of_no_finite_values():
+    counts, edges = histogram(np.array([np.nan, np.inf]), 10)
+
+    assert len(counts) == 0 and len(edges) == 0
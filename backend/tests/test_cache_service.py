@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import pytest
+from fastapi.testclient import TestClient
+from app.api import routes
+from app.config import settings
+from app.services import cache_service, job_store
+from app.services.cache_service import ANALYSIS_SETTINGS, evict, get_cache_stats, load_cached_results, make_cache_key, store_results
+from app.main import app
+from app.services.processing_service import process_file
+
+
+def _processed_job(job_id: str, size: int = 10) -> str:
+    processed_dir = os.path.join(settings.PROCESSED_DIR, job_id)
+    os.makedirs(processed_dir)
+    with open(os.path.join(processed_dir, "results.json"), "w") as f:
+        json.dump({"job_id": job_id, "status": "completed"}, f)
+    with open(os.path.join(processed_dir, "cleaned_data.csv"), "w") as f:
+        f.write("x" * size)
+    return processed_dir
+
+
+def test_cache_key_changes_with_every_input():
+    key = make_cache_key("hash", "prompt", "1")
+
+    assert key == make_cache_key("hash", "prompt", "1")
+    assert len({
+        key,
+        make_cache_key("other", "prompt", "1"),
+        make_cache_key("hash", "other prompt", "1"),
+        make_cache_key("hash", "prompt", "2")
+    }) == 4
+    assert make_cache_key("hash", None, "1") == make_cache_key("hash", "", "1")
+
+
+
+def _changed(value):
+    if isinstance(value, bool):
+        return not value
+    if isinstance(value, (int, float)):
+        return value + 1
+    if isinstance(value, (list, tuple)):
+        return [*value, "other"]
+    return f"{value or ''}other"
+
+
+def test_cache_key_changes_with_skipped_stages():
+    assert make_cache_key("hash", "", "1", ["trends", "outliers"]) == make_cache_key("hash", "", "1", ["outliers", "trends"])
+    assert make_cache_key("hash", "", "1", ["trends"]) != make_cache_key("hash", "", "1")
+
+
+@pytest.mark.parametrize("name", ANALYSIS_SETTINGS)
+def test_cache_key_changes_with_analysis_settings(name, monkeypatch):
+    key = make_cache_key("hash", "", "1")
+    monkeypatch.setattr(settings, name, _changed(getattr(settings, name)))
+
+    assert make_cache_key("hash", "", "1") != key
+
+def test_cache_key_changes_with_the_gemini_model(monkeypatch):
+    key = make_cache_key("hash", "", "1")
+    monkeypatch.setattr(settings, "GEMINI_MODEL", f"{settings.GEMINI_MODEL}-other")
+
+    assert make_cache_key("hash", "", "1") != key
+
+
+def test_miss_then_hit(data_dirs):
+    key = make_cache_key("hash", "", "1")
+    target = os.path.join(settings.PROCESSED_DIR, "new")
+
+    assert load_cached_results(key, "new", target) is None
+    store_results(key, _processed_job("old"))
+    results = load_cached_results(key, "new", target)
+
+    assert results["job_id"] == "new"
+    assert results["cache"] == {"hit": True, "source_job_id": "old", "key": key}
+    assert {"cleaned_data.csv", "results.json"} <= set(os.listdir(target))
+    with open(os.path.join(target, "results.json")) as f:
+        assert json.load(f)["job_id"] == "new"
+    stats = get_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_least_recently_used_entries_are_evicted(data_dirs):
+    for age, name in enumerate(("newest", "middle", "oldest")):
+        store_results(name, _processed_job(name, size=1000))
+        entry = os.path.join(cache_service.ENTRIES_DIR, name)
+        os.utime(entry, (1_000_000 - age, 1_000_000 - age))
+
+    assert evict(max_bytes=2500) == 1
+    assert sorted(os.listdir(cache_service.ENTRIES_DIR)) == ["middle", "newest"]
+    assert get_cache_stats()["evictions"] == 1
+
+
+def test_identical_upload_skips_processing(data_dirs):
+    path = data_dirs / "uploads" / "sales.csv"
+    path.write_text("region,amount\nnorth,10\nsouth,20\nnorth,30\n")
+    for job_id in ("first", "second"):
+        job_store.create_job({
+            "job_id": job_id, "status": "pending", "file_path": str(path), "file_hash": "abc", "prompt": "",
+            "created_at": "2026-01-01T10:00:00"
+        })
+
+    first = process_file("first")
+    second = process_file("second")
+
+    assert "cache" not in first
+    assert second["cache"]["source_job_id"] == "first"
+    assert second["statistics"] == first["statistics"]
+    assert job_store.get_job("second")["cache_hit"] is True
+
+
+def test_cache_stats_are_read_off_the_event_loop(data_dirs, monkeypatch):
+    loops = []
+
+    def stats_in_worker(stats):
+        def read():
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                pass
+            return stats()
+        return read
+
+    monkeypatch.setattr(routes, "get_cache_stats", stats_in_worker(routes.get_cache_stats))
+    monkeypatch.setattr(routes, "get_llm_cache_stats", stats_in_worker(routes.get_llm_cache_stats))
+
+    response = TestClient(app).get("/api/cache/stats")
+
+    assert response.status_code == 200
+    assert "llm" in response.json()
+    assert loops == []
@@ -0,0 +1,88 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from app.utils.column_profile import ColumnProfile
+
+
+@pytest.fixture
+def frame(sales_df):
+    return sales_df.assign(
+        empty=np.nan,
+        constant=7,
+        flag=np.where(np.arange(len(sales_df)) % 2, "yes", "no")
+    )
+
+
+def test_numeric_summary_matches_pandas(frame):
+    profile = ColumnProfile(frame)
+    numeric = frame.select_dtypes("number")
+
+    assert profile.numeric_columns == numeric.columns.tolist()
+    summary = profile.numeric_summary
+    assert np.allclose(summary["count"], numeric.count(), equal_nan=True)
+    assert np.allclose(summary["mean"], numeric.mean(), equal_nan=True)
+    assert np.allclose(summary["std"], numeric.std(), equal_nan=True)
+    assert np.allclose(summary["min"], numeric.min(), equal_nan=True)
+    assert np.allclose(summary["max"], numeric.max(), equal_nan=True)
+    for column, q in (("q25", 0.25), ("median", 0.5), ("q75", 0.75)):
+        assert np.allclose(summary[column], numeric.quantile(q), equal_nan=True)
+
+
+def test_all_null_columns_are_profiled_without_warnings(frame):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        profile = ColumnProfile(frame)
+
+    assert profile.null_counts["empty"] == len(frame)
+    assert profile.numeric_summary.loc["empty"].drop("count").isna().all()
+
+
+
+def test_sparse_and_infinite_columns_in_parallel_without_warnings(frame):
+    frame = frame.assign(
+        single=np.where(np.arange(len(frame)) == 0, 1.0, np.nan),
+        infinite=np.where(np.arange(len(frame)) % 2, np.inf, -np.inf)
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            profiles = list(pool.map(ColumnProfile, [frame] * 8))
+
+    numeric = frame.select_dtypes("number")
+    with np.errstate(invalid="ignore"):
+        mean, std = numeric.mean(), numeric.std()
+    for profile in profiles:
+        summary = profile.numeric_summary
+        assert np.isnan(summary.loc["single", "std"])
+        assert summary.loc["single", "median"] == 1.0
+        assert np.allclose(summary["mean"], mean, equal_nan=True)
+        assert np.allclose(summary["std"], std, equal_nan=True)
+
+def test_column_kinds_and_counts(frame):
+    profile = ColumnProfile(frame)
+
+    assert profile.row_count == len(frame)
+    assert profile.categorical_columns == ["region", "order_date", "flag"]
+    assert profile.missing_values() == frame.isnull().sum().to_dict()
+    assert profile.nunique("region") == 4
+    assert profile.value_counts("flag").to_dict() == frame["flag"].value_counts().to_dict()
+    assert profile.value_counts("flag") is profile.value_counts("flag")
+
+
+def test_has_single_value(frame):
+    profile = ColumnProfile(frame)
+
+    assert profile.has_single_value("constant")
+    assert not profile.has_single_value("amount")
+    assert not profile.has_single_value("empty")
+    assert not profile.has_single_value("flag")
+    assert ColumnProfile(pd.DataFrame({"label": ["a", None, "a"]})).has_single_value("label")
+
+
+def test_numeric_stats(frame):
+    stats = ColumnProfile(frame).numeric_stats("amount")
+
+    assert stats["mean"] == pytest.approx(frame["amount"].mean())
+    assert stats["q75"] == pytest.approx(frame["amount"].quantile(0.75))
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from app.utils.downsampling import downsample, lttb_indices, minmax_indices
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 500) + rng.normal(scale=0.05, size=len(x))
+    # Single-point spikes a plain stride would skip
+    y[1234], y[7777] = 25, -25
+    return x, y
+
+
+def test_short_series_are_returned_whole(series):
+    x, y = series
+
+    assert np.array_equal(downsample(x[:50], y[:50], max_points=100, method="lttb"), np.arange(50))
+    assert np.array_equal(downsample(x[:50], y[:50], max_points=2, method="minmax"), np.arange(50))
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsampling_keeps_endpoints_and_peaks(series, method):
+    x, y = series
+    indices = downsample(x, y, max_points=500, method=method)
+
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert len(indices) <= 500
+    assert {1234, 7777} <= set(indices.tolist())
+
+
+def test_lttb_returns_exactly_n_out_points(series):
+    x, y = series
+
+    assert len(lttb_indices(x, y, 300)) == 300
+
+
+def test_lttb_picks_one_point_per_bucket(series):
+    x, y = series
+    indices = lttb_indices(x, y, 12)
+    edges = np.linspace(1, len(y) - 1, 11).astype(np.int64)
+
+    for i, index in enumerate(indices[1:-1]):
+        assert edges[i] <= index < edges[i + 1]
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    y = np.array([0, 5, -1, 3, 9, 2, 2, 8, -4, 1], dtype=np.float64)
+    indices = minmax_indices(y, 6)
+
+    # Two buckets of five points: [0, 5, -1, 3, 9] and [2, 2, 8, -4, 1]
+    assert indices.tolist() == [0, 2, 4, 7, 8, 9]
+
+
+def test_unknown_method(series):
+    x, y = series
+
+    with pytest.raises(ValueError):
+        downsample(x, y, max_points=100, method="every_nth")
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.config import settings
+from app.utils.artifact_store import write_cleaned_data
+from app.utils.data_cleaner import clean_dataframe
+from app.utils.dtype_optimizer import ARROW_STRING, optimize_dtypes
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "region": pd.Series(rng.choice(["north", "south", "east"], 1_000)).where(rng.random(1_000) > 0.1),
+        "order_id": [f"order-{i}" for i in range(1_000)],
+        "quantity": rng.integers(0, 100, 1_000),
+        "price": rng.normal(50, 10, 1_000),
+        "mixed": [1, "a"] * 500
+    })
+
+
+def test_values_survive_optimization(frame):
+    optimized, report = optimize_dtypes(frame)
+
+    pd.testing.assert_frame_equal(optimized.astype(object), frame.astype(object), check_dtype=False)
+    assert report["memory_after_bytes"] < report["memory_before_bytes"]
+
+
+def test_column_conversions(frame):
+    optimized, report = optimize_dtypes(frame)
+
+    assert isinstance(optimized["region"].dtype, pd.CategoricalDtype)
+    assert optimized["order_id"].dtype == ARROW_STRING
+    assert optimized["quantity"].dtype == np.int8
+    # Floats keep their precision and mixed object columns are left alone
+    assert optimized["price"].dtype == np.float64
+    assert optimized["mixed"].dtype == object
+    assert set(report["conversions"]) == {"region", "order_id", "quantity"}
+
+
+def test_disabled_optimization_is_a_no_op(frame, monkeypatch):
+    monkeypatch.setattr(settings, "DTYPE_OPTIMIZATION_ENABLED", False)
+    optimized, report = optimize_dtypes(frame)
+
+    assert optimized is frame
+    assert report["conversions"] == {}
+    assert report["memory_after_bytes"] == report["memory_before_bytes"]
+
+
+def test_optimized_frame_cleans_and_round_trips(frame, tmp_path):
+    # Mixed object columns are stored as text, see artifact_store
+    frame = frame.drop(columns="mixed")
+    optimized, _ = optimize_dtypes(frame)
+    cleaned, _ = clean_dataframe(optimized)
+    reference, _ = clean_dataframe(frame)
+
+    path = str(tmp_path / "cleaned_data.parquet")
+    write_cleaned_data(cleaned, path)
+    restored = pd.read_parquet(path)
+
+    pd.testing.assert_frame_equal(restored.astype(object), reference.astype(object), check_dtype=False)
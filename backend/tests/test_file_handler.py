@@ -0,0 +1,62 @@
+import asyncio
+import hashlib
+import io
+import os
+import pytest
+from fastapi import HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.utils.file_handler import save_upload_file
+
+
+class RecordingFile(io.BytesIO):
+    """In-memory upload that records the size of every read"""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads = []
+
+    def read(self, size=-1):
+        self.reads.append(size)
+        return super().read(size)
+
+
+def _save(data: bytes, job_id: str = "job"):
+    upload = UploadFile(file=RecordingFile(data), filename="data.csv")
+    return upload.file, asyncio.run(save_upload_file(upload, job_id))
+
+
+def test_upload_is_written_in_chunks(data_dirs, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 1000)
+    data = b"a,b\n" + b"1,2\n" * 10_000
+
+    source, info = _save(data)
+
+    assert set(source.reads) == {1000}
+    assert info["file_size"] == len(data)
+    assert info["file_hash"] == hashlib.sha256(data).hexdigest()
+    with open(info["file_path"], "rb") as f:
+        assert f.read() == data
+
+
+def test_oversized_upload_stops_at_the_limit(data_dirs, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 1000)
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 5000)
+
+    with pytest.raises(HTTPException) as error:
+        _save(b"x" * 50_000)
+
+    assert error.value.status_code == 400
+    # The partial file and its job directory are removed
+    assert not os.path.exists(os.path.join(settings.UPLOAD_DIR, "job"))
+
+
+def test_upload_route_rejects_oversized_files(data_dirs, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 100)
+    client = TestClient(app)
+
+    response = client.post("/api/upload", files={"file": ("data.csv", b"a,b\n" + b"1,2\n" * 100, "text/csv")})
+
+    assert response.status_code == 400
+    assert os.listdir(settings.UPLOAD_DIR) == []
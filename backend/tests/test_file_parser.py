@@ -0,0 +1,117 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from app.config import settings
+from app.utils.file_parser import _infer_format, auto_parse_dates, get_data_preview, infer_datetime_formats
+
+
+@pytest.fixture(autouse=True)
+def fresh_format_cache():
+    _infer_format.cache_clear()
+    yield
+    _infer_format.cache_clear()
+
+
+def test_iso_and_day_first_dates_are_converted(sales_df):
+    sales_df["delivered"] = pd.date_range("2024-03-01", periods=len(sales_df), freq="D").strftime("%d/%m/%Y")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        df = auto_parse_dates(sales_df)
+
+    assert df.attrs["datetime_formats"] == {"order_date": "%Y-%m-%d %H:%M:%S", "delivered": "%d/%m/%Y"}
+    assert pd.api.types.is_datetime64_any_dtype(df["order_date"])
+    assert df["delivered"].iloc[0] == pd.Timestamp("2024-03-01")
+    assert df["delivered"].notna().all()
+
+
+def test_numbers_times_and_text_are_left_alone():
+    df = pd.DataFrame({
+        "downtime": np.arange(100),
+        "update_time": ["12:30"] * 100,
+        "date_note": ["shipped late"] * 100,
+        "year": [str(2000 + i % 20) for i in range(100)]
+    })
+
+    assert infer_datetime_formats(df) == {}
+
+
+def test_formats_are_inferred_in_parallel_without_warnings():
+    df = pd.DataFrame({
+        "day_first": ["13/01/2024", "02/01/2024"] * 50,
+        "month_first": ["01/13/2024", "01/02/2024"] * 50,
+        "compact": ["20240113", "20240201"] * 50,
+        "utc": ["2024-01-13T10:30:00Z"] * 100,
+        "mixed_offsets": ["2024-01-02T10:00:00+01:00", "2024-01-03T10:00:00+02:00"] * 50
+    })
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda column: infer_datetime_formats(df[[column]]), df.columns))
+
+    assert results == [
+        {"day_first": "%d/%m/%Y"},
+        {"month_first": "%m/%d/%Y"},
+        {"compact": "%Y%m%d"},
+        {"utc": "%Y-%m-%dT%H:%M:%S%z"},
+        {}
+    ]
+
+
+def test_column_needs_the_minimum_success_rate(monkeypatch):
+    values = ["2024-01-%02d" % (i % 28 + 1) if i % 4 else "unknown" for i in range(100)]
+    df = pd.DataFrame({"date": values})
+
+    monkeypatch.setattr(settings, "DATETIME_MIN_SUCCESS_RATE", 0.9)
+    assert infer_datetime_formats(df) == {}
+
+    _infer_format.cache_clear()
+    monkeypatch.setattr(settings, "DATETIME_MIN_SUCCESS_RATE", 0.7)
+    assert infer_datetime_formats(df) == {"date": "%Y-%m-%d"}
+    # Values that don't match the format become NaT
+    assert auto_parse_dates(df)["date"].isna().sum() == 25
+
+
+def test_given_formats_are_used_without_inference():
+    df = pd.DataFrame({"when": ["01/02/2024", "03/04/2024"]})
+
+    parsed = auto_parse_dates(df, formats={"when": "%m/%d/%Y"})
+
+    assert parsed["when"].tolist() == [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-03-04")]
+    assert parsed.attrs["datetime_formats"] == {"when": "%m/%d/%Y"}
+
+
+def _row_by_row(df):
+    """The serialization get_data_preview produced with iterrows"""
+    return [
+        {
+            col: None if pd.isna(value) else value.isoformat() if isinstance(value, pd.Timestamp) else str(value)
+            for col, value in row.items()
+        }
+        for _, row in df.iterrows()
+    ]
+
+
+def test_preview_matches_row_by_row_serialization():
+    df = pd.DataFrame({
+        "when": [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-02 10:30:00.25"), pd.NaT],
+        "when_utc": [pd.Timestamp("2024-01-02", tz="UTC"), pd.NaT, pd.Timestamp("2024-01-03 08:00", tz="UTC")],
+        "region": ["north", None, "south"],
+        "code": [1, "A2", None],
+        "amount": [1.5, np.nan, 3.0]
+    })
+
+    preview = get_data_preview(df, rows=2)
+
+    assert preview["columns"] == df.columns.tolist()
+    assert preview["total_rows"] == 3
+    assert preview["data"] == _row_by_row(df.head(2))
+
+
+def test_preview_keeps_integers_in_numeric_frames():
+    df = pd.DataFrame({"qty": [1, 2], "amount": [0.5, 1.0]})
+
+    assert get_data_preview(df)["data"] == [{"qty": "1", "amount": "0.5"}, {"qty": "2", "amount": "1.0"}]
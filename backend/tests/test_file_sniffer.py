@@ -0,0 +1,105 @@
+import pandas as pd
+import pytest
+from app.config import settings
+from app.utils.file_parser import parse_file
+from app.utils.file_sniffer import sniff_dialect, dialect_read_options, detect_encoding
+
+
+def _write(tmp_path, content: bytes, name: str = "data.csv") -> str:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+@pytest.mark.parametrize("delimiter", [",", ";", "\t", "|"])
+def test_delimiter(tmp_path, delimiter):
+    rows = ["name,city,score", "ann,oslo,1", "bob,rome,2", "cy,lima,3"]
+    path = _write(tmp_path, "\n".join(row.replace(",", delimiter) for row in rows).encode())
+
+    dialect = sniff_dialect(path)
+    assert dialect["delimiter"] == delimiter
+    assert dialect["has_header"]
+    assert dialect["column_count"] == 3
+
+
+def test_quoted_fields_with_delimiter_inside(tmp_path):
+    path = _write(tmp_path, b'id;note\n1;"a;b"\n2;"c;d"\n3;"e"\n')
+
+    dialect = sniff_dialect(path)
+    assert dialect["delimiter"] == ";"
+    assert dialect["quotechar"] == '"'
+    assert pd.read_csv(path, **dialect_read_options(dialect))["note"].tolist() == ["a;b", "c;d", "e"]
+
+
+def test_decimal_comma(tmp_path):
+    path = _write(tmp_path, "price;qty\n1.234,50;2\n3,25;1\n10,00;4\n".encode())
+
+    dialect = sniff_dialect(path)
+    assert dialect["decimal"] == ","
+    assert dialect["thousands"] == "."
+    assert pd.read_csv(path, **dialect_read_options(dialect))["price"].tolist() == [1234.5, 3.25, 10.0]
+
+
+def test_headerless_numeric_file(tmp_path):
+    path = _write(tmp_path, b"1,2.5,3\n4,5.5,6\n7,8.5,9\n10,11.5,12\n")
+
+    dialect = sniff_dialect(path)
+    assert not dialect["has_header"]
+    df = pd.read_csv(path, **dialect_read_options(dialect))
+    assert df.columns.tolist() == ["column_1", "column_2", "column_3"]
+    assert len(df) == 4
+
+
+@pytest.mark.parametrize("raw, truncated, expected", [
+    (b"\xef\xbb\xbfa,b", False, "utf-8-sig"),
+    (b"\xff\xfea\x00", False, "utf-16"),
+    ("café".encode("utf-8"), False, "utf-8"),
+    ("café".encode("latin-1"), False, "latin-1"),
+    # Sample cut in the middle of a two-byte character
+    ("ab é".encode("utf-8")[:-1], True, "utf-8"),
+])
+def test_detect_encoding(raw, truncated, expected):
+    assert detect_encoding(raw, truncated) == expected
+
+
+def test_latin1_file_round_trips(tmp_path):
+    path = _write(tmp_path, "city,value\nZürich,1\nGenève,2\n".encode("latin-1"))
+
+    dialect = sniff_dialect(path)
+    assert dialect["encoding"] == "latin-1"
+    assert pd.read_csv(path, **dialect_read_options(dialect))["city"].tolist() == ["Zürich", "Genève"]
+
+
+def test_only_the_sample_is_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SNIFF_SAMPLE_BYTES", 64)
+    path = _write(tmp_path, b"a,b\n" + b"1,2\n" * 1000)
+
+    dialect = sniff_dialect(path)
+    assert dialect["sample_bytes"] == 64
+    assert dialect["delimiter"] == ","
+
+
+def test_latin1_bytes_after_the_sample_are_parsed_in_one_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SNIFF_SAMPLE_BYTES", 64)
+    path = _write(tmp_path, b"city,value\n" + b"Paris,1\n" * 1000 + "Genève,2\n".encode("latin-1"))
+    reads = []
+    read_csv = pd.read_csv
+
+    def counting_read_csv(*args, **kwargs):
+        reads.append(kwargs["encoding"])
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", counting_read_csv)
+    df = parse_file(path, parse_dates=False)
+
+    assert reads == ["latin-1"]
+    assert df["city"].iloc[-1] == "Genève"
+
+
+def test_utf8_split_across_the_sample_boundary(tmp_path, monkeypatch):
+    # Byte 63 is the first half of the sixth "ü"
+    monkeypatch.setattr(settings, "SNIFF_SAMPLE_BYTES", 63)
+    content = "city,value\n" + "Zürich,1\n" * 100
+    path = _write(tmp_path, content.encode("utf-8"))
+
+    assert sniff_dialect(path)["encoding"] == "utf-8"
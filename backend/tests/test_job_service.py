@@ -0,0 +1,144 @@
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.services import job_service, job_store
+from app.services.processing_service import process_file
+
+
+@pytest.fixture
+def pool(data_dirs, monkeypatch):
+    """Threads instead of spawned processes, and jobs that run until released"""
+    release = threading.Event()
+    runs = []
+
+    def run_job(job_id):
+        runs.append(job_id)
+        release.wait(10)
+        if job_store.get_job(job_id).get("crash"):
+            raise RuntimeError("worker crashed")
+        return {"job_id": job_id, "status": "completed"}
+
+    finished = threading.Event()
+    on_job_done = job_service._on_job_done
+
+    def on_job_done_and_notify(job_id, future):
+        on_job_done(job_id, future)
+        finished.set()
+
+    monkeypatch.setattr(job_service, "_run_job", run_job)
+    monkeypatch.setattr(job_service, "_on_job_done", on_job_done_and_notify)
+    monkeypatch.setattr(job_service, "_executor", ThreadPoolExecutor(max_workers=2))
+    monkeypatch.setattr(job_service, "_active_jobs", {})
+    yield release, runs, finished
+    release.set()
+    job_service._executor.shutdown(wait=True)
+
+
+def _create_job(job_id, **metadata):
+    job_store.create_job({"job_id": job_id, "status": "uploaded", "created_at": datetime.now().isoformat(), **metadata})
+
+
+def test_submit_queues_the_job(pool):
+    release, runs, finished = pool
+    _create_job("a")
+
+    assert job_service.submit_job("a") == 1
+    assert job_store.get_job("a")["status"] == "pending"
+    assert job_service.get_queue_stats()["active_jobs"] == 1
+
+    release.set()
+    assert finished.wait(10)
+    assert runs == ["a"]
+    assert job_service.get_queue_stats()["active_jobs"] == 0
+
+
+def test_duplicate_submit_is_409(pool):
+    _create_job("a")
+    job_service.submit_job("a")
+
+    with pytest.raises(HTTPException) as error:
+        job_service.submit_job("a")
+    assert error.value.status_code == 409
+
+
+def test_full_queue_is_503(pool, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_QUEUED_JOBS", 1)
+    _create_job("a")
+    _create_job("b")
+    job_service.submit_job("a")
+
+    with pytest.raises(HTTPException) as error:
+        job_service.submit_job("b")
+    assert error.value.status_code == 503
+    assert job_store.get_job("b")["status"] == "uploaded"
+
+
+def test_crashed_worker_marks_the_job_failed(pool):
+    release, _, finished = pool
+    _create_job("a", crash=True)
+    job_service.submit_job("a")
+
+    release.set()
+    assert finished.wait(10)
+    metadata = job_store.get_job("a")
+    assert metadata["error"] == "worker crashed"
+
+
+def test_process_route_returns_202_then_409(pool):
+    _create_job("a")
+    client = TestClient(app)
+
+    response = client.post("/api/process/a")
+    assert response.status_code == 202
+    assert response.json()["status"] == "pending"
+    assert client.post("/api/process/a").status_code == 409
+    assert client.get("/api/status/a").json()["status"] == "pending"
+    assert client.post("/api/process/missing").status_code == 404
+
+
+def test_process_file_moves_the_job_to_completed(data_dirs):
+    path = data_dirs / "uploads" / "sales.csv"
+    path.write_text("region,amount\nnorth,10\nsouth,20\nnorth,30\n")
+    _create_job("a", status="pending", file_path=str(path), prompt="")
+
+    results = process_file("a")
+
+    assert results["status"] == "completed"
+    assert job_store.get_job("a")["status"] == "completed"
+
+
+def test_process_file_records_failures(data_dirs):
+    _create_job("a", status="pending", file_path=str(data_dirs / "missing.csv"), prompt="")
+
+    with pytest.raises(Exception):
+        process_file("a")
+    metadata = job_store.get_job("a")
+    assert metadata["status"] == "failed"
+    assert metadata["error"]
+
+
+def test_skipped_stages_keep_the_results_shape(data_dirs, monkeypatch):
+    monkeypatch.setattr(job_service, "_executor", ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(job_service, "_active_jobs", {})
+    path = data_dirs / "uploads" / "sales.csv"
+    path.write_text("region,amount\nnorth,10\nsouth,20\nnorth,30\n")
+    _create_job("a", file_path=str(path), prompt="")
+    client = TestClient(app)
+
+    response = client.post("/api/process/a", params={"skip": "anomalies, statistics,correlation"})
+    assert response.status_code == 202
+    job_service._executor.shutdown(wait=True)
+
+    results = client.get("/api/results/a").json()
+    assert results["skipped_stages"] == ["anomalies", "correlation", "statistics"]
+    assert results["advanced_analytics"]["anomalies"] == {
+        "duplicate_rows": 0, "columns_with_single_value": [], "columns_with_high_null_rate": []
+    }
+    assert results["statistics"] == {"summary": {}, "numeric_stats": {}, "categorical_stats": {}}
+    assert results["advanced_analytics"]["correlation_matrix"] is None
+    assert results["timings"]["stages"]["anomalies"] == {"skipped": True}
@@ -0,0 +1,99 @@
+import json
+import os
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from app.config import settings
+from app.services import job_store
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    """A fresh database per test (connections are cached per thread, so drop them)"""
+    monkeypatch.setattr(settings, "JOB_STORE_PATH", str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    os.makedirs(settings.UPLOAD_DIR)
+    monkeypatch.setattr(job_store, "_local", type(job_store._local)())
+    yield
+    conn = getattr(job_store._local, "conn", None)
+    if conn is not None:
+        conn.close()
+
+
+def _job(job_id: str, status: str = "pending", created_at: str = "2026-01-01T10:00:00", **extra) -> dict:
+    return {"job_id": job_id, "status": status, "filename": f"{job_id}.csv", "created_at": created_at, **extra}
+
+
+def test_create_and_get_job():
+    job_store.create_job(_job("a", file_path="/tmp/a.csv"))
+
+    job = job_store.get_job("a")
+    assert job["file_path"] == "/tmp/a.csv"
+    assert job["updated_at"] == job["created_at"]
+    assert job_store.get_job_summary("a") == {
+        "job_id": "a",
+        "status": "pending",
+        "filename": "a.csv",
+        "created_at": "2026-01-01T10:00:00",
+        "updated_at": "2026-01-01T10:00:00",
+        "error": None
+    }
+
+
+def test_missing_job_is_404():
+    for lookup in (job_store.get_job, job_store.get_job_summary, lambda job_id: job_store.update_job(job_id, {})):
+        with pytest.raises(HTTPException) as error:
+            lookup("missing")
+        assert error.value.status_code == 404
+
+
+def test_update_job_merges_and_removes_keys():
+    job_store.create_job(_job("a", temp="x"))
+
+    updated = job_store.update_job("a", {"status": "failed", "error": "boom"}, remove=("temp",))
+
+    assert updated == job_store.get_job("a")
+    assert "temp" not in updated
+    assert updated["updated_at"] > updated["created_at"]
+    assert job_store.get_job_summary("a")["error"] == "boom"
+    assert job_store.list_jobs(status="failed")[0]["job_id"] == "a"
+
+
+def test_update_job_only_if_status():
+    job_store.create_job(_job("a", status="completed"))
+
+    assert job_store.update_job("a", {"status": "failed"}, only_if_status=("pending", "processing")) is None
+    assert job_store.get_job("a")["status"] == "completed"
+    assert job_store.update_job("a", {"results": 1}, only_if_status=("completed",))["results"] == 1
+
+
+def test_list_and_count_filters():
+    job_store.create_job(_job("old", status="completed", created_at="2026-01-01T09:00:00"))
+    job_store.create_job(_job("mid", status="failed", created_at="2026-01-02T09:00:00"))
+    job_store.create_job(_job("new", status="completed", created_at="2026-01-03T09:00:00"))
+
+    assert [job["job_id"] for job in job_store.list_jobs()] == ["new", "mid", "old"]
+    assert [job["job_id"] for job in job_store.list_jobs(status="completed")] == ["new", "old"]
+    assert [job["job_id"] for job in job_store.list_jobs(since=datetime(2026, 1, 2, 9))] == ["new", "mid"]
+    assert [job["job_id"] for job in job_store.list_jobs(limit=1, offset=1)] == ["mid"]
+    assert job_store.count_jobs() == 3
+    assert job_store.count_jobs(status="completed", since=datetime(2026, 1, 2)) == 1
+
+
+def test_migrate_metadata_files():
+    job_store.create_job(_job("existing", status="completed"))
+    for job_id, metadata in {
+        "existing": _job("existing", status="pending"),
+        "legacy": {"status": "completed", "filename": "legacy.csv", "created_at": "2025-12-31T08:00:00"},
+        "broken": None
+    }.items():
+        job_dir = os.path.join(settings.UPLOAD_DIR, job_id)
+        os.makedirs(job_dir)
+        with open(os.path.join(job_dir, "metadata.json"), "w") as f:
+            f.write("{not json" if metadata is None else json.dumps(metadata))
+
+    assert job_store.migrate_metadata_files() == 1
+    # The job id comes from the directory; records already in the store win
+    assert job_store.get_job("legacy")["job_id"] == "legacy"
+    assert job_store.get_job("existing")["status"] == "completed"
+    assert job_store.migrate_metadata_files() == 0
@@ -0,0 +1,47 @@
+import json
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from app.utils.json_codec import dumps, loads
+
+
+def test_numpy_and_pandas_values():
+    data = {
+        "ints": np.arange(3),
+        "floats": np.array([1.5, np.nan, np.inf]),
+        "scalar": np.float32(0.5),
+        "flag": np.bool_(True),
+        "labels": np.array(["a", "b"], dtype=object),
+        "when": pd.Timestamp("2024-01-02 03:04:05"),
+        "naive": datetime(2024, 1, 2),
+        "missing": [pd.NaT, pd.NA, None, float("nan")],
+        1: "int key",
+        2.5: "float key"
+    }
+
+    assert loads(dumps(data)) == {
+        "ints": [0, 1, 2],
+        "floats": [1.5, None, None],
+        "scalar": 0.5,
+        "flag": True,
+        "labels": ["a", "b"],
+        "when": "2024-01-02T03:04:05",
+        "naive": "2024-01-02T00:00:00",
+        "missing": [None, None, None, None],
+        "1": "int key",
+        "2.5": "float key"
+    }
+
+
+def test_unknown_objects_become_strings():
+    class Region:
+        def __str__(self):
+            return "north"
+
+    assert loads(dumps({"region": Region()})) == {"region": "north"}
+
+
+def test_output_is_standard_json():
+    encoded = dumps({"text": "ünïcode", "nested": [{"x": 1}]})
+
+    assert json.loads(encoded) == {"text": "ünïcode", "nested": [{"x": 1}]}
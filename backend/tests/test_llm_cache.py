@@ -0,0 +1,85 @@
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+import pytest
+from app.config import settings
+from app.services import llm_cache
+from app.services.llm_cache import cached_generate, evict, get_cached_response, make_llm_cache_key, store_response
+
+
+class Generator:
+    """Stand-in for a Gemini call, counting how often it runs"""
+
+    def __init__(self, response="insight"):
+        self.response = response
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.response
+
+
+def generate_cached(*args, **kwargs):
+    return asyncio.run(cached_generate(*args, **kwargs))
+
+
+def test_key_ignores_formatting_noise():
+    key = make_llm_cache_key("insights", "model", {"stats": {"mean": 1.00000001, "std": 2.0}, "prompt": "top  regions"})
+
+    assert key == make_llm_cache_key("insights", "model", {"prompt": " top regions ", "stats": {"std": 2.0, "mean": 1.0}})
+    assert key != make_llm_cache_key("insights", "other-model", {"stats": {"mean": 1.0, "std": 2.0}, "prompt": "top regions"})
+    assert key != make_llm_cache_key("charts", "model", {"stats": {"mean": 1.0, "std": 2.0}, "prompt": "top regions"})
+    assert key != make_llm_cache_key("insights", "model", {"stats": {"mean": 1.1, "std": 2.0}, "prompt": "top regions"})
+
+
+def test_miss_then_hit(data_dirs):
+    generate, stats = Generator(), {}
+
+    assert generate_cached("insights", "model", {"a": 1}, generate, llm_stats=stats) == "insight"
+    assert stats["insights"] == {"cache": "miss", "model": "model"}
+    assert generate_cached("insights", "model", {"a": 1}, generate, llm_stats=stats) == "insight"
+    assert stats["insights"]["cache"] == "hit"
+    assert generate.calls == 1
+
+
+def test_bypass_disabled_and_empty_responses(data_dirs, monkeypatch):
+    generate, stats = Generator(), {}
+    generate_cached("insights", "model", {"a": 1}, generate)
+
+    generate_cached("insights", "model", {"a": 1}, generate, use_cache=False, llm_stats=stats)
+    assert (stats["insights"]["cache"], generate.calls) == ("bypass", 2)
+
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    generate_cached("insights", "model", {"b": 1}, generate, llm_stats=stats)
+    assert stats["insights"]["cache"] == "disabled"
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+
+    # Neither a disabled cache nor an empty response stores anything
+    assert get_cached_response(make_llm_cache_key("insights", "model", {"b": 1})) is None
+    generate_cached("insights", "model", {"c": 1}, Generator(response=""))
+    assert get_cached_response(make_llm_cache_key("insights", "model", {"c": 1})) is None
+
+
+def test_entries_expire_after_the_ttl(data_dirs, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_TTL_SECONDS", 60)
+    store_response("key", "insights", "model", "old")
+    assert get_cached_response("key") == "old"
+
+    now = time.time()
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: now + 61))
+    assert get_cached_response("key") is None
+    assert not os.path.exists(os.path.join(llm_cache.LLM_CACHE_DIR, "key.json"))
+
+
+def test_least_recently_used_entries_are_evicted(data_dirs, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_MAX_ENTRIES", 10)
+    for age, key in enumerate(("c", "b", "a")):
+        store_response(key, "insights", "model", key)
+        mtime = time.time() - 10 * (age + 1)
+        os.utime(os.path.join(llm_cache.LLM_CACHE_DIR, f"{key}.json"), (mtime, mtime))
+
+    # A hit makes "a" the most recently used entry
+    assert get_cached_response("a") == "a"
+    assert evict(max_entries=2) == 1
+    assert sorted(os.listdir(llm_cache.LLM_CACHE_DIR)) == ["a.json", "c.json"]
@@ -0,0 +1,79 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from app.config import settings
+from app.services import chart_service, llm_service
+from app.services.chart_service import generate_charts, generate_charts_fallback
+from app.services.llm_service import generate_insights
+from app.services.pipeline import Pipeline
+from app.services.processing_service import _LLM_STAGES
+from app.utils.column_profile import ColumnProfile
+
+
+def fake_client(delay: float, text: str):
+    """Async Gemini client whose calls take `delay` seconds"""
+
+    async def generate_content(model, contents):
+        await asyncio.sleep(delay)
+        return SimpleNamespace(text=text)
+
+    return SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate_content)))
+
+
+@pytest.fixture
+def gemini(data_dirs, monkeypatch):
+    """Install a fake client for both chart and insight generation"""
+
+    def install(delay: float, text: str = '{"charts": []}'):
+        client = fake_client(delay, text)
+        monkeypatch.setattr(settings, "GEMINI_API_KEY", "test-key")
+        monkeypatch.setattr(chart_service, "client", client)
+        monkeypatch.setattr(llm_service, "client", client)
+
+    return install
+
+
+def test_chart_timeout_falls_back(gemini, monkeypatch, sales_df):
+    gemini(delay=1)
+    monkeypatch.setattr(settings, "LLM_CHARTS_TIMEOUT_SECONDS", 0.05)
+    llm_stats = {}
+
+    charts = asyncio.run(generate_charts(sales_df, llm_stats=llm_stats))
+
+    assert charts == generate_charts_fallback(sales_df)
+    assert llm_stats["charts"]["timed_out"] is True
+
+
+def test_insight_timeout_returns_warning(gemini, monkeypatch):
+    gemini(delay=1)
+    monkeypatch.setattr(settings, "LLM_INSIGHTS_TIMEOUT_SECONDS", 0.05)
+    llm_stats = {}
+
+    insights = asyncio.run(generate_insights({"rows": 1}, {}, {}, llm_stats=llm_stats))
+
+    assert insights.startswith("⚠️ Unable to generate insights")
+    assert llm_stats["insights"]["timed_out"] is True
+
+
+def test_llm_stages_run_concurrently(gemini, sales_df):
+    gemini(delay=0.3, text="insight")
+    context = {
+        "df_cleaned": sales_df,
+        "prompt": "",
+        "cleaned_profile": ColumnProfile(sales_df),
+        "cleaned_info": {"rows": len(sales_df)},
+        "statistics": {},
+        "cleaning_report": {},
+        "use_llm_cache": True,
+        "llm_stats": {}
+    }
+
+    started = time.perf_counter()
+    Pipeline(_LLM_STAGES).run(context)
+    elapsed = time.perf_counter() - started
+
+    assert context["insights"] == "insight"
+    assert context["charts"] == generate_charts_fallback(sales_df)
+    assert elapsed < 0.55
+    assert set(context["llm_stats"]) == {"charts", "insights"}
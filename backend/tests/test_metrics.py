@@ -0,0 +1,79 @@
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from app.main import app
+from app.services.metrics import observe_job
+from app.services.pipeline import Pipeline, Stage
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+SUMMARY = {
+    "job_id": "job",
+    "status": "completed",
+    "processing_mode": "in_memory",
+    "cache_hit": False,
+    "timings": {
+        "total_ms": 1500.0,
+        "stages": {
+            "parse": {"wall_ms": 500.0, "peak_rss_delta_bytes": 2_000_000, "rows": 1000, "rows_per_sec": 2000.0},
+            "statistics": {"skipped": True}
+        }
+    },
+    "llm": {
+        "insights": {"cache": "miss", "model": "test-model", "latency_ms": 800.0, "prompt_tokens": 300, "completion_tokens": 120}
+    }
+}
+
+
+def test_stage_timings_include_rows_and_memory():
+    pipeline = Pipeline([
+        Stage("parse", lambda path: list(range(100)), ["path"], ["rows"], rows=lambda context: len(context["rows"])),
+        Stage("count", len, ["rows"], ["count"]),
+    ])
+    timings = pipeline.run({"path": "data.csv"})
+
+    assert timings["parse"]["rows"] == 100
+    assert timings["parse"]["rows_per_sec"] > 0
+    assert "peak_rss_delta_bytes" in timings["parse"]
+    assert "rows" not in timings["count"]
+
+
+def test_observe_job_records_stage_and_llm_metrics():
+    def counts():
+        return (
+            sample("unstructiq_jobs_total", status="completed"),
+            sample("unstructiq_stage_duration_seconds_count", stage="parse", mode="in_memory"),
+            sample("unstructiq_stage_duration_seconds_count", stage="statistics", mode="in_memory"),
+            sample("unstructiq_stage_rows_per_second_sum", stage="parse", mode="in_memory"),
+            sample("unstructiq_llm_cache_lookups_total", call="insights", outcome="miss"),
+            sample("unstructiq_llm_tokens_sum", call="insights", model="test-model", direction="completion"),
+        )
+
+    before = counts()
+    observe_job(SUMMARY)
+    after = counts()
+
+    # Skipped stages are not observed (sums also hold other tests' jobs, hence approx)
+    assert [b - a for a, b in zip(before, after)] == pytest.approx([1, 1, 0, 2000.0, 1, 120])
+
+
+def test_cache_hits_count_as_jobs_without_timings():
+    jobs = sample("unstructiq_jobs_total", status="completed")
+    durations = sample("unstructiq_job_duration_seconds_count", mode="in_memory")
+
+    observe_job({**SUMMARY, "cache_hit": True, "timings": None, "llm": None})
+
+    assert sample("unstructiq_jobs_total", status="completed") == jobs + 1
+    assert sample("unstructiq_job_duration_seconds_count", mode="in_memory") == durations
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    observe_job(SUMMARY)
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'unstructiq_stage_duration_seconds_count{mode="in_memory",stage="parse"}' in response.text
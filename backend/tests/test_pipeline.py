@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.services.pipeline import Pipeline, Stage
+
+
+def test_stages_run_in_dependency_order():
+    order = []
+
+    def stage(name, result):
+        def func(*args):
+            order.append(name)
+            return result
+        return func
+
+    # Declared out of order on purpose
+    pipeline = Pipeline([
+        Stage("total", stage("total", 6), ["a", "b"], ["total"]),
+        Stage("b", stage("b", 2), ["a"], ["b"]),
+        Stage("a", stage("a", 4), ["source"], ["a"]),
+    ])
+    context = {"source": 1}
+    timings = pipeline.run(context)
+
+    assert order == ["a", "b", "total"]
+    assert context["total"] == 6
+    # Reported in declaration order
+    assert list(timings) == ["total", "b", "a"]
+    assert all(timing["wall_ms"] >= 0 for timing in timings.values())
+
+
+def test_independent_stages_run_in_parallel():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_other(_):
+        # Deadlocks (BrokenBarrierError) unless both stages run at once
+        barrier.wait()
+        return True
+
+    pipeline = Pipeline([
+        Stage("left", wait_for_other, ["x"], ["left"]),
+        Stage("right", wait_for_other, ["x"], ["right"]),
+    ])
+    context = {"x": 0}
+    pipeline.run(context, max_workers=2)
+    assert context["left"] and context["right"]
+
+
+def test_async_stages_and_multiple_outputs():
+    async def fetch(x):
+        await asyncio.sleep(0)
+        return x + 1
+
+    pipeline = Pipeline([
+        Stage("fetch", fetch, ["x"], ["y"]),
+        Stage("split", lambda y: (y, y * 2), ["y"], ["single", "double"]),
+    ])
+    context = {"x": 1}
+    pipeline.run(context)
+    assert (context["y"], context["single"], context["double"]) == (2, 2, 4)
+
+
+def test_skipped_stage_binds_defaults_and_unblocks_dependents():
+    pipeline = Pipeline([
+        Stage("stats", lambda x: {"real": True}, ["x"], ["stats"], skippable=True, defaults=[{}]),
+        Stage("report", lambda stats: len(stats), ["stats"], ["report"]),
+    ])
+    context = {"x": 1}
+    timings = pipeline.run(context, skip=["stats"])
+
+    assert context["stats"] == {}
+    assert context["report"] == 0
+    assert timings["stats"] == {"skipped": True}
+
+
+def test_on_stage_done_counts_every_stage():
+    calls = []
+    pipeline = Pipeline([
+        Stage("a", lambda x: 1, ["x"], ["a"], skippable=True),
+        Stage("b", lambda a: 2, ["a"], ["b"]),
+    ])
+    pipeline.run({"x": 0}, skip=["a"], on_stage_done=lambda *args: calls.append(args))
+    assert calls == [("a", 1, 2), ("b", 2, 2)]
+
+
+def test_duplicate_outputs_are_rejected():
+    with pytest.raises(ValueError, match="out"):
+        Pipeline([
+            Stage("one", lambda x: 1, ["x"], ["out"]),
+            Stage("two", lambda x: 2, ["x"], ["out"]),
+        ])
+
+
+def test_unmet_inputs_are_reported():
+    pipeline = Pipeline([Stage("orphan", lambda missing: 1, ["missing"], ["out"])])
+    with pytest.raises(RuntimeError, match="orphan"):
+        pipeline.run({})
+
+
+def test_failure_cancels_running_async_stages_without_waiting():
+    cancelled = threading.Event()
+
+    async def slow_llm_call(x):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    def slow_cpu(x):
+        time.sleep(1)
+
+    def fail(x):
+        raise ValueError("boom")
+
+    pipeline = Pipeline([
+        Stage("llm", slow_llm_call, ["x"], ["llm"]),
+        Stage("cpu", slow_cpu, ["x"], ["cpu"]),
+        Stage("fail", fail, ["x"], ["fail"]),
+    ])
+    started = time.perf_counter()
+    with pytest.raises(ValueError, match="boom"):
+        pipeline.run({"x": 0})
+
+    # Raised before the CPU stage finished, and the coroutine was cancelled
+    assert time.perf_counter() - started < 0.9
+    assert cancelled.wait(timeout=2)
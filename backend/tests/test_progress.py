@@ -0,0 +1,91 @@
+import asyncio
+import queue
+import time
+from datetime import datetime
+import pytest
+from app.api.routes import stream_status
+from app.services import job_store, progress
+from app.services.processing_service import process_file
+from app.utils.json_codec import loads
+
+
+@pytest.fixture(autouse=True)
+def broker_state(monkeypatch):
+    monkeypatch.setattr(progress, "_worker_queue", None)
+    monkeypatch.setattr(progress, "_latest", {})
+    monkeypatch.setattr(progress, "_subscribers", {})
+
+
+def _create_job(job_id, **metadata):
+    job_store.create_job({"job_id": job_id, "status": "processing", "created_at": datetime.now().isoformat(), **metadata})
+
+
+def test_current_progress_follows_the_latest_event():
+    assert progress.current_progress("a", "processing") == {"stage": "started", "progress": 0}
+
+    progress.publish("a", "processing", "clean", 40)
+    assert progress.current_progress("a", "processing") == {"stage": "clean", "progress": 40}
+    assert progress.current_progress("a", "pending") == {"stage": "queued", "progress": 0}
+
+    # Finished jobs are answered from their stored status
+    progress.publish("a", "completed", "completed", 100)
+    assert "a" not in progress._latest
+    assert progress.current_progress("a", "completed") == {"stage": "completed", "progress": 100}
+
+
+def test_broker_dispatches_worker_events():
+    events = queue.Queue()
+    progress.start_broker(events)
+    progress.set_worker_queue(events)
+
+    progress.publish("a", "processing", "parse", 10)
+    events.put(None)
+    for _ in range(100):
+        if "a" in progress._latest:
+            break
+        time.sleep(0.01)
+
+    assert progress._latest["a"]["stage"] == "parse"
+
+
+def test_process_file_publishes_every_stage(data_dirs, monkeypatch):
+    events = queue.Queue()
+    monkeypatch.setattr(progress, "_worker_queue", events)
+    path = data_dirs / "uploads" / "sales.csv"
+    path.write_text("region,amount\nnorth,10\nsouth,20\nnorth,30\n")
+    _create_job("a", status="pending", file_path=str(path), prompt="")
+
+    process_file("a")
+
+    published = [events.get_nowait() for _ in range(events.qsize())]
+    percentages = [event["progress"] for event in published]
+    assert published[0]["stage"] == "started"
+    assert percentages == sorted(percentages)
+    assert max(percentages[:-1]) <= 95
+    assert (published[-1]["status"], published[-1]["progress"]) == ("completed", 100)
+
+
+def test_stream_sends_each_change_until_the_job_finishes(data_dirs):
+    _create_job("a", filename="a.csv")
+
+    async def follow():
+        response = await stream_status("a")
+        events = response.body_iterator
+        received = [await anext(events)]
+
+        progress.publish("a", "processing", "clean", 40)
+        received.append(await anext(events))
+
+        job_store.update_job("a", {"status": "completed"})
+        progress.publish("a", "completed", "completed", 100)
+        received.append(await anext(events))
+
+        with pytest.raises(StopAsyncIteration):
+            await anext(events)
+        return received
+
+    received = [loads(event.removeprefix(b"data: ")) for event in asyncio.run(follow())]
+
+    assert [(event["stage"], event["progress"]) for event in received] == [("started", 0), ("clean", 40), ("completed", 100)]
+    assert {event["filename"] for event in received} == {"a.csv"}
+    assert progress._subscribers == {}
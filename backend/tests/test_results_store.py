@@ -0,0 +1,117 @@
+import asyncio
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.api import routes
+from app.main import app
+from app.utils.results_store import RESULTS_FILE, RESULT_SECTIONS, write_results, read_raw, select_fields, is_section_file
+
+RESULTS = {
+    "job_id": "job",
+    "status": "completed",
+    "processing_mode": "in_memory",
+    "cleaned_data_info": {"rows": np.int64(3), "columns": 2},
+    "data_preview": [{"a": 1, "b": "x"}, {"a": None, "b": "y"}],
+    "statistics": {"a": {"mean": np.float64(1.5), "max": float("nan")}},
+    "advanced_analytics": {
+        "correlation_matrix": {"pairs": []},
+        "outliers": {"a": {"count": 0}},
+        "anomalies": {},
+        "trends": {"a": {"direction": "up"}}
+    },
+    "charts": [
+        {"type": "line", "title": "Trend", "data": {"values": np.array([1.0, 2.5])}},
+        {"type": "bar", "title": "Counts", "data": {"labels": [pd.Timestamp("2024-01-02")]}}
+    ],
+    "insights": "text",
+    "processed_at": "2024-01-02T00:00:00"
+}
+
+
+@pytest.fixture
+def processed_dir(tmp_path):
+    write_results(str(tmp_path), RESULTS)
+    return str(tmp_path)
+
+
+def test_full_results_round_trip(processed_dir):
+    results = json.loads(read_raw(processed_dir))
+
+    assert results["cleaned_data_info"] == {"rows": 3, "columns": 2}
+    # NaN is stored as null, NumPy arrays as lists, timestamps as ISO strings
+    assert results["statistics"] == {"a": {"mean": 1.5, "max": None}}
+    assert results["charts"][0]["data"]["values"] == [1.0, 2.5]
+    assert results["charts"][1]["data"]["labels"] == ["2024-01-02T00:00:00"]
+
+
+def test_every_section_matches_the_full_results(processed_dir):
+    full = json.loads(read_raw(processed_dir))
+    for section, extract in RESULT_SECTIONS.items():
+        assert json.loads(read_raw(processed_dir, section)) == extract(full), section
+
+    assert json.loads(read_raw(processed_dir, "trends")) == {"a": {"direction": "up"}}
+    assert json.loads(read_raw(processed_dir, "info"))["processing_mode"] == "in_memory"
+
+
+def test_no_temp_files_left_behind(processed_dir, tmp_path):
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert RESULTS_FILE in names
+    assert all(name == RESULTS_FILE or is_section_file(name) for name in names)
+    assert len(names) == len(RESULT_SECTIONS) + 1
+
+
+def test_unknown_section_and_missing_results(processed_dir, tmp_path):
+    with pytest.raises(HTTPException) as error:
+        read_raw(processed_dir, "nope")
+    assert error.value.status_code == 404
+
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    with pytest.raises(HTTPException) as error:
+        read_raw(str(empty), "charts")
+    assert error.value.status_code == 404
+
+
+def test_select_fields():
+    charts = [{"type": "bar", "title": "t", "data": {}}, "other"]
+    assert select_fields(charts, ["type", "missing"]) == [{"type": "bar"}, "other"]
+    assert select_fields({"a": 1, "b": 2}, ["b"]) == {"b": 2}
+    assert select_fields("text", ["a"]) == "text"
+
+
+def test_results_routes(data_dirs):
+    os.makedirs(os.path.join(settings.PROCESSED_DIR, "job"))
+    write_results(os.path.join(settings.PROCESSED_DIR, "job"), RESULTS)
+    client = TestClient(app)
+
+    assert client.get("/api/results/job").json()["insights"] == "text"
+    assert client.get("/api/results/job/trends").json() == {"a": {"direction": "up"}}
+    charts = client.get("/api/results/job/charts", params={"fields": "type,title"})
+    assert charts.json() == [{"type": "line", "title": "Trend"}, {"type": "bar", "title": "Counts"}]
+    assert client.get("/api/results/job/nope").status_code == 404
+    assert client.get("/api/results/missing").status_code == 404
+
+
+def test_results_are_read_off_the_event_loop(data_dirs, monkeypatch):
+    os.makedirs(os.path.join(settings.PROCESSED_DIR, "job"))
+    write_results(os.path.join(settings.PROCESSED_DIR, "job"), RESULTS)
+    loops = []
+
+    def read_in_worker(*args):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            pass
+        return read_raw(*args)
+
+    monkeypatch.setattr(routes, "read_raw", read_in_worker)
+    client = TestClient(app)
+
+    assert client.get("/api/results/job").status_code == 200
+    assert client.get("/api/results/job/charts", params={"fields": "type"}).status_code == 200
+    assert loops == []
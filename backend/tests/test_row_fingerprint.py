@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.config import settings
+from app.utils.row_fingerprint import duplicate_key_columns, duplicate_mask, row_fingerprints
+
+
+@pytest.fixture
+def frame_with_duplicates(sales_df):
+    repeated = pd.concat([sales_df, sales_df.sample(300, random_state=0)], ignore_index=True)
+    return repeated.sample(frac=1, random_state=1).reset_index(drop=True)
+
+
+def test_duplicate_mask_matches_pandas(frame_with_duplicates):
+    mask = duplicate_mask(frame_with_duplicates)
+
+    assert mask.sum() == 300
+    assert np.array_equal(mask, frame_with_duplicates.duplicated().to_numpy())
+
+
+def test_duplicate_mask_on_subset(frame_with_duplicates):
+    subset = ["region", "qty"]
+
+    assert np.array_equal(
+        duplicate_mask(frame_with_duplicates, subset),
+        frame_with_duplicates.duplicated(subset).to_numpy()
+    )
+
+
+def test_nulls_compare_equal():
+    df = pd.DataFrame({"a": [1.0, np.nan, np.nan, 2.0], "b": [None, "x", "x", None]})
+
+    assert duplicate_mask(df).tolist() == [False, False, True, False]
+
+
+def test_column_order_matters():
+    # Swapped values across columns are different rows
+    df = pd.DataFrame({"a": ["x", "y"], "b": ["y", "x"]})
+
+    assert not duplicate_mask(df).any()
+
+
+def test_mostly_unique_text_is_hashed_by_value():
+    # Large, mostly unique object columns skip factorizing; the result must not change
+    df = pd.DataFrame({"text": [f"row {i % 4000}" for i in range(5000)]})
+
+    assert np.array_equal(duplicate_mask(df), df.duplicated().to_numpy())
+
+
+def test_fingerprints_do_not_depend_on_the_index(frame_with_duplicates):
+    chunk = frame_with_duplicates.iloc[1000:1500]
+
+    assert np.array_equal(row_fingerprints(chunk), row_fingerprints(frame_with_duplicates)[1000:1500])
+
+
+def test_duplicate_key_columns(monkeypatch):
+    monkeypatch.setattr(settings, "DUPLICATE_KEY_COLUMNS", " region, missing ,qty")
+    assert duplicate_key_columns(["order_id", "qty", "region"]) == ["region", "qty"]
+
+    monkeypatch.setattr(settings, "DUPLICATE_KEY_COLUMNS", "missing")
+    assert duplicate_key_columns(["order_id"]) is None
+
+    monkeypatch.setattr(settings, "DUPLICATE_KEY_COLUMNS", "")
+    assert duplicate_key_columns(["order_id"]) is None
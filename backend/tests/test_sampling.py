@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.config import settings
+from app.services.chart_service import create_chart_from_suggestion
+from app.utils.column_profile import ColumnProfile
+from app.utils.sampling import _allocate, default_strata_column, sample_rows
+
+
+@pytest.fixture
+def skewed_regions():
+    # One region has 1% of the rows; a uniform sample of 100 could miss it
+    regions = np.array(["north"] * 9_000 + ["south"] * 900 + ["rare"] * 100)
+    return pd.DataFrame({"region": regions, "value": np.arange(len(regions))})
+
+
+def test_small_frames_are_exact(sales_df):
+    sample = sample_rows(sales_df, max_rows=len(sales_df))
+
+    assert sample.df is sales_df
+    assert sample.info() == {"mode": "exact"}
+    assert np.all(sample.weights == 1)
+
+
+def test_uniform_sample_weights_sum_to_total_rows(sales_df):
+    sample = sample_rows(sales_df, max_rows=500)
+
+    assert len(sample.df) == 500
+    assert sample.weights.sum() == pytest.approx(len(sales_df))
+    assert sample.df.index.is_monotonic_increasing
+    assert sample.info() == {
+        "mode": "sampled",
+        "method": "uniform",
+        "stratified_by": None,
+        "sample_rows": 500,
+        "total_rows": len(sales_df)
+    }
+
+
+def test_samples_are_reproducible(sales_df):
+    first = sample_rows(sales_df, max_rows=500, seed=3)
+    second = sample_rows(sales_df, max_rows=500, seed=3)
+
+    assert first.df.index.equals(second.df.index)
+
+
+def test_stratified_counts_are_exact_per_stratum(skewed_regions):
+    sample = sample_rows(skewed_regions, max_rows=100, stratify_by="region")
+
+    assert sample.method == "stratified"
+    assert len(sample.df) == 100
+    assert sample.df["region"].value_counts().to_dict() == {"north": 90, "south": 9, "rare": 1}
+    assert sample.count(sample.df["region"]).to_dict() == {"north": 9_000, "rare": 100, "south": 900}
+    assert sample.weights.sum() == pytest.approx(len(skewed_regions))
+
+
+def test_too_many_strata_falls_back_to_uniform(skewed_regions, monkeypatch):
+    monkeypatch.setattr(settings, "SAMPLING_MAX_STRATA", 2)
+    sample = sample_rows(skewed_regions, max_rows=100, stratify_by="region")
+
+    assert sample.method == "uniform"
+
+
+def test_dates_are_stratified_by_coarser_periods(monkeypatch):
+    dates = pd.Series(pd.date_range("2020-01-01", periods=3 * 365 * 24, freq="h"))
+    monkeypatch.setattr(settings, "SAMPLING_MAX_STRATA", 50)
+    sample = sample_rows(pd.DataFrame({"date": dates}), max_rows=360, stratify_by="date")
+
+    # Too many days, but 36 months: about 10 rows from every month
+    assert sample.method == "stratified"
+    assert sample.df["date"].dt.to_period("M").nunique() == 36
+
+
+def test_weights_of_a_chunked_frame_scale_to_total_rows(sales_df):
+    sample = sample_rows(sales_df, max_rows=300, total_rows=30_000)
+
+    assert sample.weights.sum() == pytest.approx(30_000)
+    assert sample.frame_scale == 10
+    assert sample.frame_info()["sample_rows"] == len(sales_df)
+    counts = pd.Series([100, 200])
+    assert sample.scale_counts(counts).tolist() == [1_000, 2_000]
+
+
+def test_allocate_is_proportional_with_one_row_per_group():
+    allocation = _allocate(np.array([9_000, 900, 99, 1]), 100)
+
+    assert allocation.tolist() == [90, 9, 1, 1]
+    assert np.all(allocation <= [9_000, 900, 99, 1])
+
+
+def test_default_strata_column(sales_df, monkeypatch):
+    profile = ColumnProfile(sales_df)
+    assert default_strata_column(sales_df, profile) == "region"
+
+    with_dates = sales_df.assign(order_date=pd.to_datetime(sales_df["order_date"]))
+    assert default_strata_column(with_dates, ColumnProfile(with_dates)) == "order_date"
+
+    monkeypatch.setattr(settings, "SAMPLING_STRATIFY_COLUMN", "qty")
+    assert default_strata_column(sales_df, profile) == "qty"
+    monkeypatch.setattr(settings, "SAMPLING_STRATIFY_COLUMN", "missing")
+    assert default_strata_column(sales_df, profile) is None
+
+
+def test_multi_line_charts_show_the_five_largest_categories():
+    # Alphabetical order puts the two smallest channels first
+    sizes = {"a_fax": 1, "b_post": 2, "email": 50, "phone": 40, "web": 70, "chat": 30, "store": 20}
+    channels = np.repeat(list(sizes), list(sizes.values()))
+    df = pd.DataFrame({
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(len(channels)) % 10, unit="D"),
+        "channel": channels
+    })
+    suggestion = {"type": "line", "columns": ["date", "channel"], "title": "By channel"}
+
+    chart = create_chart_from_suggestion(df, suggestion)
+
+    assert [d["label"] for d in chart["data"]["datasets"]] == ["web", "email", "phone", "chat", "store"]
+    assert sum(sum(d["data"]) for d in chart["data"]["datasets"]) == 210
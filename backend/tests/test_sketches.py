@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from app.utils.sketches import RunningMoments, KLLSketch, weighted_quantiles
+
+
+def test_running_moments_merge_matches_numpy():
+    rng = np.random.default_rng(0)
+    values = rng.normal(50, 12, 10_000)
+
+    merged = RunningMoments()
+    for chunk in np.array_split(values, 7):
+        part = RunningMoments()
+        part.update(chunk)
+        merged.merge(part)
+
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.std == pytest.approx(values.std(ddof=1))
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+
+def test_running_moments_add_constant():
+    moments = RunningMoments()
+    moments.update(np.array([1.0, 2.0, 3.0]))
+    moments.add_constant(2.0, 5)
+
+    expected = np.array([1.0, 2.0, 3.0] + [2.0] * 5)
+    assert moments.mean == pytest.approx(expected.mean())
+    assert moments.std == pytest.approx(expected.std(ddof=1))
+
+
+def test_running_moments_std_needs_two_values():
+    moments = RunningMoments()
+    moments.update(np.array([4.0]))
+    assert np.isnan(moments.std)
+
+
+def test_kll_is_exact_up_to_k():
+    values = np.random.default_rng(1).exponential(size=500)
+    sketch = KLLSketch(k=1000)
+    sketch.update(values)
+
+    qs = [0.0, 0.1, 0.25, 0.5, 0.75, 0.99, 1.0]
+    assert sketch.quantiles(qs) == pytest.approx(np.quantile(values, qs).tolist())
+
+
+@pytest.mark.parametrize("merge", [False, True])
+def test_kll_rank_error_is_bounded(merge):
+    values = np.random.default_rng(2).normal(size=200_000)
+    chunks = np.array_split(values, 20)
+    sketch = KLLSketch(k=2000)
+    if merge:
+        for chunk in chunks:
+            part = KLLSketch(k=2000, seed=len(chunk))
+            part.update(chunk)
+            sketch.merge(part)
+    else:
+        for chunk in chunks:
+            sketch.update(chunk)
+
+    assert sketch.count == len(values)
+    retained, weights = sketch.items()
+    assert weights.sum() == pytest.approx(len(values), rel=0.01)
+    assert len(retained) < 3 * sketch.k
+
+    ordered = np.sort(values)
+    for q, estimate in zip([0.01, 0.25, 0.5, 0.75, 0.99], sketch.quantiles([0.01, 0.25, 0.5, 0.75, 0.99])):
+        rank = np.searchsorted(ordered, estimate) / len(values)
+        assert abs(rank - q) < 0.01
+
+
+def test_kll_quantiles_with_extra_values():
+    values = np.arange(10, dtype=float)
+    sketch = KLLSketch(k=100)
+    sketch.update(values)
+
+    expected = np.concatenate([values, np.full(5, 4.5)])
+    assert sketch.quantiles([0.25, 0.5], extra_value=4.5, extra_count=5) == pytest.approx(
+        np.quantile(expected, [0.25, 0.5]).tolist()
+    )
+    assert sketch.mad(4.5, extra_count=5) == pytest.approx(np.median(np.abs(expected - 4.5)))
+
+
+def test_weighted_quantiles_match_expanded_data():
+    values = np.array([3.0, 1.0, 2.0, 5.0])
+    weights = np.array([2.0, 1.0, 3.0, 1.0])
+    expanded = np.repeat(values, weights.astype(int))
+
+    qs = [0.0, 0.2, 0.5, 0.9, 1.0]
+    assert weighted_quantiles(values, weights, qs) == pytest.approx(np.quantile(expanded, qs).tolist())
+
+
+def test_weighted_quantiles_empty():
+    assert all(np.isnan(weighted_quantiles(np.empty(0), np.empty(0), [0.5])))
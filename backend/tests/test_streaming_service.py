@@ -0,0 +1,108 @@
+import math
+import numpy as np
+import pytest
+from app.config import settings
+from app.services.streaming_service import _SeenRows, should_process_in_chunks
+from app.services.processing_service import IN_MEMORY_PIPELINE, CHUNKED_PIPELINE
+from app.utils.file_sniffer import sniff_dialect
+
+
+def _first_occurrences(hashes: np.ndarray) -> np.ndarray:
+    expected = np.zeros(len(hashes), dtype=bool)
+    expected[np.unique(hashes, return_index=True)[1]] = True
+    return expected
+
+
+@pytest.mark.parametrize("chunks", [1, 3, 17])
+def test_seen_rows_deduplicates_across_chunks(chunks):
+    hashes = np.random.default_rng(0).integers(0, 500, 5_000).astype(np.uint64)
+
+    seen = _SeenRows()
+    keep = np.concatenate([seen.first_occurrences(chunk) for chunk in np.array_split(hashes, chunks)])
+
+    assert np.array_equal(keep, _first_occurrences(hashes))
+    # The seen fingerprints are sorted runs without duplicates across them
+    assert all(np.array_equal(run, np.unique(run)) for run in seen._runs)
+    assert np.array_equal(np.sort(np.concatenate(seen._runs)), np.unique(hashes))
+
+
+@pytest.mark.parametrize("sizes", [[100] * 1_000, list(range(1_000, 0, -1))])
+def test_seen_rows_keeps_a_logarithmic_number_of_runs(sizes):
+    seen = _SeenRows()
+    start = 0
+    for size in sizes:
+        seen.first_occurrences(np.arange(start, start + size, dtype=np.uint64))
+        start += size
+
+    levels = [len(run).bit_length() for run in seen._runs]
+    assert sum(len(run) for run in seen._runs) == start
+    assert len(levels) <= start.bit_length()
+    assert levels == sorted(set(levels), reverse=True)
+
+
+def test_seen_rows_duplicate_at_chunk_boundary():
+    seen = _SeenRows()
+    first = seen.first_occurrences(np.array([7, 3, 9], dtype=np.uint64))
+    second = seen.first_occurrences(np.array([9, 9, 1, 3, 2], dtype=np.uint64))
+
+    assert first.tolist() == [True, True, True]
+    assert second.tolist() == [False, False, True, False, True]
+
+
+def test_should_process_in_chunks(sales_csv, monkeypatch):
+    monkeypatch.setattr(settings, "CHUNKED_PROCESSING_THRESHOLD", 1_000)
+    assert should_process_in_chunks(sales_csv)
+
+    monkeypatch.setattr(settings, "CHUNKED_PROCESSING_THRESHOLD", 10 ** 12)
+    assert not should_process_in_chunks(sales_csv)
+
+
+def _run(pipeline, file_path, cleaned_data_path):
+    context = {
+        "file_path": file_path,
+        "dialect": sniff_dialect(file_path),
+        "cleaned_data_path": cleaned_data_path,
+        "prompt": "",
+        "use_llm_cache": False,
+        "llm_stats": {}
+    }
+    pipeline.run(context, skip=["charts", "insights"])
+    return context
+
+
+def _assert_close(expected, actual, path="results"):
+    """Equal structure, floats equal up to rounding"""
+    if isinstance(expected, dict):
+        assert set(expected) == set(actual), path
+        for key in expected:
+            _assert_close(expected[key], actual[key], f"{path}.{key}")
+    elif isinstance(expected, list):
+        assert len(expected) == len(actual), path
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            _assert_close(e, a, f"{path}[{i}]")
+    elif isinstance(expected, float) and math.isnan(expected):
+        assert isinstance(actual, float) and math.isnan(actual), path
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-12), path
+    else:
+        assert expected == actual, path
+
+
+def test_chunked_results_match_in_memory(sales_csv, tmp_path, monkeypatch):
+    # Several chunks, with duplicates of the first chunk's rows in the last one
+    monkeypatch.setattr(settings, "CHUNK_SIZE_ROWS", 700)
+
+    in_memory = _run(IN_MEMORY_PIPELINE, sales_csv, str(tmp_path / "in_memory.parquet"))
+    chunked = _run(CHUNKED_PIPELINE, sales_csv, str(tmp_path / "chunked.parquet"))
+
+    for section in ("statistics", "outliers", "correlation_matrix", "trends", "anomalies"):
+        _assert_close(in_memory[section], chunked[section], section)
+
+    for section in ("original_info", "cleaned_info"):
+        assert chunked[section]["rows"] == in_memory[section]["rows"]
+        assert chunked[section]["missing_values"] == in_memory[section]["missing_values"]
+
+    steps = {op["step"]: op for op in in_memory["cleaning_report"]["operations"]}
+    chunked_steps = {op["step"]: op for op in chunked["cleaning_report"]["operations"]}
+    assert chunked_steps["duplicates_removed"] == steps["duplicates_removed"] == {"step": "duplicates_removed", "count": 50}
+    assert chunked_steps["missing_values_handled"] == steps["missing_values_handled"]
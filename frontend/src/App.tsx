@@ -16,6 +16,7 @@ function App() {
   const [processing, setProcessing] = useState(false);
   const [processingStage, setProcessingStage] = useState<string>('');
   const [processingResults, setProcessingResults] = useState<any>(null);
+  const [dataPage, setDataPage] = useState<any>(null);
 
   // Backend connection test
   const testBackend = async () => {
@@ -57,6 +58,7 @@ function App() {
     setSelectedFile(null);
     setUploadResult(null);
     setProcessingResults(null);
+    setDataPage(null);
     setUserPrompt('');
   };
 
@@ -75,6 +77,7 @@ function App() {
       const result = await api.uploadFile(selectedFile, userPrompt);
       setUploadResult(result);
       setProcessingResults(null);
+      setDataPage(null);
     } catch (err: any) {
       console.error('Upload error:', err);
       alert('Upload failed: ' + (err.response?.data?.detail || err.message));
@@ -89,27 +92,25 @@ function App() {
 
     try {
       setProcessing(true);
-
-      setProcessingStage('Parsing file...');
-      await new Promise(resolve => setTimeout(resolve, 800));
-
-      setProcessingStage('Cleaning data...');
-      await new Promise(resolve => setTimeout(resolve, 800));
-
-      setProcessingStage('Analyzing statistics...');
-      await new Promise(resolve => setTimeout(resolve, 800));
-
-      setProcessingStage('Detecting patterns...');
-      await new Promise(resolve => setTimeout(resolve, 800));
-
-      setProcessingStage('Generating visualizations...');
-      await new Promise(resolve => setTimeout(resolve, 800));
-
-      setProcessingStage('AI analyzing patterns...');
-
-      const result = await api.processFile(uploadResult.job_id);
-      setProcessingResults(result.results);
+      setProcessingStage('Queued...');
+
+      await api.processFile(uploadResult.job_id);
+
+      // Processing runs in the background; the server pushes each finished stage
+      const status = await api.waitForJob(uploadResult.job_id, (update: any) => {
+        if (update.status === 'processing') {
+          // stage is the last pipeline stage finished
+          setProcessingStage(`Processing... ${update.progress}% (${update.stage.replace(/_/g, ' ')})`);
+        }
+      });
+      if (status.status === 'failed') {
+        throw new Error(status.error || 'Processing failed');
+      }
+
+      const results = await api.getResults(uploadResult.job_id);
+      setProcessingResults(results);
       setProcessingStage('');
+      await loadDataPage(0);
     } catch (err: any) {
       console.error('Processing error:', err);
       alert('Processing failed: ' + (err.response?.data?.detail || err.message));
@@ -119,6 +120,20 @@ function App() {
     }
   };
 
+  // Cleaned data pages
+  const DATA_PAGE_SIZE = 50;
+
+  const loadDataPage = async (offset: number) => {
+    if (!uploadResult?.job_id) return;
+
+    try {
+      setDataPage(await api.getDataPage(uploadResult.job_id, offset, DATA_PAGE_SIZE));
+    } catch (err: any) {
+      console.error('Data page error:', err);
+      setDataPage(null);
+    }
+  };
+
   // Export functions
   const handleExportCSV = async () => {
     if (!uploadResult?.job_id) return;
@@ -158,6 +173,9 @@ function App() {
     }
   };
 
+  // Stages skipped with ?skip= hold empty reports; their panels are hidden
+  const wasSkipped = (stage: string) => (processingResults?.skipped_stages ?? []).includes(stage);
+
   return (
     <div className="min-h-screen bg-gradient-to-br from-gray-900 via-slate-800 to-gray-900 p-4">
       <div className="max-w-6xl mx-auto py-8">
@@ -385,6 +403,58 @@ function App() {
               </div>
             )}
 
+            {/* Cleaned Data (paged) */}
+            {dataPage && dataPage.total_rows > 0 && (
+              <div className="bg-slate-800/50 border border-slate-700 rounded-2xl p-6">
+                <div className="flex items-center justify-between mb-4">
+                  <h3 className="text-xl font-semibold text-white flex items-center gap-2">
+                    <Eye className="w-5 h-5 text-indigo-400" />
+                    Cleaned Data (Rows {dataPage.offset + 1}-{dataPage.offset + dataPage.data.length} of {dataPage.total_rows.toLocaleString()})
+                  </h3>
+                  <div className="flex gap-2">
+                    <button
+                      onClick={() => loadDataPage(Math.max(0, dataPage.offset - DATA_PAGE_SIZE))}
+                      disabled={dataPage.offset === 0}
+                      className="px-3 py-1 rounded-lg bg-slate-700 text-gray-300 disabled:opacity-40"
+                    >
+                      Previous
+                    </button>
+                    <button
+                      onClick={() => loadDataPage(dataPage.offset + DATA_PAGE_SIZE)}
+                      disabled={dataPage.offset + DATA_PAGE_SIZE >= dataPage.total_rows}
+                      className="px-3 py-1 rounded-lg bg-slate-700 text-gray-300 disabled:opacity-40"
+                    >
+                      Next
+                    </button>
+                  </div>
+                </div>
+                <div className="overflow-x-auto">
+                  <table className="w-full text-sm text-left">
+                    <thead className="text-xs text-gray-400 uppercase bg-slate-700/50">
+                      <tr>
+                        {dataPage.columns.map((col: string, idx: number) => (
+                          <th key={idx} className="px-4 py-3 whitespace-nowrap">
+                            {col}
+                          </th>
+                        ))}
+                      </tr>
+                    </thead>
+                    <tbody>
+                      {dataPage.data.map((row: any, rowIdx: number) => (
+                        <tr key={rowIdx} className="border-b border-slate-700 hover:bg-slate-700/30">
+                          {dataPage.columns.map((col: string, colIdx: number) => (
+                            <td key={colIdx} className="px-4 py-3 text-gray-300 whitespace-nowrap">
+                              {row[col] ?? '-'}
+                            </td>
+                          ))}
+                        </tr>
+                      ))}
+                    </tbody>
+                  </table>
+                </div>
+              </div>
+            )}
+
             {/* Export Buttons */}
             <div className="bg-slate-800/50 border border-slate-700 rounded-xl p-6">
               <h3 className="text-lg font-semibold text-white mb-4 flex items-center gap-2">
@@ -414,7 +484,7 @@ function App() {
               <div className="space-y-6">
 
                 {/* Anomalies */}
-                {processingResults.advanced_analytics.anomalies && (
+                {processingResults.advanced_analytics.anomalies && !wasSkipped('anomalies') && (
                   <div className="bg-slate-800/50 border border-slate-700 rounded-2xl p-6">
                     <h3 className="text-xl font-semibold text-white mb-4 flex items-center gap-2">
                       <AlertTriangle className="w-5 h-5 text-yellow-400" />
@@ -424,19 +494,19 @@ function App() {
                       <div className="bg-slate-700/50 rounded-lg p-4">
                         <div className="text-sm text-gray-400 mb-1">Duplicate Rows</div>
                         <div className="text-2xl font-bold text-white">
-                          {processingResults.advanced_analytics.anomalies.duplicate_rows}
+                          {processingResults.advanced_analytics.anomalies.duplicate_rows ?? 0}
                         </div>
                       </div>
                       <div className="bg-slate-700/50 rounded-lg p-4">
                         <div className="text-sm text-gray-400 mb-1">Single-Value Columns</div>
                         <div className="text-2xl font-bold text-white">
-                          {processingResults.advanced_analytics.anomalies.columns_with_single_value.length}
+                          {processingResults.advanced_analytics.anomalies.columns_with_single_value?.length ?? 0}
                         </div>
                       </div>
                       <div className="bg-slate-700/50 rounded-lg p-4">
                         <div className="text-sm text-gray-400 mb-1">High Null Columns</div>
                         <div className="text-2xl font-bold text-white">
-                          {processingResults.advanced_analytics.anomalies.columns_with_high_null_rate.length}
+                          {processingResults.advanced_analytics.anomalies.columns_with_high_null_rate?.length ?? 0}
                         </div>
                       </div>
                     </div>
@@ -509,15 +579,18 @@ function App() {
                 )}
 
                 {/* Correlation Matrix */}
-                {processingResults.advanced_analytics.correlation_matrix && (
+                {processingResults.advanced_analytics.correlation_matrix && !wasSkipped('correlation') && (
                   <details className="bg-slate-800/50 border border-slate-700 rounded-2xl p-6">
                     <summary className="cursor-pointer text-xl font-semibold text-white">
                       📊 Correlation Analysis
                     </summary>
                     <div className="mt-4">
-                      {processingResults.advanced_analytics.correlation_matrix.pairs.length > 0 ? (
+                      {(processingResults.advanced_analytics.correlation_matrix.pairs?.length ?? 0) > 0 ? (
                         <div className="space-y-3">
-                          <p className="text-gray-400 text-sm mb-4">Strong correlations found (|r| {'>'} 0.7):</p>
+                          <p className="text-gray-400 text-sm mb-4">
+                            Strong {processingResults.advanced_analytics.correlation_matrix.method ?? 'pearson'} correlations found (|r| {'>'} {processingResults.advanced_analytics.correlation_matrix.threshold ?? 0.7})
+                            {processingResults.advanced_analytics.correlation_matrix.sampled_rows ? `, from a sample of ${processingResults.advanced_analytics.correlation_matrix.sampled_rows.toLocaleString()} rows` : ''}:
+                          </p>
                           {processingResults.advanced_analytics.correlation_matrix.pairs.map((pair: any, idx: number) => (
                             <div key={idx} className="bg-slate-700/50 rounded-lg p-4">
                               <div className="flex items-center justify-between">
@@ -652,7 +725,7 @@ function App() {
             )}
 
             {/* Statistics */}
-            {processingResults.statistics && (
+            {processingResults.statistics && !wasSkipped('statistics') && (
               <details className="bg-slate-800/50 border border-slate-700 rounded-2xl p-6">
                 <summary className="cursor-pointer text-xl font-semibold text-white">
                   📊 Statistical Analysis
@@ -48,6 +48,18 @@ export default function ChartDisplay({ chartConfig }: ChartDisplayProps) {
       <div className="mb-4">
         <h3 className="text-lg font-semibold text-white">{chartConfig.title}</h3>
         <p className="text-sm text-gray-400">{chartConfig.description}</p>
+        {chartConfig.sampling?.mode === 'sampled' && (
+          <p className="text-xs text-amber-400 mt-1">
+            Estimated from a {chartConfig.sampling.method} sample of {chartConfig.sampling.sample_rows.toLocaleString()} of{' '}
+            {chartConfig.sampling.total_rows.toLocaleString()} rows
+          </p>
+        )}
+        {chartConfig.downsampling && (
+          <p className="text-xs text-gray-500 mt-1">
+            {chartConfig.downsampling.points.toLocaleString()} of {chartConfig.downsampling.source_points.toLocaleString()} points
+            ({chartConfig.downsampling.method})
+          </p>
+        )}
       </div>
 
       <div className="relative h-80">
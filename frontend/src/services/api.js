@@ -37,12 +37,67 @@ export const api = {
     return response.data;
   },
 
+  // Follow status over server-sent events until the job completes or fails;
+  // onUpdate receives every status. Falls back to polling if the stream breaks.
+  waitForJob: (jobId, onUpdate) => new Promise((resolve, reject) => {
+    const finished = (status) => status.status === 'completed' || status.status === 'failed';
+    const poll = async () => {
+      try {
+        let status = await api.getStatus(jobId);
+        onUpdate?.(status);
+        while (!finished(status)) {
+          await new Promise(r => setTimeout(r, 1000));
+          status = await api.getStatus(jobId);
+          onUpdate?.(status);
+        }
+        resolve(status);
+      } catch (err) {
+        reject(err);
+      }
+    };
+
+    if (typeof EventSource === 'undefined') {
+      poll();
+      return;
+    }
+    const source = new EventSource(`${API_BASE_URL}/api/status/${jobId}/stream`);
+    source.onmessage = (message) => {
+      const status = JSON.parse(message.data);
+      onUpdate?.(status);
+      if (finished(status)) {
+        source.close();
+        resolve(status);
+      }
+    };
+    source.onerror = () => {
+      source.close();
+      poll();
+    };
+  }),
+
   // Get results
   getResults: async (jobId) => {
     const response = await axios.get(`${API_BASE_URL}/api/results/${jobId}`);
     return response.data;
   },
 
+  // Get one results section (info, preview, statistics, correlation,
+  // outliers, anomalies, trends, charts, insights), optionally only some fields
+  getResultSection: async (jobId, section, fields = []) => {
+    const response = await axios.get(`${API_BASE_URL}/api/results/${jobId}/${section}`, {
+      params: fields.length ? { fields: fields.join(',') } : {},
+    });
+    return response.data;
+  },
+
+  // Page through the cleaned data (rows offset..offset+limit, optionally some columns)
+  getDataPage: async (jobId, offset = 0, limit = 100, columns = []) => {
+    const response = await axios.get(`${API_BASE_URL}/api/data/${jobId}`, {
+      params: { offset, limit, ...(columns.length ? { columns: columns.join(',') } : {}) },
+    });
+    return response.data;
+  },
+
   // Export cleaned CSV
   exportCSV: async (jobId) => {
     const response = await axios.get(`${API_BASE_URL}/api/export/csv/${jobId}`, {